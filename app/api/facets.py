@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Query
+
+from app.services.facet_service import FacetService
+
+router = APIRouter()
+service = FacetService()
+
+
+@router.get("", summary="Filter facets with counts for feed or search results")
+async def get_facets(
+    scope: str = Query("search", pattern="^(search|feed)$"),
+    q: str | None = Query(default=None),
+    department: str | None = Query(default=None),
+    grade: str | None = Query(default=None),
+    category: str | None = Query(default=None),
+    source: str | None = Query(default=None),
+):
+    return await service.facets(
+        scope=scope,
+        query=q,
+        department=department,
+        grade=grade,
+        category=category,
+        source=source,
+    )
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 
 from app.services.feed_service import FeedService
+from app.services.hydration import parse_fields
 from app.services.recommendation_service import RecommendationService
+from app.services.vector_store import VectorFilter
 
 router = APIRouter()
 feed_service = FeedService()
@@ -15,12 +17,25 @@ async def get_feed(
     category: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="meta.next_cursor from the previous page"),
+    if_none_match: str | None = Header(default=None),
 ):
-    return await feed_service.get_feed(
-        category=category,
-        page=page,
-        page_size=page_size,
-    )
+    if cursor:
+        try:
+            return await feed_service.get_feed(
+                category=category,
+                page=page,
+                page_size=page_size,
+                cursor=cursor,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    etag, body = await feed_service.get_feed_page(category, page, page_size, if_none_match)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if body is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/reco-user", summary="User profile based recommendation (stub)")
@@ -39,9 +54,25 @@ async def reco_user(
 @router.get("/reco-likes", summary="Like-based semantic recommendation")
 async def reco_likes(
     user_id: str = Query(...),
+    department: str | None = Query(default=None),
+    grade: str | None = Query(default=None),
+    category: str | None = Query(default=None),
     limit: int = Query(default=10, ge=1, le=50),
+    view: str = Query("full", pattern="^(full|light)$"),
+    fields: str | None = Query(default=None, description="Comma-separated list fields to return, e.g. id,title,deadline_at"),
 ):
+    try:
+        selected = parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return await reco_service.like_recommendations(
         user_id=user_id,
         limit=limit,
+        search_filter=VectorFilter(
+            department=department,
+            audience_grade=grade,
+            category=category,
+        ),
+        view=view,
+        fields=selected,
     )
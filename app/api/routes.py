@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
-from app.api import feed, posts, search, likes, reminders, chat
+from app.api import feed, facets, posts, search, likes, reminders, chat
+from app.clients.llm import get_llm_client
 from app.core.config import get_settings
 
 router = APIRouter()
@@ -26,9 +27,15 @@ async def healthz() -> dict:
     }
 
 
+@router.get("/healthz/llm", tags=["health"])
+async def healthz_llm() -> dict:
+    return get_llm_client().endpoint_stats()
+
+
 router.include_router(feed.router, prefix="/feed", tags=["feed"])
 router.include_router(posts.router, prefix="/posts", tags=["posts"])
 router.include_router(search.router, prefix="/search", tags=["search"])
+router.include_router(facets.router, prefix="/facets", tags=["search"])
 router.include_router(likes.router, prefix="/likes", tags=["interactions"])
 router.include_router(reminders.router, prefix="/reminders", tags=["reminders"])
 router.include_router(chat.router, prefix="/chat", tags=["chat"])
@@ -1,27 +1,48 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 
+from app.services.hydration import parse_fields
 from app.services.search_service import SearchService
+from app.services.suggest_index import get_suggest_index
 
 router = APIRouter()
 service = SearchService()
 
 
+@router.get("/suggest", summary="Typeahead suggestions from the in-memory prefix index")
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(default=8, ge=1, le=20),
+):
+    return {"items": get_suggest_index().suggest(q, limit=limit), "meta": {"prefix": q}}
+
+
 @router.get("", summary="Hybrid keyword/semantic search (semantic stub)")
 async def search(
     q: str = Query(..., min_length=1),
-    mode: str = Query("keyword", pattern="^(keyword|semantic)$"),
+    mode: str = Query("keyword", pattern="^(keyword|semantic|hybrid)$"),
     department: str | None = Query(default=None),
     grade: str | None = Query(default=None),
+    category: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=50),
+    cursor: str | None = Query(default=None, description="meta.next_cursor from the previous semantic/hybrid page"),
+    view: str = Query("full", pattern="^(full|light)$"),
+    fields: str | None = Query(default=None, description="Comma-separated list fields to return, e.g. id,title,deadline_at"),
 ):
-    return await service.search(
-        query=q,
-        mode=mode,
-        department=department,
-        grade=grade,
-        page=page,
-        page_size=page_size,
-    )
+    try:
+        return await service.search(
+            query=q,
+            mode=mode,
+            department=department,
+            grade=grade,
+            category=category,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            view=view,
+            fields=parse_fields(fields),
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -0,0 +1,203 @@
+"""
+Endpoint pools with health-weighted routing and latency tracking for LLM APIs.
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+# Upper bounds (seconds) of the latency histogram buckets; the last one is open.
+LATENCY_BUCKETS: Sequence[float] = (
+    0.05, 0.1, 0.2, 0.4, 0.8, 1.6, 3.2, 6.4, 12.8, 25.6, math.inf,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate quantiles."""
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.bounds = list(bounds)
+        self.counts = [0] * len(self.bounds)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        for index, bound in enumerate(self.bounds):
+            if seconds <= bound:
+                self.counts[index] += 1
+                break
+        self.total += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the upper bound of the bucket holding the q-th quantile."""
+        if self.total == 0:
+            return None
+        threshold = q * self.total
+        running = 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            if running >= threshold:
+                if math.isinf(bound):
+                    return self.sum / self.total
+                return bound
+        return None
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "count": self.total,
+            "mean": round(self.sum / self.total, 4) if self.total else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": {
+                ("+Inf" if math.isinf(bound) else str(bound)): count
+                for bound, count in zip(self.bounds, self.counts)
+            },
+        }
+
+
+@dataclass
+class Endpoint:
+    base: str
+    api_key: str
+    health: float = 1.0
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def available(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def weight(self) -> float:
+        p50 = self.latency.quantile(0.5) or 0.0
+        return max(self.health, 0.01) / (1.0 + p50)
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "base": self.base,
+            "health": round(self.health, 3),
+            "successes": self.successes,
+            "failures": self.failures,
+            "cooling_down": not self.available(time.monotonic()),
+            "latency": self.latency.snapshot(),
+        }
+
+
+class EndpointPool:
+    """
+    Orders the endpoints of one capability (chat/summary/embedding) by health
+    and observed latency, and decides when a hedged duplicate request is due.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        endpoints: Sequence[Endpoint],
+        hedge_enabled: bool = False,
+        hedge_min_delay: float = 0.5,
+        hedge_min_samples: int = 20,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        health_alpha: float = 0.2,
+    ) -> None:
+        self.name = name
+        self.endpoints = list(endpoints)
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.health_alpha = health_alpha
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        name: str,
+        bases: Optional[str],
+        keys: Optional[str],
+        **kwargs,
+    ) -> "EndpointPool":
+        """Build a pool from comma-separated base URLs and API keys.
+
+        A single key is shared by every base; otherwise keys pair up with bases
+        positionally.
+        """
+        base_list = _split_csv(bases)
+        key_list = _split_csv(keys)
+        endpoints: List[Endpoint] = []
+        for index, base in enumerate(base_list):
+            if not key_list:
+                break
+            key = key_list[index] if index < len(key_list) else key_list[0]
+            endpoints.append(Endpoint(base=base, api_key=key))
+        return cls(name, endpoints, **kwargs)
+
+    def ordered(self) -> List[Endpoint]:
+        """Return endpoints in routing order: a health-weighted shuffle of the
+        available ones followed by those still cooling down."""
+        now = time.monotonic()
+        available = [ep for ep in self.endpoints if ep.available(now)]
+        cooling = sorted(
+            (ep for ep in self.endpoints if not ep.available(now)),
+            key=lambda ep: ep.cooldown_until,
+        )
+        # Weighted sampling without replacement (Efraimidis-Spirakis keys).
+        available.sort(key=lambda ep: random.random() ** (1.0 / ep.weight()), reverse=True)
+        return available + cooling
+
+    def hedge_delay(self, endpoint: Endpoint) -> Optional[float]:
+        """Seconds to wait on ``endpoint`` before firing a hedge, or None."""
+        if not self.hedge_enabled or len(self.endpoints) < 2:
+            return None
+        if endpoint.latency.total < self.hedge_min_samples:
+            return None
+        p95 = endpoint.latency.quantile(0.95)
+        if p95 is None:
+            return None
+        return max(self.hedge_min_delay, p95)
+
+    def hedge_target(self, candidates: Sequence[Endpoint]) -> Optional[Endpoint]:
+        """First endpoint after the primary in ``candidates`` that is not cooling down."""
+        now = time.monotonic()
+        return next((ep for ep in candidates[1:] if ep.available(now)), None)
+
+    def record_cancelled(self, endpoint: Endpoint, seconds: float) -> None:
+        """Record a request abandoned after ``seconds`` (e.g. a hedge won). Its
+        real latency is at least that long, so it counts as a lower bound;
+        health is untouched since the endpoint did not fail."""
+        endpoint.latency.observe(seconds)
+
+    def record_success(self, endpoint: Endpoint, seconds: float) -> None:
+        endpoint.latency.observe(seconds)
+        endpoint.successes += 1
+        endpoint.consecutive_failures = 0
+        endpoint.cooldown_until = 0.0
+        endpoint.health += self.health_alpha * (1.0 - endpoint.health)
+
+    def record_failure(self, endpoint: Endpoint) -> None:
+        endpoint.failures += 1
+        endpoint.consecutive_failures += 1
+        endpoint.health -= self.health_alpha * endpoint.health
+        if endpoint.consecutive_failures >= self.failure_threshold:
+            endpoint.cooldown_until = time.monotonic() + self.cooldown_seconds
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "hedge_enabled": self.hedge_enabled,
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins,
+            "endpoints": [ep.snapshot() for ep in self.endpoints],
+        }
+
+
+def _split_csv(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from functools import lru_cache
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import httpx
 
+from app.clients.endpoints import Endpoint, EndpointPool
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 
 class LLMClient:
-    """HTTP client wrapper for summary/classification and embedding endpoints."""
+    """
+    HTTP client wrapper for summary/classification and embedding endpoints.
+
+    Each capability accepts comma-separated base URLs (and keys). Requests are
+    routed through an ``EndpointPool`` that fails over to the next endpoint on
+    errors; chat requests can additionally be hedged.
+    """
 
     def __init__(self) -> None:
         settings = get_settings()
@@ -41,9 +50,28 @@ class LLMClient:
         self.embedding_model = settings.llm_embedding_model
         self.embedding_timeout = settings.llm_embedding_timeout or settings.llm_api_timeout
 
-        self.summary_enabled = bool(self.summary_base and self.summary_key)
-        self.chat_enabled = bool(self.chat_base and self.chat_key)
-        self.embedding_enabled = bool(self.embedding_base and self.embedding_key)
+        pool_options = {
+            "failure_threshold": settings.llm_endpoint_failure_threshold,
+            "cooldown_seconds": settings.llm_endpoint_cooldown_seconds,
+        }
+        self.summary_pool = EndpointPool.from_config(
+            "summary", self.summary_base, self.summary_key, **pool_options
+        )
+        self.chat_pool = EndpointPool.from_config(
+            "chat",
+            self.chat_base,
+            self.chat_key,
+            hedge_enabled=settings.llm_chat_hedge_enabled,
+            hedge_min_delay=settings.llm_chat_hedge_min_delay,
+            **pool_options,
+        )
+        self.embedding_pool = EndpointPool.from_config(
+            "embedding", self.embedding_base, self.embedding_key, **pool_options
+        )
+
+        self.summary_enabled = bool(self.summary_pool.endpoints)
+        self.chat_enabled = bool(self.chat_pool.endpoints)
+        self.embedding_enabled = bool(self.embedding_pool.endpoints)
 
         if not self.summary_enabled:
             logger.info("LLM summary client disabled (missing base URL or API key).")
@@ -68,8 +96,7 @@ class LLMClient:
             "max_tokens": self.summary_max_tokens,
         }
         response = await self._post(
-            base=self.summary_base,
-            api_key=self.summary_key,
+            pool=self.summary_pool,
             endpoint=self.summary_endpoint,
             timeout=self.summary_timeout,
             payload=payload,
@@ -88,8 +115,7 @@ class LLMClient:
             "input": text,
         }
         response = await self._post(
-            base=self.embedding_base,
-            api_key=self.embedding_key,
+            pool=self.embedding_pool,
             endpoint=self.embedding_endpoint,
             timeout=self.embedding_timeout,
             payload=payload,
@@ -121,8 +147,7 @@ class LLMClient:
             "max_tokens": 16,
         }
         response = await self._post(
-            base=self.summary_base,
-            api_key=self.summary_key,
+            pool=self.summary_pool,
             endpoint=self.summary_endpoint,
             timeout=self.summary_timeout,
             payload=payload,
@@ -148,8 +173,7 @@ class LLMClient:
             "temperature": temperature,
         }
         response = await self._post(
-            base=self.chat_base,
-            api_key=self.chat_key,
+            pool=self.chat_pool,
             endpoint=self.chat_endpoint,
             timeout=self.chat_timeout,
             payload=payload,
@@ -159,29 +183,118 @@ class LLMClient:
         except (KeyError, IndexError) as exc:
             raise LLMRequestError("Invalid chat response payload") from exc
 
+    def endpoint_stats(self) -> Dict[str, object]:
+        return {
+            "summary": self.summary_pool.snapshot(),
+            "chat": self.chat_pool.snapshot(),
+            "embedding": self.embedding_pool.snapshot(),
+        }
+
     async def _post(
         self,
-        base: Optional[str],
-        api_key: Optional[str],
+        pool: EndpointPool,
         endpoint: str,
         timeout: float,
         payload: dict,
     ) -> dict:
-        if not base or not api_key:
+        candidates = pool.ordered()
+        if not candidates:
             raise LLMDisabledError("LLM client not configured")
+
+        last_error: Optional[LLMRequestError] = None
+        secondary = pool.hedge_target(candidates)
+        if secondary is not None:
+            delay = pool.hedge_delay(candidates[0])
+            if delay is not None:
+                try:
+                    return await self._post_hedged(
+                        pool, candidates[0], secondary, delay, endpoint, timeout, payload
+                    )
+                except LLMRequestError as exc:
+                    last_error = exc
+                    candidates = [ep for ep in candidates[1:] if ep is not secondary]
+
+        for candidate in candidates:
+            try:
+                return await self._send(pool, candidate, endpoint, timeout, payload)
+            except LLMRequestError as exc:
+                logger.warning("LLM %s endpoint %s failed: %s", pool.name, candidate.base, exc)
+                last_error = exc
+        raise last_error or LLMRequestError("No LLM endpoint available")
+
+    async def _post_hedged(
+        self,
+        pool: EndpointPool,
+        primary: Endpoint,
+        secondary: Endpoint,
+        delay: float,
+        endpoint: str,
+        timeout: float,
+        payload: dict,
+    ) -> dict:
+        """Send to ``primary``; if it has not answered after ``delay`` seconds
+        (or fails first), send the same payload to ``secondary`` and return
+        whichever succeeds first."""
+        started = time.perf_counter()
+        primary_task = asyncio.create_task(self._send(pool, primary, endpoint, timeout, payload))
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done and primary_task.exception() is None:
+            return primary_task.result()
+
+        pool.hedged_requests += 1
+        hedge_started = time.perf_counter()
+        hedge_task = asyncio.create_task(self._send(pool, secondary, endpoint, timeout, payload))
+        targets = {primary_task: (primary, started), hedge_task: (secondary, hedge_started)}
+        pending = {hedge_task} if done else {primary_task, hedge_task}
+        last_error = primary_task.exception() if done else None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is hedge_task:
+                            pool.hedge_wins += 1
+                        return task.result()
+                    last_error = error
+        finally:
+            for task in pending:
+                task.cancel()
+                # Without this the slow requests a hedge cuts short would never
+                # reach the histogram and its percentiles would drift low.
+                target, sent_at = targets[task]
+                pool.record_cancelled(target, time.perf_counter() - sent_at)
+        raise last_error or LLMRequestError("Hedged LLM request failed")
+
+    async def _send(
+        self,
+        pool: EndpointPool,
+        target: Endpoint,
+        endpoint: str,
+        timeout: float,
+        payload: dict,
+    ) -> dict:
         headers = {
-            "Authorization": f"Bearer {api_key}",
+            "Authorization": f"Bearer {target.api_key}",
             "Content-Type": "application/json",
         }
-        url = f"{base.rstrip('/')}/{endpoint.lstrip('/')}"
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(url, json=payload, headers=headers)
-            try:
+        url = f"{target.base.rstrip('/')}/{endpoint.lstrip('/')}"
+        started = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                resp = await client.post(url, json=payload, headers=headers)
                 resp.raise_for_status()
-            except httpx.HTTPStatusError as exc:
-                logger.error("LLM request failed: %s", exc)
-                raise LLMRequestError(str(exc)) from exc
-            return resp.json()
+                data = resp.json()
+        except httpx.HTTPStatusError as exc:
+            logger.error("LLM request failed: %s", exc)
+            pool.record_failure(target)
+            raise LLMRequestError(str(exc)) from exc
+        except (httpx.HTTPError, ValueError) as exc:
+            logger.error("LLM request to %s failed: %s", target.base, exc)
+            pool.record_failure(target)
+            raise LLMRequestError(str(exc) or exc.__class__.__name__) from exc
+        pool.record_success(target, time.perf_counter() - started)
+        return data
 
 
 class LLMRequestError(Exception):
@@ -0,0 +1,137 @@
+"""
+In-process caching helpers.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Small LRU cache whose entries expire ``ttl`` seconds after being set."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SharedCacheBackend(Protocol):
+    """Cross-process cache store (e.g. ``app.db.shared_cache.MongoCacheBackend``)."""
+
+    async def get(self, key: str) -> Optional[Any]: ...
+
+    async def set(self, key: str, value: Any) -> None: ...
+
+
+class Uncached:
+    """
+    Wraps a ``VersionedCache`` compute result that must be returned (also to
+    single-flight waiters) but not stored, e.g. one served by a degraded path.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+class VersionedCache:
+    """
+    Two-level cache whose entries are keyed by ``(version, key)``. Bumping the
+    version makes every older entry unreachable, so stale results are never
+    served; the local TTL only bounds how long idle entries occupy memory.
+
+    Concurrent misses for the same key share one computation (single flight),
+    so a burst of identical requests after a version bump computes once.
+    """
+
+    def __init__(self, local: TTLCache, shared: Optional[SharedCacheBackend] = None) -> None:
+        self.local = local
+        self.shared = shared
+        self._inflight: Dict[Tuple[int, Hashable], "asyncio.Task[Any]"] = {}
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        version: int,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        versioned = (version, key)
+        value = self.local.get(versioned)
+        if value is not None:
+            return value
+
+        # The computation runs in its own task and every caller, the first one
+        # included, awaits it through ``shield``: a cancelled request stops
+        # waiting without cancelling the work the other callers share.
+        task = self._inflight.get(versioned)
+        if task is None:
+            task = asyncio.ensure_future(self._load_or_compute(versioned, compute))
+            self._inflight[versioned] = task
+            task.add_done_callback(lambda done: self._finish(versioned, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, versioned: Tuple[int, Hashable], task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(versioned) is task:
+            del self._inflight[versioned]
+        # Retrieve it so a failure nobody is still awaiting doesn't log
+        # "exception was never retrieved".
+        if not task.cancelled():
+            task.exception()
+
+    async def _load_or_compute(self, versioned: Tuple[int, Hashable], compute: Callable[[], Awaitable[Any]]) -> Any:
+        shared_key = json.dumps(versioned, ensure_ascii=False, default=str) if self.shared else None
+        if shared_key is not None:
+            try:
+                value = await self.shared.get(shared_key)
+            except Exception as exc:  # the shared tier is best effort
+                logger.warning("Shared cache read failed: %s", exc)
+                value = None
+            if value is not None:
+                self.local.set(versioned, value)
+                return value
+
+        value = await compute()
+        if isinstance(value, Uncached):
+            return value.value
+        if value is not None:
+            self.local.set(versioned, value)
+            if shared_key is not None:
+                try:
+                    await self.shared.set(shared_key, value)
+                except Exception as exc:  # the shared tier is best effort
+                    logger.warning("Shared cache write failed: %s", exc)
+        return value
+
+    def clear(self) -> None:
+        self.local.clear()
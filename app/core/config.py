@@ -15,9 +15,51 @@ class Settings(BaseSettings):
     mongo_db: str = "notisnu"
     qdrant_host: str = "qdrant"
     qdrant_port: int = 6333
+    qdrant_grpc_port: int = 6334
+    qdrant_prefer_grpc: bool = False
+    qdrant_timeout: int = 10
+    qdrant_max_connections: int = 64
+    qdrant_max_keepalive_connections: int = 16
     qdrant_collection_notices: str = "notice_vectors"
+    qdrant_collection_user_preferences: str = "user_preferences"
     qdrant_vector_size: int = 768
+    vector_backend: str = "qdrant"  # qdrant | local
+    vector_failover_enabled: bool = False
+    local_vector_index_path: str = "data/vector_index"
+    local_vector_index_read_only: bool = False
+    qdrant_quantization: str = "none"  # none | int8
+    qdrant_quantization_quantile: float = 0.99
+    qdrant_quantization_always_ram: bool = True
+    qdrant_on_disk_vectors: bool = False
+    qdrant_search_rescore: bool = True
+    qdrant_search_oversampling: float = 2.0
+    qdrant_search_ef: int | None = None
+    qdrant_hnsw_m: int = 16
+    qdrant_hnsw_ef_construct: int = 100
+    qdrant_hnsw_full_scan_threshold: int = 10000
+    qdrant_hnsw_on_disk: bool = False
+    qdrant_on_disk_payload: bool = False
+    qdrant_indexing_threshold: int = 20000
+    qdrant_memmap_threshold: int | None = None
+    qdrant_default_segment_number: int = 0
     api_port: int = 8000
+    semantic_result_window: int = 100
+    search_result_cache_size: int = 256
+    search_result_cache_ttl_seconds: float = 3600.0
+    search_cache_backend: str = "memory"  # memory | mongo
+    corpus_version_refresh_seconds: float = 1.0
+    feed_count_cache_ttl_seconds: float = 60.0
+    feed_page_cache_size: int = 128
+    feed_page_cache_ttl_seconds: float = 3600.0
+    hybrid_rrf_k: int = 60
+    hybrid_semantic_weight: float = 1.0
+    hybrid_keyword_weight: float = 1.0
+    keyword_candidate_limit: int = 1000
+    facet_cache_size: int = 256
+    suggest_sync_seconds: float = 60.0
+    suggest_max_queries: int = 5000
+    suggest_min_query_count: int = 3
+    suggest_query_denylist: List[str] = []
     timezone: str = "Asia/Seoul"
     scheduler_enabled: bool = False
     scheduler_interval_minutes: int = 30
@@ -38,12 +80,29 @@ class Settings(BaseSettings):
     llm_chat_model: str = "gpt-4o-mini"
     llm_chat_max_tokens: int = 600
     llm_chat_timeout: float | None = None
+    llm_chat_hedge_enabled: bool = False
+    llm_chat_hedge_min_delay: float = 0.5
 
     llm_embedding_base: str | None = None
     llm_embedding_key: str | None = None
     llm_embedding_endpoint: str = "/v1/embeddings"
     llm_embedding_model: str = "text-embedding-3-small"
     llm_embedding_timeout: float | None = None
+    llm_endpoint_failure_threshold: int = 3
+    llm_endpoint_cooldown_seconds: float = 30.0
+    embedding_backend: str = "remote"  # remote | local
+    local_embedding_ngram_min: int = 2
+    local_embedding_ngram_max: int = 3
+    local_embedding_idf_path: str | None = None
+    embedding_version: str = "1"
+    reembed_batch_size: int = 128
+    reembed_concurrency: int = 8
+    reembed_checkpoint_dir: str = "data/reembed"
+    recommend_max_likes: int = 50
+    preference_half_life_days: float = 30.0
+    reconcile_enabled: bool = False
+    reconcile_interval_minutes: int = 360
+    reconcile_batch_size: int = 1000
     crawler_sample_html: str | None = "docs/sample_pages/scholarship_board.html"
     crawler_request_timeout: float = 10.0
     board_catalog_path: str | None = "docs/board_sources/catalog.json"
@@ -0,0 +1,25 @@
+"""
+Opaque pagination cursors.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Dict
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    raw = json.dumps(state, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """Decode a cursor produced by ``encode_cursor``; raises ValueError if malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(state, dict):
+        raise ValueError("Invalid cursor")
+    return state
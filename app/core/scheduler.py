@@ -4,7 +4,6 @@ APScheduler integration for ingest/notification jobs.
 
 from __future__ import annotations
 
-import asyncio
 from typing import Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -12,6 +11,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app.core.config import get_settings
 from app.ingest.pipeline import IngestPipeline
 from app.ingest.sources.dummy import DummyNoticeSource
+from app.services.reconciler import VectorReconciler
 
 scheduler: Optional[AsyncIOScheduler] = None
 
@@ -28,17 +28,25 @@ async def start_scheduler() -> None:
     scheduler = AsyncIOScheduler(timezone=settings.timezone)
     pipeline = IngestPipeline(sources=[DummyNoticeSource()])
 
-    async def run_pipeline() -> None:
-        await pipeline.run()
-
+    # Coroutine functions are awaited by the AsyncIOScheduler executor, so a run
+    # counts as an instance until it finishes and ``max_instances=1`` holds.
     scheduler.add_job(
-        lambda: asyncio.create_task(run_pipeline()),
+        pipeline.run,
         trigger="interval",
         minutes=settings.scheduler_interval_minutes,
         id="ingest_pipeline",
         max_instances=1,
         replace_existing=True,
     )
+    if settings.reconcile_enabled:
+        scheduler.add_job(
+            VectorReconciler().run,
+            trigger="interval",
+            minutes=settings.reconcile_interval_minutes,
+            id="vector_reconciler",
+            max_instances=1,
+            replace_existing=True,
+        )
     scheduler.start()
 
 
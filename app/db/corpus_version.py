@@ -0,0 +1,67 @@
+"""
+Global "corpus version": a counter bumped whenever posts or vectors change, so
+caches can key entries by version instead of guessing TTLs.
+
+The counter lives in Mongo (``corpus_state`` collection) so ingest scripts,
+the scheduler and every API worker agree on it. Readers re-fetch it at most
+every ``corpus_version_refresh_seconds``. Processes that never connected to
+Mongo (tests, offline tools) fall back to a process-local counter.
+"""
+from __future__ import annotations
+
+import time
+from functools import lru_cache
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+from app.core.config import get_settings
+from app.db import mongo
+
+STATE_COLLECTION = "corpus_state"
+STATE_ID = "posts"
+
+
+class CorpusVersion:
+    def __init__(self, refresh_seconds: Optional[float] = None) -> None:
+        self.refresh_seconds = (
+            refresh_seconds if refresh_seconds is not None else get_settings().corpus_version_refresh_seconds
+        )
+        self._value = 0
+        self._fetched_at: Optional[float] = None
+
+    async def current(self) -> int:
+        collection = self._collection()
+        if collection is None:
+            return self._value
+        now = time.monotonic()
+        if self._fetched_at is None or now - self._fetched_at >= self.refresh_seconds:
+            state = await collection.find_one({"_id": STATE_ID})
+            self._value = int(state["version"]) if state else 0
+            self._fetched_at = now
+        return self._value
+
+    async def bump(self) -> int:
+        collection = self._collection()
+        if collection is None:
+            self._value += 1
+            return self._value
+        state = await collection.find_one_and_update(
+            {"_id": STATE_ID},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        self._value = int(state["version"])
+        self._fetched_at = time.monotonic()
+        return self._value
+
+    def _collection(self):
+        if mongo.mongo_client is None:
+            return None
+        return mongo.mongo_client[get_settings().mongo_db][STATE_COLLECTION]
+
+
+@lru_cache
+def get_corpus_version() -> CorpusVersion:
+    return CorpusVersion()
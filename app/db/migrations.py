@@ -0,0 +1,39 @@
+"""
+Idempotent data migrations run at API startup.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Tuple
+
+from app.db.corpus_version import get_corpus_version
+from app.models.post import FEED_EXCLUDED_SOURCES, Post
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_feed_visible(only_missing: bool = True) -> Tuple[int, int]:
+    """
+    Derive ``Post.feed_visible`` from ``source`` for stored posts. By default
+    only posts without the flag are touched (cheap enough for every startup);
+    ``only_missing=False`` also corrects flags that drifted from ``source``.
+    Returns (marked visible, marked hidden).
+    """
+    collection = Post.get_motor_collection()
+    excluded = list(FEED_EXCLUDED_SOURCES)
+
+    def selector(visible: bool) -> Dict[str, Any]:
+        source = {"$nin": excluded} if visible else {"$in": excluded}
+        if only_missing:
+            return {"feed_visible": {"$exists": False}, "source": source}
+        return {"feed_visible": {"$ne": visible}, "source": source}
+
+    visible = await collection.update_many(selector(True), {"$set": {"feed_visible": True}})
+    hidden = await collection.update_many(selector(False), {"$set": {"feed_visible": False}})
+    if visible.modified_count or hidden.modified_count:
+        # Feed facets and cached pages were computed without the flag.
+        await get_corpus_version().bump()
+        logger.info(
+            "Backfilled feed_visible: %d visible, %d hidden", visible.modified_count, hidden.modified_count
+        )
+    return visible.modified_count, hidden.modified_count
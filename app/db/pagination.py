@@ -0,0 +1,96 @@
+"""
+One-round-trip paginated queries for Beanie documents.
+
+For small result sets (reminders, capped keyword candidates) ``paginate`` runs
+a single aggregation whose ``$facet`` returns the requested page and the total
+together. Every matched document flows through ``$facet``, so callers with
+large, slowly changing result sets pass a ``count_cache`` instead: the total
+then comes from ``count_documents`` (covered by the filter's index) alongside
+the page query, and once cached, pages are served by the items query alone
+with the total reported as an estimate.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from beanie import Document
+from pydantic import BaseModel
+
+from app.core.cache import TTLCache
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    total: Optional[int]
+    total_is_estimate: bool = False
+
+
+def _count_key(document_model: Type[Document], match: Dict[str, Any]) -> str:
+    return f"{document_model.get_collection_name()}:{json.dumps(match, sort_keys=True, default=str)}"
+
+
+async def paginate(
+    document_model: Type[Document],
+    match: Dict[str, Any],
+    sort: Dict[str, int],
+    skip: int,
+    limit: int,
+    stages: Sequence[Dict[str, Any]] = (),
+    page_stages: Sequence[Dict[str, Any]] = (),
+    projection: Optional[Dict[str, int]] = None,
+    with_total: bool = True,
+    count_cache: Optional[TTLCache] = None,
+    parse: bool = True,
+    model: Optional[Type[BaseModel]] = None,
+) -> Page:
+    """
+    Page ``limit`` documents after ``skip`` from ``match`` ordered by ``sort``.
+    ``stages`` run between the match and the sort (e.g. computing a score
+    field); ``page_stages`` run on the page only, before the projection (e.g.
+    a ``$lookup`` of fields the ranking stages dropped). Items are parsed as
+    ``model`` (default ``document_model``), so a ``projection`` can be paired
+    with a lighter view model; with ``parse=False`` raw documents are returned.
+    """
+    head: List[Dict[str, Any]] = [{"$match": match}, *stages, {"$sort": sort}]
+    window: List[Dict[str, Any]] = [{"$skip": skip}, {"$limit": limit}, *page_stages]
+    project: List[Dict[str, Any]] = [{"$project": projection}] if projection else []
+
+    collection = document_model.get_motor_collection()
+    cached_total = None
+    key = None
+    if with_total and count_cache is not None:
+        key = _count_key(document_model, match)
+        cached_total = count_cache.get(key)
+
+    if not with_total or cached_total is not None:
+        documents = await collection.aggregate([*head, *window, *project]).to_list(length=limit)
+        total, estimate = cached_total, cached_total is not None
+    elif key is not None:
+        documents, total = await asyncio.gather(
+            collection.aggregate([*head, *window, *project]).to_list(length=limit),
+            collection.count_documents(match),
+        )
+        estimate = False
+        count_cache.set(key, total)
+    else:
+        # Without page stages the projection runs before ``$facet``, so only
+        # the projected fields of the matched documents are buffered.
+        early, items = ([], [*window, *project]) if page_stages else (project, window)
+        pipeline = [
+            *head,
+            *early,
+            {"$facet": {"items": items, "total": [{"$count": "value"}]}},
+        ]
+        result = await collection.aggregate(pipeline).to_list(length=1)
+        facet = result[0] if result else {"items": [], "total": []}
+        documents = facet["items"]
+        total = facet["total"][0]["value"] if facet["total"] else 0
+        estimate = False
+
+    item_model = model or document_model
+    items = [item_model.model_validate(document) for document in documents] if parse else documents
+    return Page(items=items, total=total, total_is_estimate=estimate)
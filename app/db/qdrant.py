@@ -2,19 +2,38 @@
 Qdrant client factory.
 """
 
-from qdrant_client import QdrantClient
+import httpx
+from qdrant_client import AsyncQdrantClient
 
 from app.core.config import get_settings
 
-client: QdrantClient | None = None
+client: AsyncQdrantClient | None = None
 
 
-def get_qdrant_client() -> QdrantClient:
+def get_qdrant_client() -> AsyncQdrantClient:
     """
-    Lazily instantiate and return a shared Qdrant client.
+    Lazily instantiate and return a shared async Qdrant client.
     """
     global client
     if client is None:
         settings = get_settings()
-        client = QdrantClient(host=settings.qdrant_host, port=settings.qdrant_port)
+        client = AsyncQdrantClient(
+            host=settings.qdrant_host,
+            port=settings.qdrant_port,
+            grpc_port=settings.qdrant_grpc_port,
+            prefer_grpc=settings.qdrant_prefer_grpc,
+            timeout=settings.qdrant_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.qdrant_max_connections,
+                max_keepalive_connections=settings.qdrant_max_keepalive_connections,
+            ),
+        )
     return client
+
+
+async def close_qdrant_client() -> None:
+    global client
+    if client is None:
+        return
+    await client.close()
+    client = None
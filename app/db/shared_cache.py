@@ -0,0 +1,46 @@
+"""
+Mongo-backed shared tier for ``VersionedCache``.
+
+Entries are plain BSON documents with a TTL index on ``expires_at``, so every
+API worker sees results computed by the others. Keys already embed the corpus
+version, which is what keeps entries correct; the TTL only reclaims space.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from app.core.config import get_settings
+from app.db import mongo
+
+
+class MongoCacheBackend:
+    def __init__(self, collection_name: str, ttl_seconds: float) -> None:
+        self.collection_name = collection_name
+        self.ttl_seconds = ttl_seconds
+        self._indexed = False
+
+    def _collection(self):
+        if mongo.mongo_client is None:
+            return None
+        return mongo.mongo_client[get_settings().mongo_db][self.collection_name]
+
+    async def get(self, key: str) -> Optional[Any]:
+        collection = self._collection()
+        if collection is None:
+            return None
+        document = await collection.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+        return document["value"] if document else None
+
+    async def set(self, key: str, value: Any) -> None:
+        collection = self._collection()
+        if collection is None:
+            return
+        if not self._indexed:
+            await collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexed = True
+        await collection.replace_one(
+            {"_id": key},
+            {"_id": key, "value": value, "expires_at": datetime.utcnow() + timedelta(seconds=self.ttl_seconds)},
+            upsert=True,
+        )
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import logging
 from typing import Iterable, List, Optional
 
+from app.clients.llm import LLMDisabledError, LLMRequestError
+from app.db.corpus_version import get_corpus_version
 from app.db.mongo import init_db
 from app.ingest.base import NormalizedNotice, NoticeSource
 from app.ingest.normalizer import hash_notice, normalize
 from app.models.post import Post
+from app.services.facet_service import FacetService
+from app.services.keyword_index import index_fields
 from app.services.llm_service import LLMService
+from app.services.suggest_index import get_suggest_index
 from app.services import vector_store
 
+logger = logging.getLogger(__name__)
+
 
 class IngestPipeline:
     def __init__(
@@ -42,7 +50,14 @@ class IngestPipeline:
                 classification = await self.llm_service.classify_category(combined_text)
                 notice.category = classification
 
-                embeds = await self.llm_service.embed(combined_text)
+                # No local fallback: a vector from another embedding space would
+                # be indistinguishable from a real one. The post is stored without
+                # a vector and the reconciler embeds it on a later run.
+                try:
+                    embeds = await self.llm_service.embed_strict(combined_text)
+                except (LLMDisabledError, LLMRequestError) as exc:
+                    logger.warning("Embedding failed, leaving %s for the reconciler: %s", notice.url, exc)
+                    embeds = None
 
                 post = Post(
                     title=notice.title,
@@ -58,27 +73,21 @@ class IngestPipeline:
                     category=notice.category,
                     source=notice.source,
                     hash=hash_value,
+                    **index_fields(notice.title, notice.summary, notice.body),
                 )
                 await post.insert()
                 inserted += 1
-                if embeds:
-                    payload = {
-                        "post_id": str(post.id),
-                        "department": notice.department,
-                        "audience_grade": notice.audience_grade,
-                        "posted_at": notice.posted_at.isoformat(),
-                        "deadline_at": notice.deadline_at.isoformat()
-                        if notice.deadline_at
-                        else None,
-                        "tags": notice.tags,
-                        "category": notice.category,
-                        "source": notice.source,
-                    }
+                get_suggest_index().add_post(post)
+                if embeds is not None:
                     await vector_store.upsert_notice_vector(
                         post_id=str(post.id),
                         vector=embeds,
-                        payload=payload,
+                        payload=vector_store.build_payload(post),
                     )
                     vectorized += 1
 
+        if inserted:
+            # Invalidates every cached search result computed before this run.
+            version = await get_corpus_version().bump()
+            await FacetService().precompute(version)
         return {"inserted": inserted, "skipped": skipped, "vectorized": vectorized}
@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -5,7 +7,10 @@ from app.api.routes import router
 from app.core.config import get_settings
 from app.core.logging import setup_logging
 from app.core.scheduler import shutdown_scheduler, start_scheduler
+from app.db.migrations import backfill_feed_visible
 from app.db.mongo import close_db, init_db
+from app.db.qdrant import close_qdrant_client
+from app.services.suggest_index import get_suggest_index
 
 
 def create_app() -> FastAPI:
@@ -33,11 +38,22 @@ def create_app() -> FastAPI:
     @application.on_event("startup")
     async def _startup() -> None:
         await init_db()
+        await backfill_feed_visible()
+        suggest_index = get_suggest_index()
+        await suggest_index.sync()
+        if settings.suggest_sync_seconds > 0:
+            application.state.suggest_sync = asyncio.create_task(
+                suggest_index.sync_forever(settings.suggest_sync_seconds)
+            )
         await start_scheduler()
 
     @application.on_event("shutdown")
     async def _shutdown() -> None:
+        suggest_sync = getattr(application.state, "suggest_sync", None)
+        if suggest_sync is not None:
+            suggest_sync.cancel()
         await close_db()
+        await close_qdrant_client()
         await shutdown_scheduler()
 
     return application
@@ -3,8 +3,25 @@ from __future__ import annotations
 from datetime import datetime
 from typing import List, Optional
 
-from beanie import Document, Indexed
-from pydantic import Field
+from beanie import Document, Indexed, Insert, PydanticObjectId, Replace, Save, SaveChanges, before_event
+from pydantic import BaseModel, ConfigDict, Field
+
+# Demo/seed sources kept out of the public feed.
+FEED_EXCLUDED_SOURCES = (
+    None,
+    "",
+    "seed_posts",
+    "dummy-source",
+    "scholarship-board",
+    "internship-board",
+    "scholarship-source",
+    "internship-source",
+)
+
+
+def feed_visible_for(source: Optional[str]) -> bool:
+    """Value of ``Post.feed_visible`` for a post from ``source``."""
+    return source not in FEED_EXCLUDED_SOURCES
 
 
 class Post(Document):
@@ -22,15 +39,62 @@ class Post(Document):
     source: Optional[str] = None
     hash: Indexed(str, unique=True)  # Prevent duplicates from ingest
     likes: int = 0
+    # Derived from ``source`` on every write (see ``sync_feed_visible``) so the
+    # feed filters on an indexed equality instead of a ``$nin`` over sources.
+    feed_visible: bool = False
+    # Keyword index (see app/services/keyword_index.py); stored but not serialised.
+    search_tokens: List[str] = Field(default_factory=list, exclude=True)
+    title_tokens: List[str] = Field(default_factory=list, exclude=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    @before_event(Insert, Replace, Save, SaveChanges)
+    def sync_feed_visible(self) -> None:
+        self.feed_visible = feed_visible_for(self.source)
+
     class Settings:
         name = "posts"
         use_revision = False
         indexes = [
             "department",
             "audience_grade",
+            "search_tokens",
             [("deadline_at", 1)],
-            [("posted_at", -1)],
+            [("posted_at", -1), ("_id", -1)],
+            [("feed_visible", 1), ("posted_at", -1), ("_id", -1)],
+            [("feed_visible", 1), ("category", 1), ("posted_at", -1), ("_id", -1)],
         ]
+
+
+# Fields list endpoints (feed, search, recommendations) render; everything
+# else, notably ``body`` and the keyword index, stays in Mongo.
+LIST_FIELDS = (
+    "title",
+    "summary",
+    "category",
+    "department",
+    "tags",
+    "source",
+    "posted_at",
+    "deadline_at",
+)
+LIST_PROJECTION = {field: 1 for field in LIST_FIELDS}
+
+
+class PostListView(BaseModel):
+    """Projection of ``Post`` loaded for list responses."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    summary: Optional[str] = None
+    category: Optional[str] = None
+    department: Optional[str] = None
+    tags: List[str] = Field(default_factory=list)
+    source: Optional[str] = None
+    posted_at: Optional[datetime] = None
+    deadline_at: Optional[datetime] = None
+
+    class Settings:
+        projection = {"_id": 1, **LIST_PROJECTION}
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
@@ -10,9 +10,14 @@ from beanie.operators import In
 from bson import ObjectId
 
 from app.clients.llm import LLMDisabledError, LLMRequestError
+from app.core.config import get_settings
 from app.models.post import Post
 from app.services import vector_store
+from app.services.context_packer import ContextPacker, prompt_tokens
+from app.services.fusion import reciprocal_rank_fusion
+from app.services.keyword_index import keyword_search
 from app.services.llm_service import LLMService
+from app.services.vector_store import VectorFilter
 
 logger = logging.getLogger(__name__)
 
@@ -80,11 +85,19 @@ class ChatService:
         refusal_message: str = "해당 질문은 제공된 공지로 답변할 수 없습니다.",
         max_candidates: int = 8,
         max_context_items: int = 4,
+        context_token_budget: int = 1200,
     ) -> None:
         self.llm_service = llm_service or LLMService()
         self.refusal_message = refusal_message
         self.max_candidates = max_candidates
         self.max_context_items = max_context_items
+        self.context_packer = ContextPacker(token_budget=context_token_budget)
+        settings = get_settings()
+        self.fusion_k = settings.hybrid_rrf_k
+        self.fusion_weights = {
+            "semantic": settings.hybrid_semantic_weight,
+            "keyword": settings.hybrid_keyword_weight,
+        }
 
     async def answer(
         self,
@@ -164,6 +177,7 @@ class ChatService:
             "reason": "success",
             "source": grounded.get("source", "llm"),
             "user_id": user_id,
+            "prompt_tokens": grounded.get("prompt_tokens"),
         }
         return {
             "answer": grounded["answer"],
@@ -178,8 +192,10 @@ class ChatService:
         department: Optional[str],
         grade: Optional[str],
     ) -> List[Dict[str, Any]]:
-        semantic_candidates = await self._semantic_candidates(question)
-        keyword_candidates = await self._keyword_candidates(question, department, grade)
+        semantic_candidates, keyword_candidates = await asyncio.gather(
+            self._semantic_candidates(question, department, grade),
+            self._keyword_candidates(question, department, grade),
+        )
 
         merged = self._merge_candidates(
             semantic_candidates,
@@ -187,17 +203,34 @@ class ChatService:
             department,
             grade,
         )
-        contexts: List[Dict[str, Any]] = []
-        for candidate in merged[: self.max_context_items]:
-            contexts.append(self._format_context(candidate["post"], candidate["score"], candidate["signals"]))
+        candidates = [
+            self._format_context(candidate["post"], candidate["score"], candidate["signals"])
+            for candidate in merged[: self.max_context_items]
+        ]
+        contexts, _ = self.context_packer.pack(question, candidates)
         return contexts
 
-    async def _semantic_candidates(self, question: str) -> List[Tuple[Post, float]]:
-        vector = await self.llm_service.embed(question)
-        if not vector:
+    async def _semantic_candidates(
+        self,
+        question: str,
+        department: Optional[str] = None,
+        grade: Optional[str] = None,
+    ) -> List[Tuple[Post, float]]:
+        # A fallback embedding is not comparable with the stored vectors, so a
+        # failed API call skips semantic retrieval and leaves the keyword side.
+        try:
+            vector = await self.llm_service.embed_strict(question)
+        except (LLMDisabledError, LLMRequestError) as exc:
+            logger.warning("Question embedding failed, skipping semantic retrieval: %s", exc)
+            return []
+        if vector is None:
             return []
 
-        hits = await vector_store.search_similar(vector, limit=self.max_candidates)
+        hits = await vector_store.search_similar(
+            vector,
+            limit=self.max_candidates,
+            search_filter=VectorFilter(department=department, audience_grade=grade),
+        )
         if not hits:
             return []
 
@@ -226,70 +259,45 @@ class ChatService:
         question: str,
         department: Optional[str],
         grade: Optional[str],
-    ) -> List[Post]:
+    ) -> List[Tuple[Post, float]]:
         filters = self._build_filters(department, grade)
-        regex_pattern = self._build_regex_pattern(question)
-        if regex_pattern:
-            regex = {"$regex": regex_pattern, "$options": "i"}
-            filters["$or"] = [
-                {"title": regex},
-                {"summary": regex},
-                {"body": regex},
-            ]
-
-        cursor = (
-            Post.find(filters)
-            .sort(-Post.posted_at)
-            .limit(self.max_candidates)
+        results = await keyword_search(
+            question,
+            filters,
+            limit=self.max_candidates,
+            with_total=False,
         )
-        return await cursor.to_list()
+        return results.items
 
     def _merge_candidates(
         self,
         semantic: Sequence[Tuple[Post, float]],
-        keyword: Sequence[Post],
+        keyword: Sequence[Tuple[Post, float]],
         department: Optional[str],
         grade: Optional[str],
     ) -> List[Dict[str, Any]]:
-        scored: Dict[str, Dict[str, Any]] = {}
-
-        for rank, (post, score) in enumerate(semantic):
-            pid = str(post.id)
-            scored[pid] = {
-                "post": post,
-                "semantic_score": score,
-                "semantic_rank": rank,
-            }
-
-        for rank, post in enumerate(keyword):
-            pid = str(post.id)
-            bucket = scored.setdefault(
-                pid,
-                {
-                    "post": post,
-                },
-            )
-            bucket["keyword_rank"] = rank
+        fused = reciprocal_rank_fusion(
+            {
+                "semantic": [(str(post.id), score, post) for post, score in semantic],
+                "keyword": [(str(post.id), score, post) for post, score in keyword],
+            },
+            weights=self.fusion_weights,
+            k=self.fusion_k,
+        )
 
         combined: List[Dict[str, Any]] = []
-        for pid, data in scored.items():
-            post = data["post"]
-            semantic_score = data.get("semantic_score")
-            keyword_rank = data.get("keyword_rank")
-            score = self._score_candidate(
-                post,
-                semantic_score,
-                keyword_rank,
-                department,
-                grade,
-            )
+        for entry in fused:
+            post = entry["item"]
+            semantic_signal = entry["signals"].get("semantic")
+            keyword_signal = entry["signals"].get("keyword")
             combined.append(
                 {
                     "post": post,
-                    "score": score,
+                    "score": self._score_candidate(post, entry["score"], department, grade),
                     "signals": {
-                        "semantic_score": semantic_score,
-                        "keyword_rank": keyword_rank,
+                        "semantic_score": semantic_signal["score"] if semantic_signal else None,
+                        "keyword_rank": keyword_signal["rank"] - 1 if keyword_signal else None,
+                        "fused_score": entry["score"],
                     },
                 }
             )
@@ -319,6 +327,7 @@ class ChatService:
                 ),
             },
         ]
+        token_count = prompt_tokens(messages)
         try:
             content = await self.llm_service.client.chat_completion(
                 messages=messages,
@@ -331,6 +340,7 @@ class ChatService:
                 "answer": self._fallback_answer(contexts),
                 "citations": [ctx["post_id"] for ctx in contexts],
                 "source": "fallback",
+                "prompt_tokens": token_count,
             }
 
         parsed = self._parse_llm_response(content, contexts)
@@ -340,8 +350,10 @@ class ChatService:
                 "answer": self._fallback_answer(contexts),
                 "citations": [ctx["post_id"] for ctx in contexts],
                 "source": "fallback",
+                "prompt_tokens": token_count,
             }
         parsed["source"] = "llm"
+        parsed["prompt_tokens"] = token_count
         return parsed
 
     def _parse_llm_response(
@@ -436,16 +448,11 @@ class ChatService:
     def _score_candidate(
         self,
         post: Post,
-        semantic_score: Optional[float],
-        keyword_rank: Optional[int],
+        relevance: float,
         department: Optional[str],
         grade: Optional[str],
     ) -> float:
-        score = 0.0
-        if semantic_score is not None:
-            score += 0.5 * max(0.0, min(1.0, semantic_score))
-        if keyword_rank is not None:
-            score += 0.2 * (1 / (1 + keyword_rank))
+        score = 0.7 * relevance
         score += 0.2 * self._department_match(post, department)
         score += 0.1 * self._grade_match(post, grade)
         score += 0.1 * self._recency_score(post)
@@ -480,7 +487,7 @@ class ChatService:
             "post_id": str(post.id),
             "title": post.title,
             "summary": post.summary or self._truncate(post.body, 200),
-            "body_snippet": self._truncate(post.body, 480),
+            "body": post.body,
             "department": post.department,
             "audience_grade": post.audience_grade,
             "category": post.category,
@@ -495,15 +502,14 @@ class ChatService:
         blocks: List[str] = []
         for ctx in contexts:
             grades = ", ".join(ctx.get("audience_grade") or []) or "전체"
-            block = (
-                f"- post_id: {ctx['post_id']}\n"
-                f"  제목: {ctx['title']}\n"
-                f"  요약: {ctx.get('summary') or ''}\n"
-                f"  본문 발췌: {ctx.get('body_snippet')}\n"
-                f"  대상 학년: {grades}, 학과: {ctx.get('department') or '미정'}\n"
-                f"  게시일: {ctx.get('posted_at')} / 마감: {ctx.get('deadline_at') or '미정'}"
-            )
-            blocks.append(block)
+            lines = [f"- post_id: {ctx['post_id']}", f"  제목: {ctx['title']}"]
+            if ctx.get("summary"):
+                lines.append(f"  요약: {ctx['summary']}")
+            if ctx.get("body_snippet"):
+                lines.append(f"  본문 발췌: {ctx['body_snippet']}")
+            lines.append(f"  대상 학년: {grades}, 학과: {ctx.get('department') or '미정'}")
+            lines.append(f"  게시일: {ctx.get('posted_at')} / 마감: {ctx.get('deadline_at') or '미정'}")
+            blocks.append("\n".join(lines))
         return "\n\n".join(blocks)
 
     def _build_filters(
@@ -518,14 +524,6 @@ class ChatService:
             filters["audience_grade"] = grade
         return filters
 
-    def _build_regex_pattern(self, question: str) -> Optional[str]:
-        tokens = re.findall(r"[가-힣A-Za-z0-9]{2,}", question)
-        tokens = tokens[:5]
-        if not tokens:
-            stripped = question.strip()
-            return re.escape(stripped) if stripped else None
-        return "|".join(re.escape(token) for token in tokens)
-
     def _fallback_answer(self, contexts: Sequence[Dict[str, Any]]) -> str:
         lines = [
             "LLM 응답 생성을 사용할 수 없어 수집된 공지를 간단히 정리해 드릴게요:",
@@ -0,0 +1,163 @@
+"""
+Token-budgeted context packing for RAG chat prompts.
+"""
+from __future__ import annotations
+
+import math
+import re
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+HANGUL_PATTERN = re.compile(r"[가-힣]")
+WORD_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough BPE token estimate: Hangul syllables cost about one token each,
+    everything else about one token per four characters.
+    """
+    if not text:
+        return 0
+    hangul = len(HANGUL_PATTERN.findall(text))
+    other = len(text) - hangul
+    return hangul + math.ceil(other / 4)
+
+
+def split_sentences(text: str) -> List[str]:
+    return [part.strip() for part in SENTENCE_SPLIT.split(text or "") if part and part.strip()]
+
+
+def _shingles(text: str, size: int = 3) -> Set[str]:
+    compact = "".join(text.lower().split())
+    if len(compact) <= size:
+        return {compact} if compact else set()
+    return {compact[i : i + size] for i in range(len(compact) - size + 1)}
+
+
+def _query_terms(text: str) -> Set[str]:
+    terms: Set[str] = set()
+    for word in WORD_PATTERN.findall(text.lower()):
+        terms.add(word)
+        if len(word) > 2:
+            terms.update(word[i : i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+class ContextPacker:
+    """
+    Fills a token budget with the most useful parts of ranked contexts.
+
+    Contexts are visited in rank order while their header (title and metadata)
+    still fits; the top-ranked context is always kept. The summary is kept
+    unless it repeats text that is already packed, and body sentences are chosen
+    by overlap with the question until the budget or ``max_sentences`` is
+    reached.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 1200,
+        max_sentences: int = 4,
+        header_overhead: int = 40,
+        redundancy_threshold: float = 0.8,
+    ) -> None:
+        self.token_budget = token_budget
+        self.max_sentences = max_sentences
+        self.header_overhead = header_overhead
+        self.redundancy_threshold = redundancy_threshold
+
+    def pack(
+        self,
+        question: str,
+        contexts: Sequence[Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return the packed contexts (``summary``/``body_snippet`` rewritten) and
+        the estimated number of tokens they use. Each input context must carry
+        the full ``body``.
+        """
+        terms = _query_terms(question)
+        seen: Set[str] = set()
+        used = 0
+        packed: List[Dict[str, Any]] = []
+
+        for ctx in contexts:
+            header_tokens = self.header_overhead + estimate_tokens(ctx.get("title") or "")
+            if packed and used + header_tokens > self.token_budget:
+                break
+            used += header_tokens
+            seen |= _shingles(ctx.get("title") or "")
+
+            summary = ctx.get("summary") or ""
+            summary_tokens = estimate_tokens(summary)
+            if summary and not self._redundant(summary, seen) and used + summary_tokens <= self.token_budget:
+                used += summary_tokens
+                seen |= _shingles(summary)
+            else:
+                summary = ""
+
+            sentences, body_tokens = self._select_sentences(
+                ctx.get("body") or "",
+                terms,
+                seen,
+                self.token_budget - used,
+            )
+            used += body_tokens
+
+            item = {key: value for key, value in ctx.items() if key != "body"}
+            item["summary"] = summary
+            item["body_snippet"] = " ".join(sentences)
+            packed.append(item)
+
+        return packed, used
+
+    def _select_sentences(
+        self,
+        body: str,
+        terms: Set[str],
+        seen: Set[str],
+        remaining: int,
+    ) -> Tuple[List[str], int]:
+        sentences = split_sentences(body)
+        ranked = sorted(
+            enumerate(sentences),
+            key=lambda item: (self._relevance(item[1], terms), -item[0]),
+            reverse=True,
+        )
+        chosen: List[Tuple[int, str]] = []
+        used = 0
+        for position, sentence in ranked:
+            if len(chosen) >= self.max_sentences:
+                break
+            cost = estimate_tokens(sentence)
+            if cost > remaining - used or self._redundant(sentence, seen):
+                continue
+            chosen.append((position, sentence))
+            seen |= _shingles(sentence)
+            used += cost
+        chosen.sort()
+        return [sentence for _, sentence in chosen], used
+
+    def _relevance(self, sentence: str, terms: Set[str]) -> float:
+        if not terms:
+            return 0.0
+        sentence_terms = _query_terms(sentence)
+        if not sentence_terms:
+            return 0.0
+        overlap = len(terms & sentence_terms)
+        return overlap / math.sqrt(len(sentence_terms))
+
+    def _redundant(self, text: str, seen: Set[str]) -> bool:
+        shingles = _shingles(text)
+        if not shingles:
+            return True
+        contained = len(shingles & seen) / len(shingles)
+        return contained >= self.redundancy_threshold
+
+
+def prompt_tokens(messages: Sequence[Dict[str, Any]], per_message_overhead: int = 4) -> int:
+    return sum(
+        estimate_tokens(str(message.get("content") or "")) + per_message_overhead
+        for message in messages
+    )
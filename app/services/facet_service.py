@@ -0,0 +1,145 @@
+"""
+Filter facets (category, department, grade, source) with counts.
+
+All facets for a (query, filters) pair come from one ``$facet`` aggregation and
+are cached per corpus version, so ingest invalidates them by bumping the
+version. The unfiltered facets for each scope are precomputed by ingest and
+stored in ``corpus_state`` next to the version they were computed for; every
+worker serves them without aggregating.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.core.cache import TTLCache, VersionedCache
+from app.core.config import get_settings
+from app.db import mongo
+from app.db.corpus_version import STATE_COLLECTION, CorpusVersion, get_corpus_version
+from app.models.post import Post
+from app.services.keyword_index import candidate_cap_stages, keyword_match, query_tokens
+
+FACET_FIELDS = ("category", "department", "audience_grade", "source")
+ARRAY_FIELDS = {"audience_grade"}
+MAX_FACET_VALUES = 50
+# "feed" is limited to feed-visible posts; "search" covers every post.
+SCOPES = ("search", "feed")
+
+
+def facet_pipeline(match: Dict[str, Any], candidate_stages: Sequence[Dict[str, Any]] = ()) -> List[Dict[str, Any]]:
+    """Counts over the documents left after ``match`` and ``candidate_stages``."""
+    facets: Dict[str, List[Dict[str, Any]]] = {}
+    for field in FACET_FIELDS:
+        stages: List[Dict[str, Any]] = [{"$unwind": f"${field}"}] if field in ARRAY_FIELDS else []
+        stages += [
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$match": {"_id": {"$nin": [None, ""]}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": MAX_FACET_VALUES},
+        ]
+        facets[field] = stages
+    facets["total"] = [{"$count": "value"}]
+    return [{"$match": match}, *candidate_stages, {"$facet": facets}]
+
+
+def base_match(scope: str) -> Dict[str, Any]:
+    if scope == "feed":
+        return {"feed_visible": True}
+    return {}
+
+
+class FacetService:
+    def __init__(
+        self,
+        cache: Optional[VersionedCache] = None,
+        corpus_version: Optional[CorpusVersion] = None,
+    ) -> None:
+        settings = get_settings()
+        self.cache = cache or VersionedCache(
+            TTLCache(maxsize=settings.facet_cache_size, ttl=settings.search_result_cache_ttl_seconds)
+        )
+        self.corpus_version = corpus_version or get_corpus_version()
+
+    async def facets(
+        self,
+        scope: str = "search",
+        query: Optional[str] = None,
+        department: Optional[str] = None,
+        grade: Optional[str] = None,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown facet scope: {scope}")
+        tokens = query_tokens(query or "")
+        match = base_match(scope)
+        for field, value in (
+            ("department", department),
+            ("audience_grade", grade),
+            ("category", category),
+            ("source", source),
+        ):
+            if value:
+                match[field] = value
+        stages: List[Dict[str, Any]] = []
+        # Count exactly the candidates keyword search ranks for the same query.
+        keyword = await keyword_match(query or "", match) if tokens else None
+        if keyword is not None:
+            match = keyword.match
+            stages = candidate_cap_stages()
+
+        version = await self.corpus_version.current()
+        unfiltered = match == base_match(scope)
+        key = ("facets", scope, tuple(tokens), department, grade, category, source)
+        result = await self.cache.get_or_compute(
+            key,
+            version,
+            (lambda: self._snapshot(scope, version)) if unfiltered else (lambda: self._compute(match, stages)),
+        )
+        return {
+            "facets": result["facets"],
+            "meta": {"total": result["total"], "scope": scope, "version": version, "precomputed": unfiltered},
+        }
+
+    async def precompute(self, version: Optional[int] = None) -> None:
+        """Store the unfiltered facets of every scope for ``version`` (ingest)."""
+        version = version if version is not None else await self.corpus_version.current()
+        for scope in SCOPES:
+            await self._store(scope, version, await self._compute(base_match(scope)))
+
+    async def _snapshot(self, scope: str, version: int) -> Dict[str, Any]:
+        collection = self._collection()
+        if collection is not None:
+            document = await collection.find_one({"_id": f"facets:{scope}"})
+            if document and document.get("version") == version:
+                return document["value"]
+        # Missing or older than the corpus (e.g. a reconciler bump): rebuild it.
+        result = await self._compute(base_match(scope))
+        await self._store(scope, version, result)
+        return result
+
+    async def _compute(self, match: Dict[str, Any], stages: Sequence[Dict[str, Any]] = ()) -> Dict[str, Any]:
+        documents = await Post.get_motor_collection().aggregate(facet_pipeline(match, stages)).to_list(length=1)
+        facet = documents[0] if documents else {}
+        total = facet.get("total") or []
+        return {
+            "facets": {
+                field: [{"value": bucket["_id"], "count": bucket["count"]} for bucket in facet.get(field, [])]
+                for field in FACET_FIELDS
+            },
+            "total": total[0]["value"] if total else 0,
+        }
+
+    async def _store(self, scope: str, version: int, value: Dict[str, Any]) -> None:
+        collection = self._collection()
+        if collection is None:
+            return
+        await collection.replace_one(
+            {"_id": f"facets:{scope}"},
+            {"_id": f"facets:{scope}", "version": version, "value": value},
+            upsert=True,
+        )
+
+    def _collection(self):
+        if mongo.mongo_client is None:
+            return None
+        return mongo.mongo_client[get_settings().mongo_db][STATE_COLLECTION]
@@ -1,10 +1,53 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 from beanie import PydanticObjectId
+from bson import ObjectId
+from bson.errors import InvalidId
 
-from app.models.post import Post
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.cursor import decode_cursor, encode_cursor
+from app.db.corpus_version import CorpusVersion, get_corpus_version
+from app.db.pagination import paginate
+from app.models.post import LIST_PROJECTION, Post, PostListView
+from app.services.hydration import list_item
+
+# Keyset order; backed by the (feed_visible[, category], posted_at, _id) indexes.
+FEED_SORT = {"posted_at": -1, "_id": -1}
+
+
+class FeedPageCache:
+    """
+    Rendered feed pages as JSON bytes, keyed by corpus version. Ingest
+    invalidates pages by bumping the shared version, so every worker derives
+    the same ETag; likes do not change any rendered field. Anything that
+    starts to must bump the corpus version too.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 3600.0) -> None:
+        self.pages = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def etag(self, version: int, category: Optional[str], page: int, page_size: int) -> str:
+        return f'W/"feed-{version}-{category or ""}-{page}-{page_size}"'
+
+
+@lru_cache
+def get_feed_page_cache() -> FeedPageCache:
+    settings = get_settings()
+    return FeedPageCache(settings.feed_page_cache_size, settings.feed_page_cache_ttl_seconds)
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
 
 
 class FeedService:
@@ -12,67 +55,172 @@ class FeedService:
     Provides simple feed and post retrieval backed by MongoDB.
     """
 
+    def __init__(
+        self,
+        count_cache: Optional[TTLCache] = None,
+        page_cache: Optional[FeedPageCache] = None,
+        corpus_version: Optional[CorpusVersion] = None,
+    ) -> None:
+        self.count_cache = count_cache or TTLCache(
+            maxsize=64,
+            ttl=get_settings().feed_count_cache_ttl_seconds,
+        )
+        self.page_cache = page_cache or get_feed_page_cache()
+        self.corpus_version = corpus_version or get_corpus_version()
+        self._counted_version: Optional[int] = None
+
+    async def get_feed_page(
+        self,
+        category: Optional[str],
+        page: int,
+        page_size: int,
+        if_none_match: Optional[str] = None,
+    ) -> Tuple[str, Optional[bytes]]:
+        """
+        ETag and pre-serialised JSON body of a page-number feed page. The body
+        is None when ``if_none_match`` already names the current ETag, so a
+        revalidation costs no Mongo query and no rendering.
+        """
+        version = await self.corpus_version.current()
+        etag = self.page_cache.etag(version, category, page, page_size)
+        if etag_matches(etag, if_none_match):
+            return etag, None
+
+        cache_key = (version, category, page, page_size)
+        body = self.page_cache.pages.get(cache_key)
+        if body is None:
+            if self._counted_version != version:
+                # Totals counted before an ingest would otherwise be frozen into pages.
+                self.count_cache.clear()
+                self._counted_version = version
+            feed = await self.get_feed(category=category, page=page, page_size=page_size)
+            body = json.dumps(feed, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            self.page_cache.pages.set(cache_key, body)
+        return etag, body
+
     async def get_feed(
         self,
         category: Optional[str],
         page: int,
         page_size: int,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
-        filters: Dict[str, Any] = {}
+        """
+        Newest-first feed page. With ``cursor`` (``meta.next_cursor`` of the
+        previous page) the page is fetched by keyset on (``posted_at``,
+        ``_id``) instead of skipping, so deep pages cost the same as the first
+        and concurrent inserts do not shift them; ``page`` is then ignored.
+        """
+        filters: Dict[str, Any] = {"feed_visible": True}
         if category:
             filters["category"] = category
-        exclude_sources = {
-            None,
-            "",
-            "seed_posts",
-            "dummy-source",
-            "scholarship-board",
-            "internship-board",
-            "scholarship-source",
-            "internship-source",
-        }
-        filters["source"] = {"$nin": list(exclude_sources)}
+
+        if cursor:
+            return await self._get_feed_after(filters, category, page_size, cursor)
 
         offset = max(page - 1, 0) * page_size
 
-        total = await Post.find(filters).count()
-        posts: List[Post] = (
-            await Post.find(filters)
-            .sort(-Post.posted_at)
-            .skip(offset)
-            .limit(page_size)
-            .to_list()
+        result = await paginate(
+            Post,
+            filters,
+            FEED_SORT,
+            offset,
+            page_size,
+            projection=LIST_PROJECTION,
+            count_cache=self.count_cache,
+            model=PostListView,
         )
+        posts: List[PostListView] = result.items
+        total = result.total or 0
 
         items = [self._format_post_item(post) for post in posts]
         total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+        has_more = len(posts) == page_size and offset + page_size < total
 
         return {
             "items": items,
             "meta": {
                 "total": total,
+                "total_is_estimate": result.total_is_estimate,
                 "page": page,
                 "page_size": page_size,
                 "total_pages": total_pages,
+                "next_cursor": self._next_cursor(posts[-1], category) if has_more else None,
+            },
+        }
+
+    async def _get_feed_after(
+        self,
+        filters: Dict[str, Any],
+        category: Optional[str],
+        page_size: int,
+        cursor: str,
+    ) -> Dict[str, Any]:
+        posted_at, last_id = self._decode_feed_cursor(cursor, category)
+        match = {
+            **filters,
+            "$or": [
+                {"posted_at": {"$lt": posted_at}},
+                {"posted_at": posted_at, "_id": {"$lt": last_id}},
+            ],
+        }
+        # One extra row tells whether another page exists without counting.
+        result = await paginate(
+            Post,
+            match,
+            FEED_SORT,
+            0,
+            page_size + 1,
+            projection=LIST_PROJECTION,
+            with_total=False,
+            model=PostListView,
+        )
+        posts: List[PostListView] = result.items[:page_size]
+        has_more = len(result.items) > page_size
+
+        return {
+            "items": [self._format_post_item(post) for post in posts],
+            "meta": {
+                "total": None,
+                "total_is_estimate": True,
+                "page": None,
+                "page_size": page_size,
+                "total_pages": None,
+                "next_cursor": self._next_cursor(posts[-1], category) if has_more else None,
             },
         }
 
+    @staticmethod
+    def _next_cursor(post: PostListView, category: Optional[str]) -> str:
+        return encode_cursor({"t": post.posted_at.isoformat(), "i": str(post.id), "c": category})
+
+    @staticmethod
+    def _decode_feed_cursor(cursor: str, category: Optional[str]) -> Tuple[datetime, ObjectId]:
+        state = decode_cursor(cursor)
+        if state.get("c") != category:
+            raise ValueError("Cursor does not match the requested category")
+        try:
+            return datetime.fromisoformat(state["t"]), ObjectId(state["i"])
+        except (KeyError, TypeError, ValueError, InvalidId) as exc:
+            raise ValueError("Invalid cursor") from exc
+
     async def get_post(self, post_id: str | PydanticObjectId) -> Optional[Post]:
         return await Post.get(post_id)
 
-    def _format_post_item(self, post: Post) -> Dict[str, Any]:
-        """Post 모델을 API 응답 형식으로 변환"""
+    def _format_post_item(self, post: Post | PostListView) -> Dict[str, Any]:
+        """Post 모델을 API 응답 형식으로 변환 (공용 목록 항목 기반)"""
+        item = list_item(post)
         # source를 객체 배열로 변환
         source_list = []
-        if post.source:
-            source_list.append({"name": post.source, "url": None})
+        if item["source"]:
+            source_list.append({"name": item["source"], "url": None})
 
         return {
-            "id": str(post.id),
-            "title": post.title,
-            "tags": post.tags,
-            "category": post.category or "",
+            "id": item["id"],
+            "title": item["title"],
+            "tags": item["tags"],
+            "category": item["category"] or "",
             "source": source_list,
-            "posted_at": post.posted_at.isoformat() if post.posted_at else None,
-            "deadline": post.deadline_at.isoformat() if post.deadline_at else None,
+            "posted_at": item["posted_at"],
+            "deadline": item["deadline_at"],
         }
@@ -0,0 +1,47 @@
+"""
+Reciprocal rank fusion shared by hybrid search and chat retrieval.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+# (key, signal score, item) in rank order; key dedupes across signals (post id).
+Ranking = Sequence[Tuple[Hashable, Optional[float], Any]]
+
+DEFAULT_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Mapping[str, Ranking],
+    weights: Optional[Mapping[str, float]] = None,
+    k: int = DEFAULT_K,
+) -> List[Dict[str, Any]]:
+    """
+    Fuse ranked lists with ``sum(weight / (k + rank))`` (rank is 1-based) and
+    return one entry per key, best first::
+
+        {"key", "item", "score", "signals": {name: {"rank", "score"}}}
+
+    ``score`` is normalised by the best achievable value so it lies in
+    ``(0, 1]`` regardless of ``k`` and the weights. The item is taken from the
+    first ranking that contains the key.
+    """
+    weights = weights or {}
+    fused: Dict[Hashable, Dict[str, Any]] = {}
+    for name, ranking in rankings.items():
+        weight = weights.get(name, 1.0)
+        for rank, (key, score, item) in enumerate(ranking, start=1):
+            entry = fused.get(key)
+            if entry is None:
+                entry = fused[key] = {"key": key, "item": item, "score": 0.0, "signals": {}}
+            if name in entry["signals"]:
+                continue
+            entry["score"] += weight / (k + rank)
+            entry["signals"][name] = {"rank": rank, "score": score}
+
+    best = sum(weights.get(name, 1.0) for name in rankings) / (k + 1)
+    results = sorted(fused.values(), key=lambda entry: entry["score"], reverse=True)
+    if best > 0:
+        for entry in results:
+            entry["score"] = entry["score"] / best
+    return results
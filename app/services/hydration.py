@@ -0,0 +1,115 @@
+"""
+Turn vector search hits into API items, touching Mongo only when needed.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from beanie.operators import In
+from bson import ObjectId
+
+from app.models.post import LIST_FIELDS, Post, PostListView
+
+# Keys ``fields=`` can select; ``id`` and score/explanation keys are always kept.
+SELECTABLE_FIELDS = ("id", *LIST_FIELDS)
+SCORE_FIELDS = ("semantic_score", "keyword_score", "hybrid_score", "signals")
+
+
+def hit_post_id(hit: Dict[str, Any]) -> Optional[str]:
+    return hit.get("post_id") or hit.get("payload", {}).get("post_id") or hit.get("id")
+
+
+def light_item(hit: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """List-view item built from a hit's payload, or None for legacy payloads."""
+    payload = hit.get("payload") or {}
+    if "title" not in payload:
+        return None
+    item: Dict[str, Any] = {"id": hit_post_id(hit)}
+    item.update({field: payload.get(field) for field in LIST_FIELDS})
+    item["semantic_score"] = hit.get("score")
+    return item
+
+
+def list_item(post: Union[Post, PostListView]) -> Dict[str, Any]:
+    """Compact list item shared by feed, search and recommendation responses."""
+    return {
+        "id": str(post.id),
+        "title": post.title,
+        "summary": post.summary,
+        "category": post.category,
+        "department": post.department,
+        "tags": post.tags,
+        "source": post.source,
+        "posted_at": post.posted_at.isoformat() if post.posted_at else None,
+        "deadline_at": post.deadline_at.isoformat() if post.deadline_at else None,
+    }
+
+
+def light_item_from_post(post: Union[Post, PostListView], score: Optional[float]) -> Dict[str, Any]:
+    item = list_item(post)
+    item["semantic_score"] = score
+    return item
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated ``fields=`` value; ValueError on unknown names."""
+    if not fields:
+        return None
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in SELECTABLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(SELECTABLE_FIELDS)})")
+    return names or None
+
+
+def select_fields(items: Iterable[Dict[str, Any]], fields: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+    """Copies of ``items`` restricted to ``fields`` plus id and score keys."""
+    if not fields:
+        return list(items)
+    keep = ("id", *fields, *SCORE_FIELDS)
+    return [{key: item[key] for key in keep if key in item} for item in items]
+
+
+async def hydrate_hits(
+    hits: Iterable[Dict[str, Any]],
+    view: str = "full",
+    exclude_ids: Optional[set[str]] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Build ordered items for ``hits``. ``view="light"`` serves display fields
+    straight from the Qdrant payload and only loads posts whose payload predates
+    those fields (projected to the list fields); ``view="full"`` returns whole
+    ``Post`` documents.
+    """
+    exclude_ids = exclude_ids or set()
+    selected = [hit for hit in hits if hit_post_id(hit) and hit_post_id(hit) not in exclude_ids]
+
+    items: List[Optional[Dict[str, Any]]] = [None] * len(selected)
+    if view == "light":
+        items = [light_item(hit) for hit in selected]
+
+    missing = [
+        index
+        for index, item in enumerate(items)
+        if item is None and ObjectId.is_valid(hit_post_id(selected[index]))
+    ]
+    if missing:
+        object_ids = [ObjectId(hit_post_id(selected[index])) for index in missing]
+        query = Post.find(In(Post.id, object_ids))
+        posts = await (query.project(PostListView) if view == "light" else query).to_list()
+        post_map = {str(post.id): post for post in posts}
+        for index in missing:
+            hit = selected[index]
+            post = post_map.get(hit_post_id(hit))
+            if not post:
+                continue
+            if view == "light":
+                items[index] = light_item_from_post(post, hit.get("score"))
+            else:
+                data = post.model_dump()
+                data["semantic_score"] = hit.get("score")
+                items[index] = data
+
+    results = [item for item in items if item is not None]
+    return results[:limit] if limit is not None else results
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import logging
 from datetime import datetime
 from typing import Optional
 
 from beanie import PydanticObjectId
+from pymongo.errors import PyMongoError
 
 from app.models.interaction import Interaction
 from app.models.post import Post
 from app.models.user import User
+from app.services.preference_service import PreferenceConflictError, PreferenceService
+from app.services.vector_store import QDRANT_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# A failed preference update must not fail the like itself; ``rebuild`` repairs it.
+PREFERENCE_ERRORS = (*QDRANT_ERRORS, PyMongoError, PreferenceConflictError)
 
 
 class InteractionService:
@@ -15,6 +24,9 @@ class InteractionService:
     Handles likes/saves interactions and keeps user preference cache in sync.
     """
 
+    def __init__(self, preference_service: Optional[PreferenceService] = None) -> None:
+        self.preference_service = preference_service or PreferenceService()
+
     async def like_post(self, user_id: str, post_id: str) -> dict:
         user = await User.get(user_id)
         if not user:
@@ -32,16 +44,22 @@ class InteractionService:
         if interaction:
             return {"status": "exists"}
 
+        liked_at = datetime.utcnow()
         await Interaction(
             user_id=user_id,
             post_id=post_id,
             type="like",
-            ts=datetime.utcnow(),
+            ts=liked_at,
         ).insert()
-
-        liked_ids = set(user.liked_post_ids or [])
-        liked_ids.add(post_id)
-        user.liked_post_ids = list(liked_ids)
+        try:
+            await self.preference_service.add_like(user, post_id, liked_at)
+        except PREFERENCE_ERRORS as exc:
+            logger.warning("Preference vector update failed for user %s: %s", user_id, exc)
+
+        # Keep likes in chronological order; recommendations use the most recent ones.
+        liked_ids = [pid for pid in user.liked_post_ids or [] if pid != post_id]
+        liked_ids.append(post_id)
+        user.liked_post_ids = liked_ids
         await user.save()
 
         post.likes += 1
@@ -61,10 +79,14 @@ class InteractionService:
         )
         if interaction:
             await interaction.delete()
+            try:
+                await self.preference_service.remove_like(user, post_id, interaction.ts)
+            except PREFERENCE_ERRORS as exc:
+                logger.warning("Preference vector update failed for user %s: %s", user_id, exc)
 
-        if user.liked_post_ids:
+        if user.liked_post_ids or interaction:
             user.liked_post_ids = [
-                pid for pid in user.liked_post_ids if pid != post_id
+                pid for pid in user.liked_post_ids or [] if pid != post_id
             ]
             await user.save()
 
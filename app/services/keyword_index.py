@@ -0,0 +1,243 @@
+"""
+Korean-aware keyword index stored on each post.
+
+Ingest stores ``search_tokens`` (multikey-indexed) and ``title_tokens`` on every
+post: lower-cased words plus character bigrams of Hangul words, so
+"장학금신청" is found by "장학금" or "신청" without a morphological analyser.
+Queries are tokenised the same way, matched with an indexed ``$in`` and ranked
+by how many query tokens a post covers (title hits count double), so no user
+input ever reaches ``$regex``. A one-character query (e.g. "꿈") has no bigram
+and matches tokens starting with it through an index range instead.
+
+Candidates are the posts containing the rarest query tokens: tokens are taken
+in ascending document frequency while their summed frequency stays within
+``KEYWORD_CANDIDATE_LIMIT``, so common tokens ("안내") still add to a
+candidate's score without flooding the candidate set. Candidates are scored as
+stubs; whole documents are looked up for the returned page only. Totals are
+flagged as estimates when common tokens were left out or the candidate set hit
+the limit.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.db.pagination import Page, paginate
+from app.models.post import LIST_PROJECTION, Post, PostListView
+
+WORD_RE = re.compile(r"[가-힣]+|[a-z0-9]+")
+HANGUL_RE = re.compile(r"[가-힣]+")
+
+# Long bodies mostly repeat boilerplate; indexing the head keeps the index small.
+MAX_BODY_CHARS = 2000
+MAX_QUERY_TOKENS = 32
+TITLE_WEIGHT = 2
+TOKEN_FIELDS_EXCLUDED = {"search_tokens": 0, "title_tokens": 0}
+# Document frequencies only steer candidate selection, so minutes-old counts are fine.
+TOKEN_FREQUENCY_TTL_SECONDS = 600
+
+_token_frequencies = TTLCache(maxsize=4096, ttl=TOKEN_FREQUENCY_TTL_SECONDS)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Unique tokens of ``text`` in first-seen order."""
+    tokens: Dict[str, None] = {}
+    for word in WORD_RE.findall((text or "").lower()):
+        if HANGUL_RE.fullmatch(word):
+            tokens[word] = None
+            for index in range(len(word) - 1):
+                tokens[word[index : index + 2]] = None
+        elif len(word) >= 2 or word.isdigit():
+            tokens[word] = None
+    return list(tokens)
+
+
+def index_fields(title: str, summary: Optional[str], body: Optional[str]) -> Dict[str, List[str]]:
+    """Token fields to store on a ``Post``."""
+    title_tokens = tokenize(title)
+    search_tokens = dict.fromkeys(title_tokens)
+    search_tokens.update(dict.fromkeys(tokenize(summary)))
+    search_tokens.update(dict.fromkeys(tokenize((body or "")[:MAX_BODY_CHARS])))
+    return {"search_tokens": list(search_tokens), "title_tokens": title_tokens}
+
+
+def query_tokens(query: str) -> List[str]:
+    return tokenize(query)[:MAX_QUERY_TOKENS]
+
+
+@dataclass
+class KeywordMatch:
+    """Candidate filter and score for a non-empty query (see ``keyword_match``)."""
+
+    match: Dict[str, Any]
+    score_expression: Dict[str, Any]
+    max_score: int
+    # Common tokens were left out of ``match``; posts holding only those are not candidates.
+    partial: bool = False
+
+
+async def keyword_match(query: str, filters: Dict[str, Any]) -> Optional[KeywordMatch]:
+    """
+    ``$match`` selecting the candidates for ``query`` within ``filters`` and the
+    score expression ranking them; ``None`` when the query has no tokens.
+    """
+    tokens = query_tokens(query)
+    if not tokens:
+        return None
+    match = dict(filters)
+    if _is_prefix_query(query, tokens):
+        # One character: match every token starting with it (an index range).
+        match["search_tokens"] = {"$elemMatch": {"$gte": tokens[0], "$lt": chr(ord(tokens[0]) + 1)}}
+        title_score: Dict[str, Any] = {
+            "$cond": [
+                {
+                    "$anyElementTrue": [
+                        {
+                            "$map": {
+                                "input": {"$ifNull": ["$title_tokens", []]},
+                                "in": {"$eq": [{"$substrCP": ["$$this", 0, 1]}, tokens[0]]},
+                            }
+                        }
+                    ]
+                },
+                TITLE_WEIGHT,
+                0,
+            ]
+        }
+        return KeywordMatch(match, {"$add": [1, title_score]}, 1 + TITLE_WEIGHT)
+
+    candidates = await _rarest_tokens(tokens, get_settings().keyword_candidate_limit)
+    match["search_tokens"] = {"$in": candidates}
+    score_expression = {
+        "$add": [
+            {"$size": {"$setIntersection": ["$search_tokens", tokens]}},
+            {
+                "$multiply": [
+                    TITLE_WEIGHT,
+                    {"$size": {"$setIntersection": [{"$ifNull": ["$title_tokens", []]}, tokens]}},
+                ]
+            },
+        ]
+    }
+    return KeywordMatch(match, score_expression, len(tokens) * (1 + TITLE_WEIGHT), len(candidates) < len(tokens))
+
+
+async def keyword_search(
+    query: str,
+    filters: Dict[str, Any],
+    skip: int = 0,
+    limit: int = 20,
+    with_total: bool = True,
+    list_view: bool = False,
+) -> Page:
+    """
+    Posts matching ``filters`` ranked by keyword relevance to ``query`` (newest
+    first for ties or an empty query), as ``(post, score)`` items. Scores are
+    the weighted share of query tokens a post covers, in ``[0, 1]``. Page and
+    total come from one query. ``list_view=True`` fetches only the list fields
+    as ``PostListView``.
+    """
+    keyword = await keyword_match(query, filters)
+    model = PostListView if list_view else Post
+    projection = LIST_PROJECTION if list_view else TOKEN_FIELDS_EXCLUDED
+    if keyword is None:
+        page = await paginate(
+            Post,
+            dict(filters),
+            {"posted_at": -1, "_id": -1},
+            skip,
+            limit,
+            projection=projection,
+            with_total=with_total,
+            model=model,
+        )
+        page.items = [(post, 0.0) for post in page.items]
+        return page
+
+    candidate_limit = get_settings().keyword_candidate_limit
+    candidate_stages = [
+        *candidate_cap_stages(),
+        # Rank on small stubs; whole posts are looked up for the page only.
+        {"$project": {"posted_at": 1, "_keyword_score": keyword.score_expression}},
+    ]
+    page = await paginate(
+        Post,
+        keyword.match,
+        {"_keyword_score": -1, "posted_at": -1, "_id": -1},
+        skip,
+        limit,
+        stages=candidate_stages,
+        page_stages=_lookup_stages(),
+        projection={**projection, "_keyword_score": 1} if list_view else projection,
+        with_total=with_total,
+        parse=False,
+    )
+    results: List[Tuple[Union[Post, PostListView], float]] = []
+    for document in page.items:
+        score = document.pop("_keyword_score") / keyword.max_score
+        results.append((model.model_validate(document), score))
+    capped = page.total is not None and page.total >= candidate_limit
+    return Page(items=results, total=page.total, total_is_estimate=keyword.partial or capped)
+
+
+def candidate_cap_stages() -> List[Dict[str, Any]]:
+    """
+    Stages after ``keyword_match``'s ``$match`` keeping the newest
+    ``KEYWORD_CANDIDATE_LIMIT`` candidates: a safety cap for a single token (or
+    prefix) too common to narrow down.
+    """
+    return [{"$sort": {"posted_at": -1, "_id": -1}}, {"$limit": get_settings().keyword_candidate_limit}]
+
+
+async def _rarest_tokens(tokens: List[str], budget: int) -> List[str]:
+    """
+    ``tokens`` in ascending document frequency, as many as fit ``budget``
+    summed matches (at least one). A post holding none of them can only match
+    the commoner tokens, which are left to scoring.
+    """
+    if len(tokens) == 1:
+        return tokens
+    frequencies = await token_frequencies(tokens)
+    selected: List[str] = []
+    covered = 0
+    for token in sorted(tokens, key=lambda token: frequencies[token]):
+        if selected and covered + frequencies[token] > budget:
+            break
+        selected.append(token)
+        covered += frequencies[token]
+    return selected
+
+
+async def token_frequencies(tokens: List[str]) -> Dict[str, int]:
+    """Number of posts holding each token (index-only counts, cached briefly)."""
+    missing = [token for token in tokens if _token_frequencies.get(token) is None]
+    if missing:
+        collection = Post.get_motor_collection()
+        counts = await asyncio.gather(*(collection.count_documents({"search_tokens": token}) for token in missing))
+        for token, count in zip(missing, counts):
+            _token_frequencies.set(token, count)
+    return {token: _token_frequencies.get(token) or 0 for token in tokens}
+
+
+def _is_prefix_query(query: str, tokens: List[str]) -> bool:
+    words = WORD_RE.findall(query.lower())
+    return len(words) == 1 and len(words[0]) == 1 and tokens == words
+
+
+def _lookup_stages() -> List[Dict[str, Any]]:
+    """Replace each scored stub on the page with its whole post (by ``_id``)."""
+    return [
+        {"$lookup": {"from": Post.get_collection_name(), "localField": "_id", "foreignField": "_id", "as": "_post"}},
+        {"$match": {"_post": {"$ne": []}}},
+        {
+            "$replaceRoot": {
+                "newRoot": {
+                    "$mergeObjects": [{"$arrayElemAt": ["$_post", 0]}, {"_keyword_score": "$_keyword_score"}]
+                }
+            }
+        },
+    ]
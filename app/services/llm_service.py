@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import hashlib
 import logging
-from typing import List, Optional
+from typing import Optional
+
+import numpy as np
 
 from app.clients.llm import LLMClient, LLMDisabledError, LLMRequestError, get_llm_client
 from app.core.config import get_settings
+from app.services.local_embedding import LocalEmbeddingEngine, get_local_embedding_engine
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +18,17 @@ class LLMService:
     external LLM is unavailable.
     """
 
-    def __init__(self, client: Optional[LLMClient] = None) -> None:
+    def __init__(
+        self,
+        client: Optional[LLMClient] = None,
+        local_embedder: Optional[LocalEmbeddingEngine] = None,
+    ) -> None:
         self.client = client or get_llm_client()
         settings = get_settings()
         self.vector_size = settings.qdrant_vector_size
         self.categories = settings.llm_categories
+        self.embedding_backend = settings.embedding_backend
+        self.local_embedder = local_embedder or get_local_embedding_engine()
 
     async def summarize(self, text: str) -> str:
         text = text.strip()
@@ -32,15 +40,30 @@ class LLMService:
             logger.warning("Falling back to heuristic summary: %s", exc)
             return self._fallback_summary(text)
 
-    async def embed(self, text: str) -> Optional[List[float]]:
+    async def embed(self, text: str) -> Optional[np.ndarray]:
         text = text.strip()
         if not text:
             return None
+        if self.embedding_backend == "local":
+            return self._fallback_embedding(text)
         try:
-            return await self.client.embed_text(text)
+            return np.asarray(await self.client.embed_text(text), dtype=np.float32)
         except (LLMDisabledError, LLMRequestError) as exc:
-            logger.warning("Falling back to pseudo embedding: %s", exc)
+            logger.warning("Falling back to local n-gram embedding: %s", exc)
+            return self._fallback_embedding(text)
+
+    async def embed_strict(self, text: str) -> Optional[np.ndarray]:
+        """
+        Like ``embed`` but never substitutes the local n-gram embedding for a
+        failed API call (raises ``LLMDisabledError``/``LLMRequestError``), for
+        writers that must keep a collection in a single embedding space.
+        """
+        text = text.strip()
+        if not text:
+            return None
+        if self.embedding_backend == "local":
             return self._fallback_embedding(text)
+        return np.asarray(await self.client.embed_text(text), dtype=np.float32)
 
     async def classify_category(self, text: str) -> str:
         text = text.strip()
@@ -61,16 +84,8 @@ class LLMService:
             return text
         return f"{text[:limit].rstrip()}..."
 
-    def _fallback_embedding(self, text: str) -> List[float]:
-        digest = hashlib.sha256(text.encode("utf-8")).digest()
-        # Repeat the digest to reach the desired vector size
-        bytes_needed = self.vector_size * 4  # floats
-        repeated = (digest * ((bytes_needed // len(digest)) + 1))[:bytes_needed]
-        vector = [
-            (int.from_bytes(repeated[i : i + 4], "little", signed=False) % 1000) / 1000
-            for i in range(0, bytes_needed, 4)
-        ]
-        return vector[: self.vector_size]
+    def _fallback_embedding(self, text: str) -> np.ndarray:
+        return self.local_embedder.embed(text)
 
     def _fallback_classification(self, text: str) -> str:
         lowered = text.lower()
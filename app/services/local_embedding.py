@@ -0,0 +1,126 @@
+"""
+Offline embedding backend based on hashed character n-gram TF-IDF vectors.
+
+Each text is tokenised into whole words plus padded character n-grams (Korean
+syllables and Latin letters alike), hashed with CRC32, weighted with sublinear
+TF and an optional IDF table, and folded into ``qdrant_vector_size`` buckets
+with signed feature hashing. The result is L2-normalised so cosine similarity in
+Qdrant behaves like it does for API embeddings.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import unicodedata
+import zlib
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"[0-9a-z가-힣]+")
+IDF_BUCKETS = 1 << 18
+
+
+class LocalEmbeddingEngine:
+    """Computes deterministic, network-free embeddings with NumPy."""
+
+    def __init__(
+        self,
+        dim: int,
+        ngram_range: Tuple[int, int] = (2, 3),
+        idf: Optional[np.ndarray] = None,
+    ) -> None:
+        self.dim = dim
+        self.ngram_range = ngram_range
+        if idf is not None and idf.shape != (IDF_BUCKETS,):
+            raise ValueError(f"IDF table must have shape ({IDF_BUCKETS},), got {idf.shape}")
+        self.idf = idf.astype(np.float32) if idf is not None else None
+
+    def tokenize(self, text: str) -> List[str]:
+        normalized = unicodedata.normalize("NFKC", text).lower()
+        min_n, max_n = self.ngram_range
+        tokens: List[str] = []
+        for word in WORD_PATTERN.findall(normalized):
+            tokens.append(f"w:{word}")
+            padded = f" {word} "
+            for n in range(min_n, max_n + 1):
+                if len(padded) < n:
+                    continue
+                tokens.extend(padded[i : i + n] for i in range(len(padded) - n + 1))
+        return tokens
+
+    def embed(self, text: str) -> np.ndarray:
+        tokens = self.tokenize(text)
+        if not tokens:
+            return np.zeros(self.dim, dtype=np.float32)
+
+        counts = Counter(tokens)
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode("utf-8")) for token in counts),
+            dtype=np.uint32,
+            count=len(counts),
+        )
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        weights = 1.0 + np.log(tf)
+        if self.idf is not None:
+            weights *= self.idf[hashes % IDF_BUCKETS]
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        buckets = (hashes % self.dim).astype(np.intp)
+        vector = np.bincount(buckets, weights=weights * signs, minlength=self.dim).astype(np.float32)
+
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = self.embed(text)
+        return matrix
+
+    def fit_idf(self, documents: Iterable[str]) -> np.ndarray:
+        """Compute a smoothed IDF table over hashed n-gram buckets."""
+        df = np.zeros(IDF_BUCKETS, dtype=np.float64)
+        total = 0
+        for document in documents:
+            unique = set(self.tokenize(document))
+            if not unique:
+                continue
+            hashes = np.fromiter(
+                (zlib.crc32(token.encode("utf-8")) for token in unique),
+                dtype=np.uint32,
+                count=len(unique),
+            )
+            df += np.bincount(hashes % IDF_BUCKETS, minlength=IDF_BUCKETS)
+            total += 1
+        idf = (np.log((1.0 + total) / (1.0 + df)) + 1.0).astype(np.float32)
+        self.idf = idf
+        return idf
+
+
+def load_idf(path: str | None) -> Optional[np.ndarray]:
+    if not path:
+        return None
+    file_path = Path(path)
+    if not file_path.exists():
+        logger.info("Local embedding IDF table not found at %s; using TF weights only.", path)
+        return None
+    return np.load(file_path)
+
+
+@lru_cache(maxsize=1)
+def get_local_embedding_engine() -> LocalEmbeddingEngine:
+    settings = get_settings()
+    return LocalEmbeddingEngine(
+        dim=settings.qdrant_vector_size,
+        ngram_range=(settings.local_embedding_ngram_min, settings.local_embedding_ngram_max),
+        idf=load_idf(settings.local_embedding_idf_path),
+    )
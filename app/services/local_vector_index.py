@@ -0,0 +1,463 @@
+"""
+Embedded brute-force vector index backed by a memory-mapped ``.npy`` matrix.
+
+Layout of ``directory``:
+
+- ``vectors.npy``: float32 matrix of shape (capacity, dim), rows L2-normalised.
+  Capacity doubles when full; the file is rebuilt and swapped in atomically.
+- ``payloads.jsonl``: append-only log of ``{"post_id", "row", "payload"}``
+  records (``"deleted": true`` for removals). A row only becomes visible once
+  its log record is written, so the log is the commit point.
+
+One process writes (ingest, reconciler); any number of uvicorn workers can open
+the index read-only and share the matrix through the OS page cache. Readers pick
+up appended log records incrementally before each query.
+
+Deleted rows are reclaimed by ``compact`` (run automatically once they
+outnumber the live ones), which rewrites both files without them under the
+writer lock; readers notice the replaced files and reload under a shared lock.
+
+Methods block (matmul, ``fsync``) and are thread-safe; async callers run them
+through ``asyncio.to_thread``.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from app.services.vector_store import VectorFilter
+
+logger = logging.getLogger(__name__)
+
+KEYWORD_FIELDS = ("department", "category", "source")
+DATE_FIELDS = ("posted_at", "deadline_at")
+# Deletes compact the index once dead rows reach this many and outnumber live ones.
+COMPACT_MIN_DEAD_ROWS = 1024
+
+
+def _timestamp(value: Any) -> float:
+    if not value:
+        return np.nan
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return np.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class LocalVectorIndex:
+    """Vectorised top-k cosine search with payload filters over a memmap."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        dim: int,
+        read_only: bool = False,
+        initial_capacity: int = 1024,
+    ) -> None:
+        self.directory = Path(directory)
+        self.dim = dim
+        self.read_only = read_only
+        self.initial_capacity = initial_capacity
+        self.vectors_path = self.directory / "vectors.npy"
+        self.log_path = self.directory / "payloads.jsonl"
+        self.lock_path = self.directory / ".lock"
+
+        self._mutex = threading.RLock()
+        self._exclusive = False
+        self._matrix: Optional[np.ndarray] = None
+        self._reset()
+
+        if not read_only:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if not self.vectors_path.exists():
+                self._write_matrix(np.zeros((initial_capacity, dim), dtype=np.float32))
+            self.log_path.touch(exist_ok=True)
+        self.refresh()
+
+    # ------------------------------------------------------------------ reads
+
+    def refresh(self) -> None:
+        """Apply log records appended since the last refresh; reload after a compaction."""
+        with self._mutex:
+            if not self.log_path.exists():
+                return
+            if not self._files_replaced():
+                self._read_log()
+                if not self._files_replaced():
+                    return
+            # Growth and compaction swap files under the writer lock; reload consistently.
+            with self._locked(shared=True):
+                if _inode(self.log_path) != self._log_inode:
+                    self._reset()
+                self._read_log()
+                self._open_matrix()
+
+    def __len__(self) -> int:
+        with self._mutex:
+            self.refresh()
+            return int(self._valid.sum())
+
+    def post_ids(self) -> List[str]:
+        with self._mutex:
+            self.refresh()
+            return [pid for pid, valid in zip(self._post_ids, self._valid) if pid and valid]
+
+    def get_vector(self, post_id: str) -> Optional[np.ndarray]:
+        with self._mutex:
+            self.refresh()
+            row = self._rows.get(post_id)
+            if row is None or self._matrix is None:
+                return None
+            return np.array(self._matrix[row], dtype=np.float32)
+
+    def get_vectors(self, post_ids: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Stored vectors of ``post_ids`` after one refresh; missing ids are left out."""
+        with self._mutex:
+            self.refresh()
+            if self._matrix is None:
+                return {}
+            rows = {pid: self._rows[pid] for pid in post_ids if pid in self._rows}
+            return {pid: np.array(self._matrix[row], dtype=np.float32) for pid, row in rows.items()}
+
+    def existing(self, post_ids: Iterable[str]) -> Set[str]:
+        """Subset of ``post_ids`` stored in the index, after one refresh."""
+        with self._mutex:
+            self.refresh()
+            return {pid for pid in post_ids if pid in self._rows}
+
+    def get_payload(self, post_id: str) -> Optional[Dict[str, Any]]:
+        with self._mutex:
+            self.refresh()
+            row = self._rows.get(post_id)
+            if row is None:
+                return None
+            return dict(self._payloads[row] or {})
+
+    def search(
+        self,
+        vector: np.ndarray,
+        limit: int,
+        offset: int = 0,
+        search_filter: Optional["VectorFilter"] = None,
+        score_threshold: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        with self._mutex:
+            self.refresh()
+            n = len(self._post_ids)
+            if n == 0 or self._matrix is None:
+                return []
+            query = np.asarray(vector, dtype=np.float32)
+            norm = float(np.linalg.norm(query))
+            if norm == 0:
+                return []
+            scores = self._matrix[:n] @ (query / norm)
+            mask = self._mask(search_filter)
+            if score_threshold is not None:
+                mask &= scores >= score_threshold
+            candidates = np.flatnonzero(mask)
+            if candidates.size == 0:
+                return []
+
+            wanted = min(offset + limit, candidates.size)
+            candidate_scores = scores[candidates]
+            if wanted < candidates.size:
+                top = np.argpartition(-candidate_scores, wanted - 1)[:wanted]
+            else:
+                top = np.arange(candidates.size)
+            top = top[np.argsort(-candidate_scores[top], kind="stable")][offset:wanted]
+
+            hits: List[Dict[str, Any]] = []
+            for index in top:
+                row = int(candidates[index])
+                post_id = self._post_ids[row]
+                hits.append(
+                    {
+                        "id": post_id,
+                        "score": float(scores[row]),
+                        "payload": dict(self._payloads[row] or {}),
+                        "post_id": post_id,
+                    }
+                )
+            return hits
+
+    def count(self, search_filter: Optional["VectorFilter"] = None) -> int:
+        with self._mutex:
+            self.refresh()
+            return int(self._mask(search_filter).sum())
+
+    # ----------------------------------------------------------------- writes
+
+    def upsert(self, post_id: str, vector: np.ndarray, payload: Dict[str, Any]) -> None:
+        self.upsert_many([(post_id, vector, payload)])
+
+    def upsert_many(self, items: Iterable[Tuple[str, np.ndarray, Dict[str, Any]]]) -> None:
+        """Write ``(post_id, vector, payload)`` rows with one flush and one ``fsync``."""
+        self._require_writable()
+        with self._mutex, self._locked():
+            self.refresh()
+            records: List[Dict[str, Any]] = []
+            added: Dict[str, int] = {}
+            next_row = len(self._post_ids)
+            for post_id, vector, payload in items:
+                row_vector = np.asarray(vector, dtype=np.float32)
+                norm = float(np.linalg.norm(row_vector))
+                if norm > 0:
+                    row_vector = row_vector / norm
+                row = self._rows.get(post_id, added.get(post_id))
+                if row is None:
+                    row = added[post_id] = next_row
+                    next_row += 1
+                    self._ensure_capacity(next_row)
+                self._matrix[row] = row_vector
+                records.append({"post_id": post_id, "row": row, "payload": {"post_id": post_id, **payload}})
+            if not records:
+                return
+            self._matrix.flush()
+            self._append(records)
+
+    def set_payload(self, post_id: str, payload: Dict[str, Any]) -> None:
+        self._require_writable()
+        with self._mutex, self._locked():
+            self.refresh()
+            row = self._rows.get(post_id)
+            if row is None:
+                return
+            merged = {**(self._payloads[row] or {}), **payload}
+            self._append([{"post_id": post_id, "row": row, "payload": merged}])
+
+    def delete(self, post_ids: List[str]) -> int:
+        self._require_writable()
+        with self._mutex, self._locked():
+            self.refresh()
+            records = [
+                {"post_id": post_id, "row": self._rows[post_id], "deleted": True}
+                for post_id in dict.fromkeys(post_ids)
+                if post_id in self._rows
+            ]
+            if records:
+                self._append(records)
+            live = int(self._valid.sum())
+            dead = len(self._post_ids) - live
+            if dead >= COMPACT_MIN_DEAD_ROWS and dead > live:
+                self.compact()
+        return len(records)
+
+    def compact(self) -> int:
+        """
+        Rewrite the matrix and log without deleted rows; returns how many rows
+        were reclaimed.
+        """
+        self._require_writable()
+        with self._mutex, self._locked():
+            self.refresh()
+            live = np.flatnonzero(self._valid)
+            reclaimed = len(self._post_ids) - live.size
+            if reclaimed == 0:
+                return 0
+            capacity = self.initial_capacity
+            while capacity < live.size:
+                capacity *= 2
+            matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+            matrix[: live.size] = self._matrix[live]
+
+            tmp_log = self.log_path.with_suffix(".tmp.jsonl")
+            with tmp_log.open("w", encoding="utf-8") as handle:
+                for new_row, row in enumerate(live):
+                    record = {"post_id": self._post_ids[row], "row": new_row, "payload": self._payloads[row]}
+                    handle.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+            self._write_matrix(matrix)
+            os.replace(tmp_log, self.log_path)
+            self._reset()
+            self.refresh()
+        logger.info("Compacted local vector index at %s: %s rows reclaimed", self.directory, reclaimed)
+        return int(reclaimed)
+
+    # -------------------------------------------------------------- internals
+
+    def _reset(self) -> None:
+        self._matrix_inode: Optional[int] = None
+        self._log_inode: Optional[int] = None
+        self._log_offset = 0
+        self._rows: Dict[str, int] = {}
+        self._post_ids: List[Optional[str]] = []
+        self._payloads: List[Optional[Dict[str, Any]]] = []
+        self._valid = np.zeros(0, dtype=bool)
+        self._keywords: Dict[str, np.ndarray] = {field: np.empty(0, dtype=object) for field in KEYWORD_FIELDS}
+        # One boolean column per audience grade value.
+        self._grades: Dict[str, np.ndarray] = {}
+        self._dates: Dict[str, np.ndarray] = {field: np.empty(0, dtype=np.float64) for field in DATE_FIELDS}
+
+    def _files_replaced(self) -> bool:
+        return _inode(self.log_path) != self._log_inode or _inode(self.vectors_path) != self._matrix_inode
+
+    def _read_log(self) -> None:
+        with self.log_path.open("rb") as handle:
+            inode = os.fstat(handle.fileno()).st_ino
+            if self._log_inode is None:
+                self._log_inode = inode
+            elif inode != self._log_inode:
+                # Replaced by a compaction; ``refresh`` reloads it.
+                return
+            handle.seek(self._log_offset)
+            chunk = handle.read()
+        complete = chunk.rfind(b"\n") + 1
+        for line in chunk[:complete].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+        self._log_offset += complete
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        row = int(record["row"])
+        post_id = record["post_id"]
+        self._grow_columns(row + 1)
+        for column in self._grades.values():
+            column[row] = False
+        if record.get("deleted"):
+            self._valid[row] = False
+            self._payloads[row] = None
+            self._rows.pop(post_id, None)
+            return
+        payload = record.get("payload") or {}
+        self._rows[post_id] = row
+        self._post_ids[row] = post_id
+        self._payloads[row] = payload
+        self._valid[row] = True
+        for field in KEYWORD_FIELDS:
+            self._keywords[field][row] = payload.get(field)
+        for grade in payload.get("audience_grade") or []:
+            column = self._grades.get(grade)
+            if column is None:
+                column = self._grades[grade] = np.zeros(len(self._post_ids), dtype=bool)
+            column[row] = True
+        for field in DATE_FIELDS:
+            self._dates[field][row] = _timestamp(payload.get(field))
+
+    def _grow_columns(self, size: int) -> None:
+        extra = size - len(self._post_ids)
+        if extra <= 0:
+            return
+        self._post_ids.extend([None] * extra)
+        self._payloads.extend([None] * extra)
+        self._valid = np.concatenate([self._valid, np.zeros(extra, dtype=bool)])
+        for grade, column in self._grades.items():
+            self._grades[grade] = np.concatenate([column, np.zeros(extra, dtype=bool)])
+        for field in KEYWORD_FIELDS:
+            self._keywords[field] = np.concatenate([self._keywords[field], np.full(extra, None, dtype=object)])
+        for field in DATE_FIELDS:
+            self._dates[field] = np.concatenate([self._dates[field], np.full(extra, np.nan)])
+
+    def _mask(self, search_filter: Optional["VectorFilter"]) -> np.ndarray:
+        mask = self._valid.copy()
+        if search_filter is None:
+            return mask
+        for field in KEYWORD_FIELDS:
+            value = getattr(search_filter, field, None)
+            if value:
+                mask &= self._keywords[field] == value
+        grade = getattr(search_filter, "audience_grade", None)
+        if grade:
+            column = self._grades.get(grade)
+            if column is None:
+                mask[:] = False
+            else:
+                mask &= column
+        for field, low, high in (
+            ("posted_at", search_filter.posted_from, search_filter.posted_to),
+            ("deadline_at", search_filter.deadline_from, search_filter.deadline_to),
+        ):
+            column = self._dates[field]
+            if low is not None:
+                mask &= column >= _timestamp(low.isoformat())
+            if high is not None:
+                mask &= column <= _timestamp(high.isoformat())
+        for post_id in getattr(search_filter, "exclude_post_ids", ()):
+            row = self._rows.get(post_id)
+            if row is not None:
+                mask[row] = False
+        return mask
+
+    def _open_matrix(self) -> None:
+        if not self.vectors_path.exists():
+            return
+        inode = self.vectors_path.stat().st_ino
+        if self._matrix is not None and inode == self._matrix_inode:
+            return
+        self._matrix = np.load(self.vectors_path, mmap_mode="r" if self.read_only else "r+")
+        self._matrix_inode = inode
+        if self._matrix.shape[1] != self.dim:
+            raise ValueError(
+                f"Local vector index at {self.directory} has dim {self._matrix.shape[1]}, expected {self.dim}"
+            )
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity = self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[: self._matrix.shape[0]] = self._matrix
+        self._write_matrix(grown)
+        self._open_matrix()
+
+    def _write_matrix(self, matrix: np.ndarray) -> None:
+        tmp_path = self.vectors_path.with_suffix(".tmp.npy")
+        np.save(tmp_path, matrix)
+        os.replace(tmp_path, self.vectors_path)
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records)
+        with self.log_path.open("a", encoding="utf-8") as handle:
+            handle.write(lines)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.refresh()
+
+    def _require_writable(self) -> None:
+        if self.read_only:
+            raise PermissionError("Local vector index opened read-only")
+
+    @contextmanager
+    def _locked(self, shared: bool = False) -> Iterator[None]:
+        if self._exclusive:
+            # Already holding the writer lock (e.g. ``compact`` from ``delete``).
+            yield
+            return
+        try:
+            handle = self.lock_path.open("r" if shared else "a")
+        except FileNotFoundError:
+            if not shared:
+                raise
+            # No writer has run yet, so nothing can be swapped underneath us.
+            yield
+            return
+        with handle:
+            fcntl.flock(handle, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            self._exclusive = not shared
+            try:
+                yield
+            finally:
+                self._exclusive = False
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _inode(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_ino
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,316 @@
+"""
+Per-user preference vectors: a time-decayed running mean of liked post vectors.
+
+The running mean (vector, weight, timestamp and embedding space) lives in the
+Mongo ``user_preferences`` collection with a ``version`` counter. A like or
+unlike folds one vector in or out and writes the result back only if the
+version is unchanged (compare-and-set), retrying on conflict, so concurrent
+workers cannot lose an update.
+
+Recommendations read a copy: one point per user (id ``preference_point_id``,
+kept in ``User.preference_vector_id``) in a dedicated Qdrant collection, or in
+a separate embedded index for the ``local`` vector backend. Cosine storage
+normalises vectors, so the mean's norm and total weight live in the payload.
+``rebuild`` recomputes a state from the stored likes; it repairs states from
+another embedding model/version (ignored until then) and is what
+``scripts/rebuild_preference_vectors.py`` runs.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid5
+
+import numpy as np
+from pymongo.errors import DuplicateKeyError
+from qdrant_client.models import Distance, PointIdsList, PointStruct, VectorParams
+
+from app.core.config import get_settings
+from app.db import mongo
+from app.db.qdrant import get_qdrant_client
+from app.models.interaction import Interaction
+from app.models.user import User
+from app.services import vector_store
+from app.services.local_vector_index import LocalVectorIndex
+
+logger = logging.getLogger(__name__)
+
+PREFERENCE_ID_NAMESPACE = UUID("0b6c1e57-2f3a-4d8e-9a71-5c2d8f4e6b90")
+
+STATE_COLLECTION = "user_preferences"
+
+# Weight below which a preference is treated as empty (e.g. after unliking everything).
+MIN_WEIGHT = 1e-6
+
+# Compare-and-set attempts before giving up on an update (only under heavy contention).
+MAX_WRITE_ATTEMPTS = 8
+
+_collection_initialized = False
+_local_index: Optional[LocalVectorIndex] = None
+
+
+class PreferenceConflictError(RuntimeError):
+    """A preference update lost every compare-and-set attempt to concurrent writers."""
+
+
+def preference_point_id(user_id: str) -> str:
+    return str(uuid5(PREFERENCE_ID_NAMESPACE, str(user_id)))
+
+
+@dataclass
+class PreferenceVector:
+    """Weighted mean of liked vectors; weights halve every ``half_life_days``."""
+
+    vector: np.ndarray
+    weight: float
+    updated_at: datetime
+
+    @classmethod
+    def empty(cls, dim: int, now: datetime) -> "PreferenceVector":
+        return cls(np.zeros(dim, dtype=np.float32), 0.0, now)
+
+    def add(self, vector: np.ndarray, now: datetime, half_life_days: float, liked_at: Optional[datetime] = None) -> None:
+        self._mix(vector, _decay(liked_at or now, now, half_life_days), now, half_life_days)
+
+    def remove(self, vector: np.ndarray, liked_at: datetime, now: datetime, half_life_days: float) -> None:
+        self._mix(vector, -_decay(liked_at, now, half_life_days), now, half_life_days)
+
+    def _mix(self, vector: np.ndarray, weight: float, now: datetime, half_life_days: float) -> None:
+        decayed = self.weight * _decay(self.updated_at, now, half_life_days)
+        total = decayed + weight
+        if total <= MIN_WEIGHT:
+            self.vector = np.zeros_like(self.vector)
+            self.weight = 0.0
+        else:
+            self.vector = ((self.vector * decayed + vector_store.as_vector(vector) * weight) / total).astype(np.float32)
+            self.weight = total
+        self.updated_at = now
+
+    @property
+    def is_empty(self) -> bool:
+        return self.weight <= MIN_WEIGHT or not np.any(self.vector)
+
+
+def _decay(since: datetime, now: datetime, half_life_days: float) -> float:
+    age_days = max((now - since).total_seconds(), 0.0) / 86400
+    return 0.5 ** (age_days / half_life_days)
+
+
+class PreferenceService:
+    """Keeps ``PreferenceVector``s in step with likes and serves them to recommendations."""
+
+    def __init__(self, half_life_days: Optional[float] = None) -> None:
+        settings = get_settings()
+        self.half_life_days = half_life_days or settings.preference_half_life_days
+        self.dim = settings.qdrant_vector_size
+
+    async def add_like(self, user: User, post_id: str, liked_at: datetime) -> Optional[PreferenceVector]:
+        """Fold a new like into the user's preference."""
+        return await self._apply(user, post_id, liked_at, removed=False)
+
+    async def remove_like(self, user: User, post_id: str, liked_at: datetime) -> Optional[PreferenceVector]:
+        """Take a removed like (liked at ``liked_at``) back out of the user's preference."""
+        return await self._apply(user, post_id, liked_at, removed=True)
+
+    async def rebuild(self, user: User) -> Optional[PreferenceVector]:
+        """Recompute a user's preference from their like interactions (repair path)."""
+        user_id = str(user.id)
+        for _ in range(MAX_WRITE_ATTEMPTS):
+            version = await self._state_version(user_id)
+            likes = await self._load_likes(user_id)
+            vectors = await vector_store.fetch_vectors([like.post_id for like in likes])
+            now = datetime.utcnow()
+            preference = PreferenceVector.empty(self.dim, now)
+            for like in likes:
+                if like.post_id in vectors:
+                    preference.add(vectors[like.post_id], now, self.half_life_days, liked_at=like.ts)
+            if await self._write_state(user_id, preference, version):
+                await self._publish(user, preference, version + 1)
+                return None if preference.is_empty else preference
+        raise PreferenceConflictError(f"Preference rebuild for user {user_id} kept losing concurrent updates")
+
+    async def _apply(self, user: User, post_id: str, liked_at: datetime, removed: bool) -> Optional[PreferenceVector]:
+        vectors = await vector_store.fetch_vectors([post_id])
+        if post_id not in vectors:
+            # Posts without a vector never entered the mean (see ``rebuild``).
+            return await self.get(str(user.id))
+        user_id = str(user.id)
+        for _ in range(MAX_WRITE_ATTEMPTS):
+            state = await _state_collection().find_one({"_id": user_id})
+            if state is not None and not _current_space(state):
+                # Increments would mix two embedding spaces; start over from the likes.
+                return await self.rebuild(user)
+            now = datetime.utcnow()
+            preference = _from_state(state) if state is not None else PreferenceVector.empty(self.dim, now)
+            version = int(state["version"]) if state is not None else 0
+            if removed:
+                preference.remove(vectors[post_id], liked_at, now, self.half_life_days)
+            else:
+                preference.add(vectors[post_id], now, self.half_life_days, liked_at=liked_at)
+            if await self._write_state(user_id, preference, version):
+                await self._publish(user, preference, version + 1)
+                return None if preference.is_empty else preference
+        raise PreferenceConflictError(f"Preference update for user {user_id} kept losing concurrent updates")
+
+    async def get(self, user_id: str) -> Optional[PreferenceVector]:
+        if _local_backend():
+            index = _get_local_index()
+            vector = await asyncio.to_thread(index.get_vector, user_id)
+            payload = await asyncio.to_thread(index.get_payload, user_id)
+            if vector is None or payload is None or not _current_space(payload):
+                return None
+            return _from_stored(vector, payload)
+
+        await _ensure_collection()
+        records = await get_qdrant_client().retrieve(
+            collection_name=get_settings().qdrant_collection_user_preferences,
+            ids=[preference_point_id(user_id)],
+            with_payload=True,
+            with_vectors=True,
+        )
+        if not records or records[0].vector is None or not _current_space(records[0].payload or {}):
+            return None
+        return _from_stored(np.asarray(records[0].vector, dtype=np.float32), records[0].payload or {})
+
+    async def _load_likes(self, user_id: str) -> List[Interaction]:
+        return await Interaction.find(
+            Interaction.user_id == user_id,
+            Interaction.type == "like",
+        ).to_list()
+
+    async def _state_version(self, user_id: str) -> int:
+        state = await _state_collection().find_one({"_id": user_id}, {"version": 1})
+        return int(state["version"]) if state is not None else 0
+
+    async def _write_state(self, user_id: str, preference: PreferenceVector, version: int) -> bool:
+        """Store ``preference`` as ``version + 1`` if the state is still at ``version``."""
+        document = {**_state_document(preference), "version": version + 1}
+        collection = _state_collection()
+        if version == 0:
+            try:
+                await collection.insert_one({"_id": user_id, **document})
+            except DuplicateKeyError:
+                return False
+            return True
+        result = await collection.update_one({"_id": user_id, "version": version}, {"$set": document})
+        return result.matched_count == 1
+
+    async def _publish(self, user: User, preference: PreferenceVector, version: int) -> None:
+        """
+        Copy a stored state to the point recommendations read. Workers can
+        publish out of order, so each re-reads the state after writing and
+        republishes until the point holds the newest version.
+        """
+        user_id = str(user.id)
+        for _ in range(MAX_WRITE_ATTEMPTS):
+            await self._save(user, preference, version)
+            latest = await _state_collection().find_one({"_id": user_id})
+            if latest is None or int(latest["version"]) == version:
+                return
+            preference, version = _from_state(latest), int(latest["version"])
+        logger.warning("Preference point for user %s may trail its stored state", user_id)
+
+    async def _save(self, user: User, preference: PreferenceVector, version: int) -> None:
+        user_id = str(user.id)
+        if preference.is_empty:
+            await self._delete(user_id)
+            user.preference_vector_id = None
+            return
+
+        payload = {
+            "user_id": user_id,
+            "weight": preference.weight,
+            "norm": float(np.linalg.norm(preference.vector)),
+            "updated_at": preference.updated_at.isoformat(),
+            "version": version,
+            **vector_store.embedding_metadata(),
+        }
+        if _local_backend():
+            await asyncio.to_thread(_get_local_index().upsert, user_id, preference.vector, payload)
+        else:
+            await _ensure_collection()
+            await get_qdrant_client().upsert(
+                collection_name=get_settings().qdrant_collection_user_preferences,
+                points=[PointStruct(id=preference_point_id(user_id), vector=preference.vector.tolist(), payload=payload)],
+            )
+        user.preference_vector_id = preference_point_id(user_id)
+
+    async def _delete(self, user_id: str) -> None:
+        if _local_backend():
+            await asyncio.to_thread(_get_local_index().delete, [user_id])
+            return
+        await _ensure_collection()
+        await get_qdrant_client().delete(
+            collection_name=get_settings().qdrant_collection_user_preferences,
+            points_selector=PointIdsList(points=[preference_point_id(user_id)]),
+        )
+
+
+def _from_stored(vector: np.ndarray, payload: dict) -> PreferenceVector:
+    # Stored rows are unit length; scale back to the mean's real norm.
+    return PreferenceVector(
+        vector=(vector * float(payload.get("norm", 1.0))).astype(np.float32),
+        weight=float(payload.get("weight", 0.0)),
+        updated_at=datetime.fromisoformat(payload["updated_at"]),
+    )
+
+
+def _state_document(preference: PreferenceVector) -> Dict[str, Any]:
+    return {
+        "vector": preference.vector.tolist(),
+        "weight": preference.weight,
+        "updated_at": preference.updated_at,
+        **vector_store.embedding_metadata(),
+    }
+
+
+def _from_state(state: dict) -> PreferenceVector:
+    return PreferenceVector(
+        vector=np.asarray(state["vector"], dtype=np.float32),
+        weight=float(state["weight"]),
+        updated_at=state["updated_at"],
+    )
+
+
+def _current_space(payload: dict) -> bool:
+    """Whether a stored preference was built from the current embedding model/version."""
+    metadata = vector_store.embedding_metadata()
+    return all(payload.get(key) == value for key, value in metadata.items())
+
+
+def _state_collection():
+    return mongo.mongo_client[get_settings().mongo_db][STATE_COLLECTION]
+
+
+def _local_backend() -> bool:
+    return get_settings().vector_backend == "local"
+
+
+def _get_local_index() -> LocalVectorIndex:
+    global _local_index
+    if _local_index is None:
+        settings = get_settings()
+        _local_index = LocalVectorIndex(
+            Path(settings.local_vector_index_path) / "user_preferences",
+            dim=settings.qdrant_vector_size,
+        )
+    return _local_index
+
+
+async def _ensure_collection() -> None:
+    global _collection_initialized
+    if _collection_initialized:
+        return
+    settings = get_settings()
+    client = get_qdrant_client()
+    names = [c.name for c in (await client.get_collections()).collections]
+    if settings.qdrant_collection_user_preferences not in names:
+        await client.create_collection(
+            collection_name=settings.qdrant_collection_user_preferences,
+            vectors_config=VectorParams(size=settings.qdrant_vector_size, distance=Distance.COSINE),
+        )
+    _collection_initialized = True
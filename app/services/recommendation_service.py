@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence
 
-from beanie.operators import In
 from bson import ObjectId
 
-from app.models.post import Post
+from app.core.config import get_settings
 from app.models.user import User
 from app.services import vector_store
 from app.services.feed_service import FeedService
-from app.services.llm_service import LLMService
+from app.services.hydration import hydrate_hits, select_fields
+from app.services.preference_service import PreferenceService
+from app.services.vector_store import VectorFilter
 
 
 class RecommendationService:
@@ -21,10 +23,12 @@ class RecommendationService:
     def __init__(
         self,
         feed_service: FeedService | None = None,
-        llm_service: Optional[LLMService] = None,
+        max_likes: Optional[int] = None,
+        preference_service: Optional[PreferenceService] = None,
     ) -> None:
         self.feed_service = feed_service or FeedService()
-        self.llm_service = llm_service or LLMService()
+        self.max_likes = max_likes or get_settings().recommend_max_likes
+        self.preference_service = preference_service or PreferenceService()
 
     async def profile_recommendations(
         self,
@@ -46,27 +50,42 @@ class RecommendationService:
         self,
         user_id: Optional[str],
         limit: int,
+        search_filter: Optional[VectorFilter] = None,
+        view: str = "full",
+        negative_post_ids: Optional[List[str]] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> Dict[str, Any]:
-        semantic = await self._semantic_from_likes(user_id, limit)
+        if fields:
+            view = "light"
+        semantic = await self._semantic_from_likes(user_id, limit, search_filter, view, negative_post_ids)
         if semantic:
+            semantic["items"] = select_fields(semantic["items"], fields)
             return semantic
 
         fallback = await self.feed_service.get_feed(
-            department=None,
-            grade=None,
+            category=search_filter.category if search_filter else None,
             page=1,
             page_size=limit,
         )
         fallback["meta"]["mode"] = "likes-fallback"
         fallback["meta"]["limit"] = limit
         fallback["meta"]["user_id"] = user_id
+        fallback["items"] = select_fields(fallback["items"], fields)
         return fallback
 
     async def _semantic_from_likes(
         self,
         user_id: Optional[str],
         limit: int,
+        search_filter: Optional[VectorFilter] = None,
+        view: str = "full",
+        negative_post_ids: Optional[List[str]] = None,
     ) -> Optional[Dict[str, Any]]:
+        """
+        Recommend from the user's preference vector (one lookup + one ANN
+        query). Users without one yet fall back to the vector store's recommend
+        query over their most recent likes. No embedding call is made.
+        """
         if not user_id:
             return None
 
@@ -74,28 +93,30 @@ class RecommendationService:
         if not user or not user.liked_post_ids:
             return None
 
-        object_ids = [
-            ObjectId(post_id)
-            for post_id in user.liked_post_ids[-5:]
-            if ObjectId.is_valid(post_id)
-        ]
-        if not object_ids:
+        liked_ids = [post_id for post_id in user.liked_post_ids[-self.max_likes :] if ObjectId.is_valid(post_id)]
+        if not liked_ids:
             return None
 
-        liked_posts = await Post.find(In(Post.id, object_ids)).to_list()
-        combined_text = " ".join(
-            filter(None, [(post.summary or post.body) for post in liked_posts])
-        ).strip()
-        if not combined_text:
-            return None
-
-        vector = await self.llm_service.embed(combined_text)
-        if not vector:
-            return None
-
-        hits = await vector_store.search_similar(vector, limit=limit * 2)
-        exclude_ids = {str(post.id) for post in liked_posts}
-        items = await self._posts_from_hits(hits, exclude_ids, limit)
+        source = "preference"
+        preference = None
+        if user.preference_vector_id and not negative_post_ids:
+            preference = await self.preference_service.get(str(user.id))
+        if preference is not None and not preference.is_empty:
+            base = search_filter or VectorFilter()
+            hits = await vector_store.search_similar(
+                preference.vector,
+                limit=limit,
+                search_filter=replace(base, exclude_post_ids=tuple(user.liked_post_ids)),
+            )
+        else:
+            source = "likes"
+            hits = await vector_store.recommend_similar(
+                liked_ids,
+                limit=limit,
+                negative_post_ids=negative_post_ids,
+                search_filter=search_filter,
+            )
+        items = await hydrate_hits(hits, view=view, exclude_ids=set(liked_ids), limit=limit)
         if not items:
             return None
 
@@ -103,45 +124,10 @@ class RecommendationService:
             "items": items,
             "meta": {
                 "mode": "likes-semantic",
+                "view": view,
                 "limit": limit,
                 "user_id": user_id,
-                "source_likes": len(liked_posts),
+                "source_likes": len(liked_ids),
+                "source": source,
             },
         }
-
-    async def _posts_from_hits(
-        self,
-        hits: List[Dict[str, Any]],
-        exclude_ids: set[str],
-        limit: int,
-    ) -> List[Dict[str, Any]]:
-        def _extract_post_id(hit: Dict[str, Any]) -> Optional[str]:
-            return hit.get("post_id") or hit.get("payload", {}).get("post_id") or hit.get("id")
-
-        ordered_ids = [
-            ObjectId(post_id)
-            for post_id in (_extract_post_id(hit) for hit in hits)
-            if post_id and ObjectId.is_valid(post_id) and post_id not in exclude_ids
-        ]
-        if not ordered_ids:
-            return []
-
-        posts = await Post.find(In(Post.id, ordered_ids)).to_list()
-        post_map = {str(post.id): post for post in posts}
-
-        items: List[Dict[str, Any]] = []
-        for hit in hits:
-            post_id = _extract_post_id(hit)
-            if not post_id:
-                continue
-            if post_id in exclude_ids:
-                continue
-            post = post_map.get(post_id)
-            if not post:
-                continue
-            data = post.model_dump()
-            data["semantic_score"] = hit.get("score")
-            items.append(data)
-            if len(items) >= limit:
-                break
-        return items
@@ -0,0 +1,161 @@
+"""
+Mongo/vector-store consistency check.
+
+Posts and vectors are written separately, so a crash mid-ingest leaves posts
+without vectors and deleted posts leave orphan points behind. The reconciler
+diffs the two id sets and repairs both sides.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import numpy as np
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from app.clients.llm import LLMDisabledError, LLMRequestError
+from app.core.config import get_settings
+from app.db.corpus_version import get_corpus_version
+from app.models.post import Post
+from app.services import vector_store
+from app.services.llm_service import LLMService
+from app.services.reembed import post_embedding_text
+
+logger = logging.getLogger(__name__)
+
+# ObjectIds are compared as their 12 raw bytes, which sort the same way Mongo sorts ``_id``.
+ID_DTYPE = "S12"
+
+
+def _id_bytes(post_id: str) -> Optional[bytes]:
+    try:
+        return ObjectId(post_id).binary
+    except (InvalidId, TypeError):
+        return None
+
+
+def _post_id(raw: bytes) -> ObjectId:
+    # NumPy drops trailing NUL bytes from fixed-width byte strings.
+    return ObjectId(raw.ljust(12, b"\0"))
+
+
+class VectorReconciler:
+    """
+    Loads the vector store's post ids into one sorted 12-byte array, then streams
+    Mongo ``_id``s in ascending batches and merges each batch against it with
+    ``searchsorted``: ids only in Mongo are re-embedded, ids only in the vector
+    store are deleted. Memory stays at ~12 bytes per vector plus one batch.
+    """
+
+    def __init__(
+        self,
+        llm_service: Optional[LLMService] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        settings = get_settings()
+        self.llm_service = llm_service or LLMService()
+        self.batch_size = batch_size or settings.reconcile_batch_size
+        self.concurrency = concurrency or settings.reembed_concurrency
+
+    async def run(self, dry_run: bool = False) -> Dict[str, Any]:
+        started = time.perf_counter()
+        vector_ids, invalid = await self._vector_ids()
+        report: Dict[str, Any] = {
+            "mongo": 0,
+            "vectors": int(vector_ids.size) + len(invalid),
+            "missing": 0,
+            "orphans": len(invalid),
+            "reembedded": 0,
+            "failed": 0,
+            "deleted": 0,
+            "dry_run": dry_run,
+        }
+        if not dry_run and invalid:
+            report["deleted"] += await vector_store.delete_notice_vectors(invalid)
+
+        position = 0
+        async for batch in self._mongo_id_batches():
+            report["mongo"] += batch.size
+            # Everything in the vector store below this batch's last id is settled now.
+            end = int(np.searchsorted(vector_ids, batch[-1], side="right"))
+            window = vector_ids[position:end]
+            missing = batch[~np.isin(batch, window, assume_unique=True)]
+            orphans = window[~np.isin(window, batch, assume_unique=True)]
+            position = end
+            await self._repair(missing, orphans, report, dry_run)
+
+        await self._repair(np.empty(0, dtype=ID_DTYPE), vector_ids[position:], report, dry_run)
+        if report["reembedded"] or report["deleted"]:
+            await get_corpus_version().bump()
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        logger.info("Vector reconciliation report: %s", report)
+        return report
+
+    async def _repair(self, missing: np.ndarray, orphans: np.ndarray, report: Dict[str, Any], dry_run: bool) -> None:
+        report["missing"] += int(missing.size)
+        report["orphans"] += int(orphans.size)
+        if dry_run:
+            return
+        if orphans.size:
+            report["deleted"] += await vector_store.delete_notice_vectors([str(_post_id(raw)) for raw in orphans])
+        if missing.size:
+            posts = await self._load_posts([_post_id(raw) for raw in missing])
+            embedded, failed = await self._reembed(posts)
+            report["reembedded"] += embedded
+            report["failed"] += failed + int(missing.size) - len(posts)
+
+    async def _reembed(self, posts: Sequence[Post]) -> tuple[int, int]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def embed(post: Post):
+            # No local fallback: a vector from another space would look repaired
+            # forever. Failed posts stay missing and are retried next run.
+            async with semaphore:
+                try:
+                    return await self.llm_service.embed_strict(post_embedding_text(post))
+                except (LLMDisabledError, LLMRequestError) as exc:
+                    logger.warning("Embedding failed for post %s: %s", post.id, exc)
+                    return None
+
+        vectors = await asyncio.gather(*(embed(post) for post in posts))
+        items = [
+            (str(post.id), vector, vector_store.build_payload(post))
+            for post, vector in zip(posts, vectors)
+            if vector is not None
+        ]
+        written = await vector_store.upsert_notice_vectors(items)
+        return written, len(posts) - written
+
+    async def _vector_ids(self) -> tuple[np.ndarray, List[str]]:
+        chunks: List[np.ndarray] = []
+        invalid: List[str] = []
+        async for batch in vector_store.iter_post_ids(self.batch_size):
+            raw = []
+            for post_id in batch:
+                value = _id_bytes(post_id)
+                if value is None:
+                    invalid.append(post_id)
+                else:
+                    raw.append(value)
+            chunks.append(np.array(raw, dtype=ID_DTYPE))
+        if not chunks:
+            return np.empty(0, dtype=ID_DTYPE), invalid
+        return np.unique(np.concatenate(chunks)), invalid
+
+    async def _mongo_id_batches(self) -> AsyncIterator[np.ndarray]:
+        cursor = Post.get_motor_collection().find({}, {"_id": 1}).sort("_id", 1).batch_size(self.batch_size)
+        batch: List[bytes] = []
+        async for document in cursor:
+            batch.append(document["_id"].binary)
+            if len(batch) >= self.batch_size:
+                yield np.array(batch, dtype=ID_DTYPE)
+                batch = []
+        if batch:
+            yield np.array(batch, dtype=ID_DTYPE)
+
+    async def _load_posts(self, ids: List[ObjectId]) -> List[Post]:
+        return await Post.find({"_id": {"$in": ids}}).to_list()
@@ -0,0 +1,139 @@
+"""
+Blue/green re-embedding: rebuild every post's vector into a fresh versioned
+collection while the current one keeps serving, then flip the notices alias.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from bson import ObjectId
+
+from app.clients.llm import LLMDisabledError, LLMRequestError
+from app.core.config import get_settings
+from app.db.corpus_version import get_corpus_version
+from app.models.post import Post
+from app.services import vector_store
+from app.services.llm_service import LLMService
+
+logger = logging.getLogger(__name__)
+
+
+def post_embedding_text(post: Post) -> str:
+    """Text embedded for a post; matches what ``IngestPipeline`` embeds."""
+    return f"{post.title}\n\n{post.body}"
+
+
+class ReembedJob:
+    """
+    Streams posts in ``_id`` order, embeds each batch concurrently and upserts it
+    into ``target``. Progress is checkpointed after every batch, so an interrupted
+    run resumes after the last written ``_id``. Posts inserted while the job runs
+    are picked up because the stream only stops once a batch comes back empty.
+
+    Embeddings come from the configured embedder only (no local fallback);
+    posts whose embedding call fails are kept in the checkpoint, retried at the
+    end of the stream, and block the alias swap while any remain.
+    """
+
+    def __init__(
+        self,
+        llm_service: Optional[LLMService] = None,
+        target: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        checkpoint_dir: Optional[str] = None,
+    ) -> None:
+        settings = get_settings()
+        self.llm_service = llm_service or LLMService()
+        self.target = target or vector_store.versioned_collection_name()
+        self.batch_size = batch_size or settings.reembed_batch_size
+        self.concurrency = concurrency or settings.reembed_concurrency
+        self.checkpoint_path = Path(checkpoint_dir or settings.reembed_checkpoint_dir) / f"{self.target}.json"
+
+    async def run(self, swap: bool = True, restart: bool = False) -> Dict[str, Any]:
+        if get_settings().vector_backend == "local":
+            raise RuntimeError("Blue/green re-embedding needs the Qdrant backend")
+
+        state = {} if restart else self._load_checkpoint()
+        state.setdefault("target", self.target)
+        state.setdefault("last_id", None)
+        state.setdefault("embedded", 0)
+        state.setdefault("failed_ids", [])
+        state["completed"] = False
+
+        await vector_store.create_versioned_collection(self.target)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        while True:
+            posts = await self._next_batch(state["last_id"])
+            if not posts:
+                break
+            failed = await self._write(posts, semaphore, state)
+            state["failed_ids"].extend(failed)
+            state["last_id"] = str(posts[-1].id)
+            self._save_checkpoint(state)
+            logger.info("Re-embedded %s posts into %s (last_id=%s)", state["embedded"], self.target, state["last_id"])
+
+        if state["failed_ids"]:
+            retry = await self._load_posts(state["failed_ids"])
+            state["failed_ids"] = await self._write(retry, semaphore, state)
+        state["failed"] = len(state["failed_ids"])
+        if state["failed"]:
+            logger.error(
+                "%s posts could not be embedded; keeping the current alias (re-run to retry)", state["failed"]
+            )
+            self._save_checkpoint(state)
+            return state
+
+        if swap:
+            state["alias"] = await vector_store.swap_alias(self.target)
+            await get_corpus_version().bump()
+        state["completed"] = True
+        self._save_checkpoint(state)
+        return state
+
+    async def _write(self, posts: Sequence[Post], semaphore: asyncio.Semaphore, state: Dict[str, Any]) -> List[str]:
+        """Embed and upsert ``posts``; returns the ids whose embedding call failed."""
+        results = await asyncio.gather(*(self._embed(post, semaphore) for post in posts))
+        items = [
+            (str(post.id), vector, vector_store.build_payload(post))
+            for post, (ok, vector) in zip(posts, results)
+            if ok and vector is not None
+        ]
+        await vector_store.upsert_notice_vectors(items, collection=self.target)
+        state["embedded"] += len(items)
+        return [str(post.id) for post, (ok, _) in zip(posts, results) if not ok]
+
+    async def _next_batch(self, after: Optional[str]) -> Sequence[Post]:
+        query = {"_id": {"$gt": ObjectId(after)}} if after else {}
+        return await Post.find(query).sort("_id").limit(self.batch_size).to_list()
+
+    async def _load_posts(self, post_ids: Sequence[str]) -> Sequence[Post]:
+        return await Post.find({"_id": {"$in": [ObjectId(pid) for pid in post_ids]}}).to_list()
+
+    async def _embed(self, post: Post, semaphore: asyncio.Semaphore):
+        """(succeeded, vector); vector is None for posts with no text."""
+        async with semaphore:
+            try:
+                return True, await self.llm_service.embed_strict(post_embedding_text(post))
+            except (LLMDisabledError, LLMRequestError) as exc:
+                logger.warning("Embedding failed for post %s: %s", post.id, exc)
+                return False, None
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        if not self.checkpoint_path.exists():
+            return {}
+        state = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+        if state.get("completed"):
+            return {}
+        return state
+
+    def _save_checkpoint(self, state: Dict[str, Any]) -> None:
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state, ensure_ascii=False, default=str), encoding="utf-8")
+        tmp_path.replace(self.checkpoint_path)
@@ -5,6 +5,7 @@ from typing import Any, Dict, Optional
 
 from beanie import PydanticObjectId
 
+from app.db.pagination import paginate
 from app.models.reminder import Reminder
 
 
@@ -32,12 +33,14 @@ class ReminderService:
         page: int,
         page_size: int,
     ) -> Dict[str, Any]:
-        query = Reminder.find(Reminder.user_id == user_id)
-        total = await query.count()
-        reminders = (
-            await query.sort(Reminder.notify_at).skip((page - 1) * page_size).limit(page_size).to_list()
+        result = await paginate(
+            Reminder,
+            {"user_id": user_id},
+            {"notify_at": 1, "_id": 1},
+            (page - 1) * page_size,
+            page_size,
         )
         return {
-            "items": reminders,
-            "meta": {"total": total, "page": page, "page_size": page_size},
+            "items": result.items,
+            "meta": {"total": result.total, "page": page, "page_size": page_size},
         }
@@ -1,20 +1,64 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from beanie.operators import In
-from bson import ObjectId
+import numpy as np
 
-from app.models.post import Post
+from app.clients.llm import LLMDisabledError, LLMRequestError
+from app.core.cache import TTLCache, Uncached, VersionedCache
+from app.core.config import get_settings
+from app.core.cursor import decode_cursor, encode_cursor
+from app.db.corpus_version import CorpusVersion, get_corpus_version
+from app.db.shared_cache import MongoCacheBackend
+from app.models.post import Post, PostListView
+from app.services.fusion import reciprocal_rank_fusion
+from app.services.keyword_index import keyword_search
 from app.services.llm_service import LLMService
+from app.services.suggest_index import SuggestIndex, get_suggest_index
 from app.services import vector_store
+from app.services.hydration import hit_post_id, hydrate_hits, light_item_from_post, list_item, select_fields
+from app.services.vector_store import QDRANT_ERRORS, VectorFilter
+
+logger = logging.getLogger(__name__)
 
 
 class SearchService:
     """Hybrid keyword/semantic search with graceful fallback."""
 
-    def __init__(self, llm_service: Optional[LLMService] = None) -> None:
+    def __init__(
+        self,
+        llm_service: Optional[LLMService] = None,
+        result_cache: Optional[VersionedCache] = None,
+        semantic_window: Optional[int] = None,
+        corpus_version: Optional[CorpusVersion] = None,
+        suggest_index: Optional[SuggestIndex] = None,
+    ) -> None:
+        settings = get_settings()
         self.llm_service = llm_service or LLMService()
+        self.result_cache = result_cache or VersionedCache(
+            TTLCache(
+                maxsize=settings.search_result_cache_size,
+                ttl=settings.search_result_cache_ttl_seconds,
+            ),
+            shared=(
+                MongoCacheBackend("search_cache", settings.search_result_cache_ttl_seconds)
+                if settings.search_cache_backend == "mongo"
+                else None
+            ),
+        )
+        self.corpus_version = corpus_version or get_corpus_version()
+        self.suggest_index = suggest_index or get_suggest_index()
+        self.semantic_window = semantic_window or settings.semantic_result_window
+        self.fusion_k = settings.hybrid_rrf_k
+        self.fusion_weights = {
+            "semantic": settings.hybrid_semantic_weight,
+            "keyword": settings.hybrid_keyword_weight,
+        }
 
     async def search(
         self,
@@ -24,17 +68,74 @@ class SearchService:
         grade: Optional[str],
         page: int,
         page_size: int,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        view: str = "full",
+        fields: Optional[Sequence[str]] = None,
     ) -> Dict[str, Any]:
+        """
+        ``view="light"`` returns compact list items loaded with a projection
+        instead of whole posts; ``fields`` (implies light) further trims each
+        item to the named list fields.
+        """
+        if fields:
+            view = "light"
         offset = max(page - 1, 0) * page_size
+        if cursor and mode in ("semantic", "hybrid"):
+            offset = self._offset_from_cursor(cursor, self._cursor_scope(query, mode, department, grade, category))
+
+        # Whole responses are cached per corpus version; ingest bumps the version.
+        # Degraded responses (keyword fallback, local failover) are not cached.
+        key = ("response", " ".join(query.lower().split()), mode, department, grade, category, offset, page_size, view)
+
+        async def compute() -> Any:
+            result = await self._search(query, mode, department, grade, category, page, page_size, offset, view)
+            return Uncached(result) if result["meta"]["degraded"] else result
+
+        response = await self.result_cache.get_or_compute(key, await self.corpus_version.current(), compute)
+        if offset == 0 and response["items"]:
+            self.suggest_index.record_query(query)
+        if not fields:
+            return response
+        # The light response is cached once; field selection copies out of it.
+        return {
+            "items": select_fields(response["items"], fields),
+            "meta": {**response["meta"], "fields": list(fields)},
+        }
+
+    async def _search(
+        self,
+        query: str,
+        mode: str,
+        department: Optional[str],
+        grade: Optional[str],
+        category: Optional[str],
+        page: int,
+        page_size: int,
+        offset: int,
+        view: str,
+    ) -> Dict[str, Any]:
+        if mode == "hybrid":
+            hybrid = await self._hybrid_search(query, department, grade, category, page_size, offset, view)
+            hybrid["meta"].update(
+                {"page": offset // page_size + 1, "page_size": page_size, "mode": "hybrid", "view": view}
+            )
+            return hybrid
 
         if mode == "semantic":
-            semantic = await self._semantic_search(query, department, grade, page_size, offset)
-            if semantic:
-                semantic["meta"].update({"page": page, "page_size": page_size, "mode": "semantic"})
+            semantic = await self._semantic_search(
+                query, department, grade, category, page_size, offset, view
+            )
+            if semantic and (semantic["items"] or offset > 0):
+                semantic["meta"].update(
+                    {"page": offset // page_size + 1, "page_size": page_size, "mode": "semantic", "view": view}
+                )
                 return semantic
 
-        keyword = await self._keyword_search(query, department, grade, page, page_size)
-        keyword["meta"].update({"mode": "keyword" if mode == "keyword" else "fallback"})
+        keyword = await self._keyword_search(query, department, grade, category, page, page_size, view)
+        keyword["meta"].update(
+            {"mode": "keyword" if mode == "keyword" else "fallback", "view": view, "degraded": mode != "keyword"}
+        )
         return keyword
 
     async def _semantic_search(
@@ -42,78 +143,232 @@ class SearchService:
         query: str,
         department: Optional[str],
         grade: Optional[str],
+        category: Optional[str],
         page_size: int,
         offset: int,
+        view: str = "full",
     ) -> Optional[Dict[str, Any]]:
-        vector = await self.llm_service.embed(query)
-        if not vector:
+        search_filter = VectorFilter(
+            department=department,
+            audience_grade=grade,
+            category=category,
+        )
+        result_set = await self._semantic_result_set(query, search_filter)
+        if result_set is None or not result_set["hits"]:
             return None
 
-        hits = await vector_store.search_similar(vector, limit=page_size, offset=offset)
-        if not hits:
-            return None
-
-        mongo_ids = [
-            ObjectId(post_id)
-            for post_id in (
-                hit.get("post_id") or hit.get("payload", {}).get("post_id") or hit.get("id")
-                for hit in hits
+        window: List[Dict[str, Any]] = result_set["hits"]
+        degraded = result_set["degraded"]
+        if offset + page_size <= len(window) or len(window) < self.semantic_window:
+            hits = window[offset : offset + page_size]
+        else:
+            # Past the cached window: reuse the set's query vector and let
+            # Qdrant skip natively for this page.
+            hits, failover = await vector_store.search_similar_with_status(
+                np.asarray(result_set["vector"], dtype=np.float32),
+                limit=page_size,
+                offset=offset,
+                search_filter=search_filter,
             )
-            if post_id and ObjectId.is_valid(post_id)
-        ]
-        if not mongo_ids:
-            return None
+            degraded = degraded or failover
+
+        items = await hydrate_hits(hits, view=view)
+        total = result_set["total"]
+        next_offset = offset + page_size
+        scope = self._cursor_scope(query, "semantic", department, grade, category)
+        has_more = len(hits) == page_size and (
+            next_offset < len(window) or len(window) >= self.semantic_window
+        )
+        return {
+            "items": items,
+            "meta": {
+                "total": total,
+                "total_is_estimate": True,
+                "next_cursor": encode_cursor({"o": next_offset, "s": scope}) if has_more else None,
+                "degraded": degraded,
+            },
+        }
+
+    async def _hybrid_search(
+        self,
+        query: str,
+        department: Optional[str],
+        grade: Optional[str],
+        category: Optional[str],
+        page_size: int,
+        offset: int,
+        view: str = "full",
+    ) -> Dict[str, Any]:
+        """
+        Run vector and keyword retrieval concurrently over the same window and
+        fuse them with reciprocal rank fusion. Each item carries
+        ``hybrid_score`` plus per-signal ranks/scores under ``signals``.
+        """
+        search_filter = VectorFilter(department=department, audience_grade=grade, category=category)
+
+        async def semantic_hits() -> Tuple[List[Dict[str, Any]], bool]:
+            try:
+                result_set = await self._semantic_result_set(query, search_filter)
+            except QDRANT_ERRORS as exc:
+                logger.warning("Hybrid search continuing without vectors: %s", exc)
+                return [], True
+            if result_set is None:
+                return [], False
+            return result_set["hits"], result_set["degraded"]
 
-        posts = await Post.find(In(Post.id, mongo_ids)).to_list()
-        post_map = {str(post.id): post for post in posts}
+        (hits, degraded), keyword_page = await asyncio.gather(
+            semantic_hits(),
+            keyword_search(
+                query,
+                self._build_filters(department, grade, category),
+                limit=self.semantic_window,
+                with_total=False,
+                list_view=view == "light",
+            ),
+        )
+        keyword = keyword_page.items
+        fused = reciprocal_rank_fusion(
+            {
+                "semantic": [(hit_post_id(hit), hit.get("score"), hit) for hit in hits if hit_post_id(hit)],
+                "keyword": [(str(post.id), score, post) for post, score in keyword],
+            },
+            weights=self.fusion_weights,
+            k=self.fusion_k,
+        )
+        entries = fused[offset : offset + page_size]
 
-        items = []
-        for hit in hits:
-            post_id = hit.get("post_id") or hit.get("payload", {}).get("post_id") or hit.get("id")
-            post = post_map.get(post_id)
-            if not post:
-                continue
-            data = post.model_dump()
-            data["semantic_score"] = hit["score"]
-            items.append(data)
+        # Keyword matches are already loaded; only vector-only hits need hydrating.
+        posts: Dict[str, Post | PostListView] = {str(post.id): post for post, _ in keyword}
+        hydrated = await hydrate_hits(
+            [entry["item"] for entry in entries if entry["key"] not in posts],
+            view=view,
+        )
+        hydrated_items = {str(item.get("id")): item for item in hydrated}
 
-        filters = self._build_filters(department, grade)
-        total = await Post.find(filters).count()
+        items: List[Dict[str, Any]] = []
+        for entry in entries:
+            post = posts.get(entry["key"])
+            if post is not None:
+                item = light_item_from_post(post, None) if view == "light" else post.model_dump()
+            else:
+                item = hydrated_items.get(entry["key"])
+                if item is None:
+                    continue
+            semantic = entry["signals"].get("semantic")
+            item["semantic_score"] = semantic["score"] if semantic else None
+            item["hybrid_score"] = entry["score"]
+            item["signals"] = entry["signals"]
+            items.append(item)
 
+        scope = self._cursor_scope(query, "hybrid", department, grade, category)
+        next_offset = offset + page_size
         return {
             "items": items,
             "meta": {
-                "total": total,
+                "total": len(fused),
+                "total_is_estimate": True,
+                "next_cursor": encode_cursor({"o": next_offset, "s": scope}) if next_offset < len(fused) else None,
+                "degraded": degraded,
             },
         }
 
+    async def _semantic_result_set(
+        self,
+        query: str,
+        search_filter: VectorFilter,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached top ``semantic_window`` hits for the query, computing
+        them (one embedding + one Qdrant search + an approximate count) on a miss.
+        The set keeps its query ``vector`` (as a list, so it can be shared) for
+        pages past the window. Only sets built from the configured embedder and
+        Qdrant are cached; ``degraded`` marks one served without either.
+        """
+        return await self.result_cache.get_or_compute(
+            self._result_key(query, search_filter),
+            await self.corpus_version.current(),
+            lambda: self._compute_semantic_result_set(query, search_filter),
+        )
+
+    async def _compute_semantic_result_set(
+        self,
+        query: str,
+        search_filter: VectorFilter,
+    ) -> Any:
+        vector = await self._embed_query(query)
+        if vector is None:
+            return Uncached({"hits": [], "total": 0, "degraded": True, "vector": None})
+        hits, failover = await vector_store.search_similar_with_status(
+            vector,
+            limit=self.semantic_window,
+            search_filter=search_filter,
+        )
+        if not hits:
+            return None
+        if len(hits) < self.semantic_window:
+            total = len(hits)
+        else:
+            total = await vector_store.count_points(search_filter, exact=False)
+        result = {"hits": hits, "total": total, "degraded": failover, "vector": vector.tolist()}
+        return Uncached(result) if failover else result
+
+    async def _embed_query(self, query: str) -> Any:
+        # A fallback embedding is not comparable with the stored vectors.
+        try:
+            return await self.llm_service.embed_strict(query)
+        except (LLMDisabledError, LLMRequestError) as exc:
+            logger.warning("Query embedding failed, skipping semantic search: %s", exc)
+            return None
+
+    def _result_key(self, query: str, search_filter: VectorFilter) -> Tuple[Any, ...]:
+        normalized = " ".join(query.lower().split())
+        return ("semantic", normalized, tuple(sorted(asdict(search_filter).items(), key=lambda kv: kv[0])))
+
+    def _cursor_scope(
+        self,
+        query: str,
+        mode: str,
+        department: Optional[str],
+        grade: Optional[str],
+        category: Optional[str],
+    ) -> str:
+        """Short hash of the query and filters a cursor was issued for."""
+        normalized = " ".join(query.lower().split())
+        raw = json.dumps([normalized, mode, department, grade, category], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    def _offset_from_cursor(self, cursor: str, scope: str) -> int:
+        state = decode_cursor(cursor)
+        if state.get("s") != scope:
+            raise ValueError("Cursor does not match the requested query and filters")
+        offset = state.get("o")
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError("Invalid cursor")
+        return offset
+
     async def _keyword_search(
         self,
         query: str,
         department: Optional[str],
         grade: Optional[str],
+        category: Optional[str],
         page: int,
         page_size: int,
+        view: str = "full",
     ) -> Dict[str, Any]:
-        filters = self._build_filters(department, grade)
-        if query:
-            regex = {"$regex": query, "$options": "i"}
-            filters["$or"] = [
-                {"title": regex},
-                {"summary": regex},
-                {"body": regex},
-            ]
-
+        filters = self._build_filters(department, grade, category)
         offset = max(page - 1, 0) * page_size
-
-        cursor = Post.find(filters).skip(offset).limit(page_size)
-        total = await Post.find(filters).count()
-        items: List[Post] = await cursor.to_list()
+        light = view == "light"
+        results = await keyword_search(query, filters, skip=offset, limit=page_size, list_view=light)
 
         return {
-            "items": [item.model_dump() for item in items],
+            "items": [
+                {**(list_item(post) if light else post.model_dump()), "keyword_score": score}
+                for post, score in results.items
+            ],
             "meta": {
-                "total": total,
+                "total": results.total,
+                "total_is_estimate": results.total_is_estimate,
                 "page": page,
                 "page_size": page_size,
             },
@@ -123,10 +378,13 @@ class SearchService:
         self,
         department: Optional[str],
         grade: Optional[str],
+        category: Optional[str] = None,
     ) -> Dict[str, Any]:
         filters: Dict[str, Any] = {}
         if department:
             filters["department"] = department
         if grade:
             filters["audience_grade"] = grade
+        if category:
+            filters["category"] = category
         return filters
@@ -0,0 +1,259 @@
+"""
+In-process prefix index behind ``/api/search/suggest``.
+
+Terms (post titles, tags, departments and popular past queries) live in a
+sorted list of ``(key, kind, term)`` tuples; a lookup is one ``bisect`` plus a
+short forward scan, so typeahead never touches Mongo, Qdrant or the LLM. Every
+word start of a term is indexed, so "신청" also finds "국가장학금 신청 안내".
+Prefixes of up to ``TOP_PREFIX_CHARS`` characters match too many keys to
+scan; their best ``TOP_K`` terms are kept up to date as weights change.
+
+Recorded queries are raw user input: only short queries made of letters,
+digits and a little punctuation, without long digit runs (ids, phone numbers)
+or denylisted words (``SUGGEST_QUERY_DENYLIST``), are ever suggested.
+
+The index is built from Mongo at startup (``sync``), extended in-process by
+ingest (``add_post``), and re-synced periodically for posts inserted by other
+processes. Popular queries are process-local and reset on restart.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from bson import ObjectId
+
+from app.core.config import get_settings
+from app.models.post import Post
+
+logger = logging.getLogger(__name__)
+
+# Ranking boost per term kind; weights are occurrence/query counts.
+KIND_BOOST = {"query": 3.0, "tag": 2.0, "department": 2.0, "title": 1.0}
+MAX_SCAN = 256
+MAX_TERM_CHARS = 120
+TOP_PREFIX_CHARS = 3
+TOP_K = 32
+MAX_QUERY_CHARS = 40
+MAX_QUERY_WORDS = 6
+QUERY_PUNCTUATION = set(" -·&+#.")
+# Six or more digits, optionally dash/dot separated: student ids, phone numbers.
+DIGIT_RUN = re.compile(r"\d(?:[-.]?\d){5,}")
+
+
+@dataclass
+class Suggestion:
+    text: str
+    kind: str
+    weight: float = 0.0
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def suggestible_query(term: str, denylist: Iterable[str] = ()) -> bool:
+    """Whether a normalized query is safe to show to other users."""
+    if not 2 <= len(term) <= MAX_QUERY_CHARS or len(term.split()) > MAX_QUERY_WORDS:
+        return False
+    if not all(char.isalnum() or char in QUERY_PUNCTUATION for char in term):
+        return False
+    if DIGIT_RUN.search(term):
+        return False
+    return not any(word and word in term for word in denylist)
+
+
+def _word_starts(term: str) -> Iterable[int]:
+    yield 0
+    for index, char in enumerate(term):
+        if char == " ":
+            yield index + 1
+
+
+class SuggestIndex:
+    def __init__(
+        self,
+        max_queries: Optional[int] = None,
+        min_query_count: Optional[int] = None,
+    ) -> None:
+        settings = get_settings()
+        self.max_queries = max_queries or settings.suggest_max_queries
+        self.min_query_count = (
+            min_query_count if min_query_count is not None else settings.suggest_min_query_count
+        )
+        self.query_denylist = [normalize(word) for word in settings.suggest_query_denylist]
+        self._keys: List[Tuple[str, str, str]] = []
+        self._terms: Dict[Tuple[str, str], Suggestion] = {}
+        # Best ((rank), (kind, term)) pairs per short prefix, best first.
+        self._top: Dict[str, List[Tuple[Tuple[float, int], Tuple[str, str]]]] = {}
+        self._post_ids: Set[str] = set()
+        self._last_synced_id: Optional[ObjectId] = None
+        self._query_count = 0
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add_term(self, text: Optional[str], kind: str, weight: float = 1.0) -> None:
+        term = normalize(text)[:MAX_TERM_CHARS]
+        if not term:
+            return
+        entry = self._terms.get((kind, term))
+        if entry is not None:
+            entry.weight += weight
+            self._update_top(kind, term)
+            return
+        self._terms[(kind, term)] = Suggestion(text=" ".join(text.split())[:MAX_TERM_CHARS], kind=kind, weight=weight)
+        for start in _word_starts(term):
+            insort(self._keys, (term[start:], kind, term))
+        self._update_top(kind, term)
+        if kind == "query":
+            self._query_count += 1
+            if self._query_count > self.max_queries:
+                self._evict_queries()
+
+    def add_post(self, post: Any) -> None:
+        """Index a post's title, tags and department once per post id."""
+        post_id = str(post.id)
+        if post_id in self._post_ids:
+            return
+        self._post_ids.add(post_id)
+        self.add_term(post.title, "title")
+        for tag in post.tags or []:
+            self.add_term(tag, "tag")
+        self.add_term(post.department, "department")
+
+    def record_query(self, query: str) -> None:
+        """Count a query that returned results; it is suggested once popular."""
+        if suggestible_query(normalize(query)[:MAX_TERM_CHARS], self.query_denylist):
+            self.add_term(query, "query")
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Dict[str, str]]:
+        needle = normalize(prefix)
+        if not needle:
+            return []
+        if len(needle) <= TOP_PREFIX_CHARS:
+            ranked = [(key, self._terms[key]) for _, key in self._top.get(needle, [])]
+        else:
+            matches = {key: self._terms[key] for key in self._scan(needle, MAX_SCAN) if self._eligible(*key)}
+            ranked = sorted(matches.items(), key=lambda item: self._rank(*item[0]))
+        results: List[Dict[str, str]] = []
+        seen: Set[str] = set()
+        for (_, term), entry in ranked:
+            if term in seen:
+                continue
+            seen.add(term)
+            results.append({"text": entry.text, "kind": entry.kind})
+            if len(results) >= limit:
+                break
+        return results
+
+    async def sync(self) -> int:
+        """Index posts inserted since the last sync; returns how many were read."""
+        match: Dict[str, Any] = {}
+        if self._last_synced_id is not None:
+            match["_id"] = {"$gt": self._last_synced_id}
+        cursor = (
+            Post.get_motor_collection()
+            .find(match, {"title": 1, "tags": 1, "department": 1})
+            .sort("_id", 1)
+        )
+        count = 0
+        async for document in cursor:
+            self.add_post(
+                SimpleNamespace(
+                    id=document["_id"],
+                    title=document.get("title"),
+                    tags=document.get("tags"),
+                    department=document.get("department"),
+                )
+            )
+            self._last_synced_id = document["_id"]
+            count += 1
+        return count
+
+    async def sync_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync()
+            except Exception as exc:  # pragma: no cover - network/db failures
+                logger.warning("Suggest index sync failed: %s", exc)
+
+    def _eligible(self, kind: str, term: str) -> bool:
+        return kind != "query" or self._terms[(kind, term)].weight >= self.min_query_count
+
+    def _rank(self, kind: str, term: str) -> Tuple[float, int]:
+        entry = self._terms[(kind, term)]
+        return (-entry.weight * KIND_BOOST.get(kind, 1.0), len(term))
+
+    def _scan(self, needle: str, limit: Optional[int] = None) -> Iterable[Tuple[str, str]]:
+        index = bisect_left(self._keys, (needle,))
+        end = len(self._keys) if limit is None else min(index + limit, len(self._keys))
+        while index < end and self._keys[index][0].startswith(needle):
+            _, kind, term = self._keys[index]
+            yield kind, term
+            index += 1
+
+    def _prefixes(self, term: str) -> Set[str]:
+        return {
+            term[start : start + length]
+            for start in _word_starts(term)
+            for length in range(1, TOP_PREFIX_CHARS + 1)
+            if start + length <= len(term) and term[start + length - 1] != " "
+        }
+
+    def _update_top(self, kind: str, term: str) -> None:
+        """Re-rank ``(kind, term)`` after its weight grew in every short-prefix list."""
+        if not self._eligible(kind, term):
+            return
+        key = (kind, term)
+        entry = (self._rank(kind, term), key)
+        for prefix in self._prefixes(term):
+            top = self._top.setdefault(prefix, [])
+            if len(top) >= TOP_K and entry >= top[-1]:
+                continue
+            for position, (_, existing) in enumerate(top):
+                if existing == key:
+                    del top[position]
+                    break
+            insort(top, entry)
+            del top[TOP_K:]
+
+    def _refill_top(self, prefix: str) -> None:
+        keys = {key for key in self._scan(prefix) if self._eligible(*key)}
+        top = sorted((self._rank(*key), key) for key in keys)[:TOP_K]
+        if top:
+            self._top[prefix] = top
+        else:
+            self._top.pop(prefix, None)
+
+    def _remove(self, kind: str, term: str) -> None:
+        del self._terms[(kind, term)]
+        for start in _word_starts(term):
+            key = (term[start:], kind, term)
+            index = bisect_left(self._keys, key)
+            if index < len(self._keys) and self._keys[index] == key:
+                del self._keys[index]
+        for prefix in self._prefixes(term):
+            if any(key == (kind, term) for _, key in self._top.get(prefix, ())):
+                self._refill_top(prefix)
+
+    def _evict_queries(self) -> None:
+        """Drop the least popular tenth of recorded queries."""
+        queries = sorted(
+            (entry.weight, term) for (kind, term), entry in self._terms.items() if kind == "query"
+        )
+        for _, term in queries[: max(len(queries) // 10, 1)]:
+            self._remove("query", term)
+            self._query_count -= 1
+
+
+@lru_cache
+def get_suggest_index() -> SuggestIndex:
+    return SuggestIndex()
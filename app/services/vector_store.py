@@ -2,80 +2,824 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Dict, List, Optional
-from uuid import uuid4
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID, uuid5
 
-from qdrant_client.models import Distance, PointStruct, VectorParams
+import grpc
+import httpx
+import numpy as np
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+from qdrant_client.models import (
+    CollectionParamsDiff,
+    CreateAlias,
+    CreateAliasOperation,
+    DatetimeRange,
+    DeleteAlias,
+    DeleteAliasOperation,
+    Disabled,
+    Distance,
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    HasIdCondition,
+    HnswConfigDiff,
+    MatchAny,
+    MatchValue,
+    OptimizersConfigDiff,
+    PayloadSchemaType,
+    PointIdsList,
+    PointStruct,
+    QuantizationSearchParams,
+    RecommendStrategy,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+    VectorParamsDiff,
+)
 
 from app.core.config import get_settings
 from app.db.qdrant import get_qdrant_client
+from app.models.post import Post
+from app.services.local_vector_index import LocalVectorIndex
 
 logger = logging.getLogger(__name__)
 
 _collection_initialized = False
+_collection_lock = asyncio.Lock()
+_local_index: Optional[LocalVectorIndex] = None
+
+# Errors that mean "Qdrant is unreachable or misbehaving" for failover purposes.
+QDRANT_ERRORS = (
+    ResponseHandlingException,
+    UnexpectedResponse,
+    httpx.HTTPError,
+    grpc.RpcError,
+    OSError,
+)
+
+# Namespace for uuid5 point ids so each post maps to exactly one point.
+POINT_ID_NAMESPACE = UUID("6f1c2f0e-4c55-4a0b-9d0e-6a3f4e2b7c11")
+
+
+PAYLOAD_INDEXES: Dict[str, PayloadSchemaType] = {
+    "post_id": PayloadSchemaType.KEYWORD,
+    "department": PayloadSchemaType.KEYWORD,
+    "audience_grade": PayloadSchemaType.KEYWORD,
+    "category": PayloadSchemaType.KEYWORD,
+    "source": PayloadSchemaType.KEYWORD,
+    "posted_at": PayloadSchemaType.DATETIME,
+    "deadline_at": PayloadSchemaType.DATETIME,
+}
+
+
+def get_local_index() -> LocalVectorIndex:
+    """Shared embedded index used by the ``local`` backend and Qdrant failover."""
+    global _local_index
+    if _local_index is None:
+        settings = get_settings()
+        _local_index = LocalVectorIndex(
+            settings.local_vector_index_path,
+            dim=settings.qdrant_vector_size,
+            read_only=settings.local_vector_index_read_only,
+        )
+    return _local_index
+
+
+def _local_backend() -> bool:
+    return get_settings().vector_backend == "local"
+
+
+def _mirror_to_local() -> bool:
+    settings = get_settings()
+    return settings.vector_failover_enabled and not settings.local_vector_index_read_only
+
+
+def embedding_metadata() -> Dict[str, str]:
+    """
+    Model and version tag stored with every vector so mixed spaces are detectable.
+    Describes the configured embedder, i.e. vectors from ``LLMService.embed_strict``;
+    ``embed`` may fall back to the local space and must not feed the store.
+    """
+    settings = get_settings()
+    if settings.embedding_backend == "local":
+        model = f"local-ngram-{settings.local_embedding_ngram_min}-{settings.local_embedding_ngram_max}"
+    else:
+        model = settings.llm_embedding_model
+    return {"embedding_model": model, "embedding_version": settings.embedding_version}
+
+
+def versioned_collection_name(model: Optional[str] = None, version: Optional[str] = None) -> str:
+    """
+    Physical collection behind the ``qdrant_collection_notices`` alias for one
+    embedding model/size/version, e.g. ``notice_vectors__text_embedding_3_small_768_v1``.
+    """
+    settings = get_settings()
+    metadata = embedding_metadata()
+    model = model or metadata["embedding_model"]
+    version = version or metadata["embedding_version"]
+    slug = re.sub(r"[^a-z0-9]+", "_", f"{model}_{settings.qdrant_vector_size}_v{version}".lower()).strip("_")
+    return f"{settings.qdrant_collection_notices}__{slug}"
+
+
+def point_id_for(post_id: str) -> str:
+    return str(uuid5(POINT_ID_NAMESPACE, str(post_id)))
+
+
+def build_payload(post: Post) -> Dict:
+    """Payload stored with a post's vector: filter fields plus light display fields."""
+    return {
+        "post_id": str(post.id),
+        "title": post.title,
+        "summary": post.summary,
+        "department": post.department,
+        "audience_grade": post.audience_grade,
+        "posted_at": post.posted_at.isoformat(),
+        "deadline_at": post.deadline_at.isoformat() if post.deadline_at else None,
+        "tags": post.tags,
+        "category": post.category,
+        "source": post.source,
+    }
+
+
+@dataclass
+class VectorFilter:
+    """Payload constraints pushed down to the vector search."""
+
+    department: Optional[str] = None
+    audience_grade: Optional[str] = None
+    category: Optional[str] = None
+    source: Optional[str] = None
+    posted_from: Optional[datetime] = None
+    posted_to: Optional[datetime] = None
+    deadline_from: Optional[datetime] = None
+    deadline_to: Optional[datetime] = None
+    exclude_post_ids: Tuple[str, ...] = field(default_factory=tuple)
+
+    def to_qdrant(self) -> Optional[Filter]:
+        must: List[FieldCondition] = []
+        for key in ("department", "audience_grade", "category", "source"):
+            value = getattr(self, key)
+            if value:
+                must.append(FieldCondition(key=key, match=MatchValue(value=value)))
+        for key, low, high in (
+            ("posted_at", self.posted_from, self.posted_to),
+            ("deadline_at", self.deadline_from, self.deadline_to),
+        ):
+            if low or high:
+                must.append(FieldCondition(key=key, range=DatetimeRange(gte=low, lte=high)))
+        must_not = []
+        if self.exclude_post_ids:
+            must_not.append(HasIdCondition(has_id=[point_id_for(pid) for pid in self.exclude_post_ids]))
+        if not must and not must_not:
+            return None
+        return Filter(must=must or None, must_not=must_not or None)
+
+
+def as_vector(vector) -> np.ndarray:
+    """Coerce an embedding into the contiguous float32 array used internally."""
+    return np.ascontiguousarray(vector, dtype=np.float32)
+
+
+def _quantization_config() -> Optional[ScalarQuantization]:
+    settings = get_settings()
+    if settings.qdrant_quantization != "int8":
+        return None
+    return ScalarQuantization(
+        scalar=ScalarQuantizationConfig(
+            type=ScalarType.INT8,
+            quantile=settings.qdrant_quantization_quantile,
+            always_ram=settings.qdrant_quantization_always_ram,
+        )
+    )
+
+
+def _hnsw_config() -> HnswConfigDiff:
+    settings = get_settings()
+    return HnswConfigDiff(
+        m=settings.qdrant_hnsw_m,
+        ef_construct=settings.qdrant_hnsw_ef_construct,
+        full_scan_threshold=settings.qdrant_hnsw_full_scan_threshold,
+        on_disk=settings.qdrant_hnsw_on_disk,
+    )
+
+
+def _optimizers_config() -> OptimizersConfigDiff:
+    settings = get_settings()
+    return OptimizersConfigDiff(
+        indexing_threshold=settings.qdrant_indexing_threshold,
+        memmap_threshold=settings.qdrant_memmap_threshold,
+        default_segment_number=settings.qdrant_default_segment_number,
+    )
+
+
+def _search_params() -> Optional[SearchParams]:
+    settings = get_settings()
+    quantization = None
+    if settings.qdrant_quantization == "int8":
+        quantization = QuantizationSearchParams(
+            rescore=settings.qdrant_search_rescore,
+            oversampling=settings.qdrant_search_oversampling,
+        )
+    if quantization is None and settings.qdrant_search_ef is None:
+        return None
+    return SearchParams(hnsw_ef=settings.qdrant_search_ef, quantization=quantization)
 
 
 async def ensure_collection() -> None:
+    """
+    Make sure ``qdrant_collection_notices`` resolves to a collection. New
+    deployments get a versioned collection behind an alias of that name;
+    collections created before aliases were introduced are used as-is until
+    the first re-embedding backfill swaps them out.
+    """
     global _collection_initialized
     if _collection_initialized:
         return
 
+    async with _collection_lock:
+        if _collection_initialized:
+            return
+        settings = get_settings()
+        client = get_qdrant_client()
+        alias = settings.qdrant_collection_notices
+        names = [c.name for c in (await client.get_collections()).collections]
+        if alias not in names and await resolve_alias(alias) is None:
+            target = versioned_collection_name()
+            await create_versioned_collection(target)
+            await client.update_collection_aliases(
+                change_aliases_operations=[
+                    CreateAliasOperation(create_alias=CreateAlias(collection_name=target, alias_name=alias))
+                ]
+            )
+        await _ensure_payload_indexes(await resolve_alias(alias) or alias)
+        _collection_initialized = True
+
+
+async def create_versioned_collection(name: str) -> None:
+    """Create ``name`` with the configured vector, HNSW, optimizer and quantization settings."""
     settings = get_settings()
     client = get_qdrant_client()
-
-    def _ensure() -> None:
-        collections = client.get_collections().collections
-        names = [c.name for c in collections]
-        if settings.qdrant_collection_notices in names:
-            return
-        client.recreate_collection(
-            collection_name=settings.qdrant_collection_notices,
+    names = [c.name for c in (await client.get_collections()).collections]
+    if name not in names:
+        await client.create_collection(
+            collection_name=name,
             vectors_config=VectorParams(
                 size=settings.qdrant_vector_size,
                 distance=Distance.COSINE,
+                on_disk=settings.qdrant_on_disk_vectors,
             ),
+            hnsw_config=_hnsw_config(),
+            optimizers_config=_optimizers_config(),
+            on_disk_payload=settings.qdrant_on_disk_payload,
+            quantization_config=_quantization_config(),
+        )
+    await _ensure_payload_indexes(name)
+
+
+async def resolve_alias(alias: Optional[str] = None) -> Optional[str]:
+    """Collection currently behind ``alias`` (default: the notices alias), if any."""
+    alias = alias or get_settings().qdrant_collection_notices
+    for description in (await get_qdrant_client().get_aliases()).aliases:
+        if description.alias_name == alias:
+            return description.collection_name
+    return None
+
+
+async def swap_alias(target: str) -> Dict[str, Optional[str]]:
+    """
+    Point the notices alias at ``target`` in one alias update, so readers flip
+    from the old collection to the new one atomically. Qdrant rejects an alias
+    named like an existing collection, so a pre-alias collection that still
+    owns the name is dropped first and the alias created right after; searches
+    fail for that short gap only.
+    """
+    global _collection_initialized
+    client = get_qdrant_client()
+    alias = get_settings().qdrant_collection_notices
+    previous = await resolve_alias(alias)
+    operations = []
+    if previous is not None:
+        operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias)))
+    elif alias in [c.name for c in (await client.get_collections()).collections]:
+        logger.warning("Dropping legacy collection %s so it can become an alias of %s", alias, target)
+        await client.delete_collection(alias)
+        previous = alias
+    operations.append(CreateAliasOperation(create_alias=CreateAlias(collection_name=target, alias_name=alias)))
+    await client.update_collection_aliases(change_aliases_operations=operations)
+    _collection_initialized = False
+    return {"alias": alias, "previous": previous, "current": target}
+
+
+async def _ensure_payload_indexes(collection: str) -> None:
+    client = get_qdrant_client()
+    info = await client.get_collection(collection)
+    existing = set((info.payload_schema or {}).keys())
+    for field_name, schema in PAYLOAD_INDEXES.items():
+        if field_name in existing:
+            continue
+        await client.create_payload_index(
+            collection_name=collection,
+            field_name=field_name,
+            field_schema=schema,
         )
 
-    await asyncio.to_thread(_ensure)
-    _collection_initialized = True
 
+def _config_diff(current, desired) -> Dict[str, Dict]:
+    """Fields of the ``desired`` diff model whose values differ from ``current``."""
+    changes: Dict[str, Dict] = {}
+    for field_name, value in desired.model_dump(exclude_none=True).items():
+        existing = getattr(current, field_name, None) if current is not None else None
+        if existing == value or (existing is None and value is False):
+            continue
+        if existing != value:
+            changes[field_name] = {"from": existing, "to": value}
+    return changes
 
-async def upsert_notice_vector(post_id: str, vector: List[float], payload: Dict) -> None:
+
+async def migrate_collection(dry_run: bool = False) -> Dict:
+    """
+    Bring an existing notices collection in line with the HNSW, optimizer,
+    on-disk and quantization settings without recreating it. Qdrant rebuilds
+    the affected segments in the background.
+    """
     await ensure_collection()
+    settings = get_settings()
     client = get_qdrant_client()
+    collection = await resolve_alias() or settings.qdrant_collection_notices
+    config = (await client.get_collection(collection)).config
+
+    changes: Dict[str, Dict] = {}
+    update: Dict = {}
+
+    hnsw_changes = _config_diff(config.hnsw_config, _hnsw_config())
+    if hnsw_changes:
+        changes["hnsw_config"] = hnsw_changes
+        update["hnsw_config"] = HnswConfigDiff(**{k: v["to"] for k, v in hnsw_changes.items()})
+
+    optimizer_changes = _config_diff(config.optimizer_config, _optimizers_config())
+    if optimizer_changes:
+        changes["optimizers_config"] = optimizer_changes
+        update["optimizers_config"] = OptimizersConfigDiff(**{k: v["to"] for k, v in optimizer_changes.items()})
+
+    vectors = config.params.vectors
+    current_on_disk = bool(getattr(vectors, "on_disk", False))
+    if current_on_disk != settings.qdrant_on_disk_vectors:
+        changes["vectors.on_disk"] = {"from": current_on_disk, "to": settings.qdrant_on_disk_vectors}
+        update["vectors_config"] = {"": VectorParamsDiff(on_disk=settings.qdrant_on_disk_vectors)}
+
+    current_payload_on_disk = bool(config.params.on_disk_payload)
+    if current_payload_on_disk != settings.qdrant_on_disk_payload:
+        changes["on_disk_payload"] = {"from": current_payload_on_disk, "to": settings.qdrant_on_disk_payload}
+        update["collection_params"] = CollectionParamsDiff(on_disk_payload=settings.qdrant_on_disk_payload)
+
+    desired_quantization = _quantization_config()
+    if config.quantization_config != desired_quantization:
+        changes["quantization_config"] = {
+            "from": config.quantization_config.model_dump() if config.quantization_config else None,
+            "to": desired_quantization.model_dump() if desired_quantization else None,
+        }
+        update["quantization_config"] = desired_quantization or Disabled.DISABLED
+
+    if update and not dry_run:
+        await client.update_collection(collection_name=collection, **update)
+    return {"collection": collection, "changes": changes, "applied": bool(update) and not dry_run}
+
 
-    payload = {"post_id": post_id, **payload}
-    point = PointStruct(id=str(uuid4()), vector=vector, payload=payload)
-    await asyncio.to_thread(
-        client.upsert,
+def _point_payload(post_id: str, payload: Dict, metadata: Dict[str, str]) -> Dict:
+    # ``embedded_at`` lets compaction keep the newest of duplicate points.
+    return {"post_id": post_id, **metadata, "embedded_at": datetime.utcnow().isoformat(), **payload}
+
+
+async def upsert_notice_vector(post_id: str, vector: np.ndarray, payload: Dict) -> None:
+    payload = _point_payload(post_id, payload, embedding_metadata())
+    if _local_backend():
+        await asyncio.to_thread(get_local_index().upsert, post_id, as_vector(vector), payload)
+        return
+
+    await ensure_collection()
+    client = get_qdrant_client()
+    point = PointStruct(id=point_id_for(post_id), vector=as_vector(vector).tolist(), payload=payload)
+    await client.upsert(
         collection_name=get_settings().qdrant_collection_notices,
         points=[point],
     )
+    if _mirror_to_local():
+        await asyncio.to_thread(get_local_index().upsert, post_id, as_vector(vector), payload)
+
+
+async def upsert_notice_vectors(
+    items: Iterable[Tuple[str, np.ndarray, Dict]],
+    collection: Optional[str] = None,
+) -> int:
+    """
+    Batch variant of ``upsert_notice_vector`` writing ``(post_id, vector, payload)``
+    items into ``collection`` (default: the notices alias) in one request.
+    """
+    metadata = embedding_metadata()
+    rows = [
+        (post_id, as_vector(vector), _point_payload(post_id, payload, metadata))
+        for post_id, vector, payload in items
+    ]
+    if not rows:
+        return 0
+    if collection is None and _local_backend():
+        await asyncio.to_thread(get_local_index().upsert_many, rows)
+        return len(rows)
+
+    mirror = collection is None and _mirror_to_local()
+    if collection is None:
+        await ensure_collection()
+        collection = get_settings().qdrant_collection_notices
+    points = [
+        PointStruct(id=point_id_for(post_id), vector=vector.tolist(), payload=payload)
+        for post_id, vector, payload in rows
+    ]
+    await get_qdrant_client().upsert(collection_name=collection, points=points)
+    if mirror:
+        await asyncio.to_thread(get_local_index().upsert_many, rows)
+    return len(rows)
+
+
+async def delete_notice_vectors(post_ids: List[str]) -> int:
+    """Remove every point stored for ``post_ids``; returns how many posts were targeted."""
+    if not post_ids:
+        return 0
+    if _local_backend():
+        return await asyncio.to_thread(get_local_index().delete, post_ids)
+
+    await ensure_collection()
+    await get_qdrant_client().delete(
+        collection_name=get_settings().qdrant_collection_notices,
+        points_selector=FilterSelector(
+            filter=Filter(must=[FieldCondition(key="post_id", match=MatchAny(any=list(post_ids)))])
+        ),
+    )
+    if _mirror_to_local():
+        await asyncio.to_thread(get_local_index().delete, post_ids)
+    return len(post_ids)
+
+
+async def iter_post_ids(batch_size: int = 1000) -> AsyncIterator[List[str]]:
+    """Yield the ``post_id`` of every stored vector in batches (unordered)."""
+    if _local_backend():
+        post_ids = await asyncio.to_thread(get_local_index().post_ids)
+        for start in range(0, len(post_ids), batch_size):
+            yield post_ids[start : start + batch_size]
+        return
+
+    await ensure_collection()
+    client = get_qdrant_client()
+    collection = get_settings().qdrant_collection_notices
+    offset = None
+    while True:
+        records, offset = await client.scroll(
+            collection_name=collection,
+            limit=batch_size,
+            offset=offset,
+            with_payload=["post_id"],
+            with_vectors=False,
+        )
+        batch = [str(record.payload["post_id"]) for record in records if (record.payload or {}).get("post_id")]
+        if batch:
+            yield batch
+        if offset is None:
+            break
+
+
+async def set_notice_payload(post_id: str, payload: Dict) -> None:
+    """Merge ``payload`` into an existing point without touching its vector."""
+    if _local_backend():
+        await asyncio.to_thread(get_local_index().set_payload, post_id, payload)
+        return
+
+    await ensure_collection()
+    client = get_qdrant_client()
+    await client.set_payload(
+        collection_name=get_settings().qdrant_collection_notices,
+        payload=payload,
+        points=[point_id_for(post_id)],
+    )
+    if _mirror_to_local():
+        await asyncio.to_thread(get_local_index().set_payload, post_id, payload)
 
 
 async def search_similar(
-    vector: List[float],
+    vector: np.ndarray,
+    limit: int,
+    offset: int = 0,
+    search_filter: Optional[VectorFilter] = None,
+    score_threshold: Optional[float] = None,
+) -> List[Dict]:
+    hits, _ = await search_similar_with_status(vector, limit, offset, search_filter, score_threshold)
+    return hits
+
+
+async def search_similar_with_status(
+    vector: np.ndarray,
     limit: int,
     offset: int = 0,
+    search_filter: Optional[VectorFilter] = None,
+    score_threshold: Optional[float] = None,
+) -> Tuple[List[Dict], bool]:
+    """``search_similar`` plus whether the hits came from the local failover."""
+    if _local_backend():
+        return await _local_search(vector, limit, offset, search_filter, score_threshold), False
+    try:
+        return await _qdrant_search(vector, limit, offset, search_filter, score_threshold), False
+    except QDRANT_ERRORS as exc:
+        if not get_settings().vector_failover_enabled:
+            raise
+        logger.warning("Qdrant search failed, serving from local vector index: %s", exc)
+        return await _local_search(vector, limit, offset, search_filter, score_threshold), True
+
+
+async def _local_search(
+    vector: np.ndarray,
+    limit: int,
+    offset: int,
+    search_filter: Optional[VectorFilter],
+    score_threshold: Optional[float],
+) -> List[Dict]:
+    # The brute-force matmul would otherwise block the event loop.
+    return await asyncio.to_thread(get_local_index().search, vector, limit, offset, search_filter, score_threshold)
+
+
+async def _qdrant_search(
+    vector: np.ndarray,
+    limit: int,
+    offset: int,
+    search_filter: Optional[VectorFilter],
+    score_threshold: Optional[float],
 ) -> List[Dict]:
     await ensure_collection()
     client = get_qdrant_client()
 
-    def _search() -> List[Dict]:
-        result = client.search(
+    result = await client.search(
+        collection_name=get_settings().qdrant_collection_notices,
+        query_vector=as_vector(vector),
+        query_filter=search_filter.to_qdrant() if search_filter else None,
+        search_params=_search_params(),
+        limit=limit,
+        offset=offset or None,
+        score_threshold=score_threshold,
+    )
+    return [
+        {
+            "id": str(point.id),
+            "score": point.score,
+            "payload": point.payload or {},
+            "post_id": (point.payload or {}).get("post_id"),
+        }
+        for point in result
+    ]
+
+
+async def existing_post_ids(post_ids: List[str]) -> Set[str]:
+    """Subset of ``post_ids`` that have a point under their deterministic id."""
+    if not post_ids:
+        return set()
+    if _local_backend():
+        return await asyncio.to_thread(get_local_index().existing, post_ids)
+
+    await ensure_collection()
+    records = await get_qdrant_client().retrieve(
+        collection_name=get_settings().qdrant_collection_notices,
+        ids=[point_id_for(pid) for pid in post_ids],
+        with_payload=["post_id"],
+        with_vectors=False,
+    )
+    return {str(record.payload["post_id"]) for record in records if (record.payload or {}).get("post_id")}
+
+
+async def fetch_vectors(post_ids: List[str]) -> Dict[str, np.ndarray]:
+    """Stored vectors for ``post_ids``; posts without a vector are left out."""
+    if not post_ids:
+        return {}
+    if _local_backend():
+        return await asyncio.to_thread(get_local_index().get_vectors, post_ids)
+
+    await ensure_collection()
+    records = await get_qdrant_client().retrieve(
+        collection_name=get_settings().qdrant_collection_notices,
+        ids=[point_id_for(pid) for pid in post_ids],
+        with_payload=["post_id"],
+        with_vectors=True,
+    )
+    return {
+        str(record.payload["post_id"]): as_vector(record.vector)
+        for record in records
+        if (record.payload or {}).get("post_id") and record.vector is not None
+    }
+
+
+async def recommend_similar(
+    positive_post_ids: List[str],
+    limit: int,
+    negative_post_ids: Optional[List[str]] = None,
+    search_filter: Optional[VectorFilter] = None,
+) -> List[Dict]:
+    """
+    Posts closest to the stored vectors of ``positive_post_ids`` (and away from
+    ``negative_post_ids``) without embedding anything. The example posts are
+    never returned. Posts that have no stored vector are ignored.
+    """
+    negative_post_ids = negative_post_ids or []
+    if not positive_post_ids:
+        return []
+    if _local_backend():
+        return await asyncio.to_thread(_local_recommend, positive_post_ids, negative_post_ids, limit, search_filter)
+    try:
+        return await _qdrant_recommend(positive_post_ids, negative_post_ids, limit, search_filter)
+    except QDRANT_ERRORS as exc:
+        if not get_settings().vector_failover_enabled:
+            raise
+        logger.warning("Qdrant recommend failed, serving from local vector index: %s", exc)
+        return await asyncio.to_thread(_local_recommend, positive_post_ids, negative_post_ids, limit, search_filter)
+
+
+async def _qdrant_recommend(
+    positive_post_ids: List[str],
+    negative_post_ids: List[str],
+    limit: int,
+    search_filter: Optional[VectorFilter],
+) -> List[Dict]:
+    await ensure_collection()
+    client = get_qdrant_client()
+    collection = get_settings().qdrant_collection_notices
+
+    # Qdrant rejects the whole request if any example id is unknown.
+    examples = [point_id_for(pid) for pid in [*positive_post_ids, *negative_post_ids]]
+    stored = {str(record.id) for record in await client.retrieve(collection_name=collection, ids=examples)}
+    positive = [pid for pid in map(point_id_for, positive_post_ids) if pid in stored]
+    negative = [pid for pid in map(point_id_for, negative_post_ids) if pid in stored]
+    if not positive:
+        return []
+
+    result = await client.recommend(
+        collection_name=collection,
+        positive=positive,
+        negative=negative or None,
+        query_filter=search_filter.to_qdrant() if search_filter else None,
+        search_params=_search_params(),
+        strategy=RecommendStrategy.AVERAGE_VECTOR,
+        limit=limit,
+    )
+    return [
+        {
+            "id": str(point.id),
+            "score": point.score,
+            "payload": point.payload or {},
+            "post_id": (point.payload or {}).get("post_id"),
+        }
+        for point in result
+    ]
+
+
+def _local_recommend(
+    positive_post_ids: List[str],
+    negative_post_ids: List[str],
+    limit: int,
+    search_filter: Optional[VectorFilter],
+) -> List[Dict]:
+    index = get_local_index()
+    vectors = index.get_vectors([*positive_post_ids, *negative_post_ids])
+    centroid = mean_vector(vectors.get(pid) for pid in positive_post_ids)
+    if centroid is None:
+        return []
+    negative = mean_vector(vectors.get(pid) for pid in negative_post_ids)
+    if negative is not None:
+        # Same shape as Qdrant's average_vector strategy.
+        centroid = centroid + (centroid - negative)
+    examples = set(positive_post_ids) | set(negative_post_ids)
+    hits = index.search(centroid, limit + len(examples), search_filter=search_filter)
+    return [hit for hit in hits if hit["post_id"] not in examples][:limit]
+
+
+def mean_vector(vectors: Iterable[Optional[np.ndarray]]) -> Optional[np.ndarray]:
+    """Mean of the non-missing vectors, or None if there are none."""
+    present = [as_vector(vector) for vector in vectors if vector is not None]
+    if not present:
+        return None
+    return np.mean(present, axis=0, dtype=np.float32)
+
+
+async def count_points(
+    search_filter: Optional[VectorFilter] = None,
+    exact: bool = False,
+) -> int:
+    """Number of points matching ``search_filter``; approximate unless ``exact``."""
+    if _local_backend():
+        return await asyncio.to_thread(get_local_index().count, search_filter)
+    try:
+        await ensure_collection()
+        client = get_qdrant_client()
+        result = await client.count(
             collection_name=get_settings().qdrant_collection_notices,
-            query_vector=vector,
-            limit=limit + offset,
+            count_filter=search_filter.to_qdrant() if search_filter else None,
+            exact=exact,
         )
-        return [
-            {
-                "id": str(point.id),
-                "score": point.score,
-                "payload": point.payload or {},
-                "post_id": (point.payload or {}).get("post_id"),
-            }
-            for point in result
-        ]
-
-    hits = await asyncio.to_thread(_search)
-    return hits[offset:limit + offset]
+        return result.count
+    except QDRANT_ERRORS as exc:
+        if not get_settings().vector_failover_enabled:
+            raise
+        logger.warning("Qdrant count failed, counting the local vector index: %s", exc)
+        return await asyncio.to_thread(get_local_index().count, search_filter)
+
+
+async def compact_duplicates(batch_size: int = 256, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Collapse points that share a ``post_id`` into the single deterministic
+    point returned by ``point_id_for``. Of each group the freshest point is
+    kept (see ``_freshness``), preferring the deterministic one on ties; a
+    legacy winner is re-keyed onto the deterministic id and every other
+    duplicate is deleted. The local backend is keyed by ``post_id`` and never
+    holds duplicates.
+    """
+    if _local_backend():
+        count = await asyncio.to_thread(len, get_local_index())
+        return {"scanned": count, "posts": count, "unkeyed": 0, "rekeyed": 0, "deleted": 0, "dry_run": dry_run}
+    await ensure_collection()
+    client = get_qdrant_client()
+    collection = get_settings().qdrant_collection_notices
+    metadata = embedding_metadata()
+
+    groups: Dict[str, List[Tuple[str, Tuple[bool, str]]]] = defaultdict(list)
+    scanned = 0
+    unkeyed = 0
+    offset = None
+    while True:
+        records, offset = await client.scroll(
+            collection_name=collection,
+            limit=batch_size,
+            offset=offset,
+            with_payload=["post_id", "embedded_at", *metadata],
+            with_vectors=False,
+        )
+        for record in records:
+            scanned += 1
+            payload = record.payload or {}
+            post_id = payload.get("post_id")
+            if not post_id:
+                unkeyed += 1
+                continue
+            groups[str(post_id)].append((str(record.id), _freshness(payload, metadata)))
+        if offset is None:
+            break
+
+    rekeyed = 0
+    to_delete: List[str] = []
+    to_rekey: Dict[str, str] = {}
+    for post_id, points in groups.items():
+        canonical = point_id_for(post_id)
+        keep, _ = max(points, key=lambda point: (point[1], point[0] == canonical))
+        if keep != canonical:
+            # Upserting under the deterministic id overwrites a stale point there.
+            to_rekey[keep] = post_id
+        to_delete.extend(pid for pid, _ in points if pid != canonical)
+
+    if not dry_run:
+        legacy_ids = list(to_rekey)
+        for start in range(0, len(legacy_ids), batch_size):
+            records = await client.retrieve(
+                collection_name=collection,
+                ids=legacy_ids[start : start + batch_size],
+                with_payload=True,
+                with_vectors=True,
+            )
+            points = [
+                PointStruct(
+                    id=point_id_for(to_rekey[str(record.id)]),
+                    vector=record.vector,
+                    payload=record.payload or {},
+                )
+                for record in records
+            ]
+            if points:
+                await client.upsert(collection_name=collection, points=points)
+                rekeyed += len(points)
+        for start in range(0, len(to_delete), batch_size):
+            await client.delete(
+                collection_name=collection,
+                points_selector=PointIdsList(points=to_delete[start : start + batch_size]),
+            )
+
+    return {
+        "scanned": scanned,
+        "posts": len(groups),
+        "unkeyed": unkeyed,
+        "rekeyed": rekeyed if not dry_run else len(to_rekey),
+        "deleted": len(to_delete),
+        "dry_run": dry_run,
+    }
+
+
+def _freshness(payload: Dict, metadata: Dict[str, str]) -> Tuple[bool, str]:
+    """Sort key of a duplicate point: current embedding space first, then newest ``embedded_at``."""
+    current = all(payload.get(key) == value for key, value in metadata.items())
+    return current, str(payload.get("embedded_at") or "")
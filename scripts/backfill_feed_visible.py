@@ -0,0 +1,32 @@
+"""
+Re-derive ``feed_visible`` from ``source`` on every stored post. API startup
+already fills in posts that lack the flag; this also fixes flags written by
+raw updates that changed ``source`` without going through the model.
+
+Usage:
+    docker compose exec api python scripts/backfill_feed_visible.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.migrations import backfill_feed_visible
+from app.db.mongo import close_db, init_db
+
+
+async def main() -> None:
+    await init_db()
+    visible, hidden = await backfill_feed_visible(only_missing=False)
+    print(f"Marked {visible} posts visible and {hidden} hidden")
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""
+Populate the keyword index fields (search_tokens/title_tokens) on posts stored
+before ingest started generating them.
+
+Usage:
+    docker compose exec api python scripts/backfill_search_tokens.py [--all]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+from pymongo import UpdateOne
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.mongo import close_db, init_db
+from app.models.post import Post
+from app.services.keyword_index import index_fields
+
+BATCH_SIZE = 500
+
+
+async def main(rebuild_all: bool) -> None:
+    await init_db()
+    collection = Post.get_motor_collection()
+    query = {} if rebuild_all else {"search_tokens": {"$in": [None, []]}}
+    cursor = collection.find(query, {"title": 1, "summary": 1, "body": 1})
+    updated = 0
+    batch = []
+    async for document in cursor:
+        fields = index_fields(document.get("title", ""), document.get("summary"), document.get("body"))
+        batch.append(UpdateOne({"_id": document["_id"]}, {"$set": fields}))
+        if len(batch) >= BATCH_SIZE:
+            updated += (await collection.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        updated += (await collection.bulk_write(batch, ordered=False)).modified_count
+    print(f"Updated keyword tokens for {updated} posts")
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(rebuild_all="--all" in sys.argv[1:]))
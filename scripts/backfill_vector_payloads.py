@@ -0,0 +1,60 @@
+"""
+Copy list-view display fields (title, summary, dates, tags, ...) into the
+Qdrant payload of every stored post so `view=light` results skip Mongo.
+
+Points are addressed by their deterministic id (``point_id_for``), so run
+``scripts/compact_qdrant_vectors.py`` first to rewrite legacy random-id points.
+Posts without a point are skipped and counted; ``scripts/reconcile_vectors.py``
+embeds them.
+
+Usage:
+    docker compose exec api python scripts/backfill_vector_payloads.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.mongo import close_db, init_db
+from app.db.qdrant import close_qdrant_client
+from app.models.post import Post
+from app.services import vector_store
+
+
+BATCH_SIZE = 256
+
+
+async def _backfill(posts: List[Post]) -> Tuple[int, int]:
+    existing = await vector_store.existing_post_ids([str(post.id) for post in posts])
+    for post in posts:
+        if str(post.id) in existing:
+            await vector_store.set_notice_payload(str(post.id), vector_store.build_payload(post))
+    return len(existing), len(posts) - len(existing)
+
+
+async def main() -> None:
+    await init_db()
+    updated = missing = 0
+    batch: List[Post] = []
+    async for post in Post.find_all():
+        batch.append(post)
+        if len(batch) >= BATCH_SIZE:
+            done, skipped = await _backfill(batch)
+            updated, missing, batch = updated + done, missing + skipped, []
+    if batch:
+        done, skipped = await _backfill(batch)
+        updated, missing = updated + done, missing + skipped
+    print(f"Updated payloads for {updated} posts; skipped {missing} posts without a vector point")
+    await close_db()
+    await close_qdrant_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Sweep Qdrant's search-time HNSW ``ef`` against latency and recall@10.
+
+Builds a throwaway collection from the synthetic dummy-notice corpus (see
+bench_vector_quantization.py) using the configured HNSW settings, waits for
+the index to be built, then compares approximate searches with exact
+(full-scan) results. Requires a running Qdrant server.
+
+Usage:
+    python scripts/bench_hnsw_ef.py --docs 20000 --queries 200 --ef 16,32,64,128,256
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from qdrant_client.models import (
+    CollectionStatus,
+    Distance,
+    OptimizersConfigDiff,
+    PointStruct,
+    SearchParams,
+    VectorParams,
+)
+
+from app.core.config import get_settings
+from app.db.qdrant import close_qdrant_client, get_qdrant_client
+from app.ingest.sources.local_dummy_dataset import LocalDummyDatasetSource
+from app.services.context_packer import split_sentences
+from app.services.local_embedding import LocalEmbeddingEngine
+from app.services.vector_store import _hnsw_config
+from scripts.bench_vector_quantization import TOP_K, build_corpus
+
+COLLECTION = "bench_hnsw_ef"
+
+
+async def search_ids(client, queries, params: SearchParams) -> tuple[List[List[int]], float]:
+    started = time.perf_counter()
+    results = []
+    for query in queries:
+        hits = await client.search(
+            collection_name=COLLECTION,
+            query_vector=query.tolist(),
+            limit=TOP_K,
+            search_params=params,
+        )
+        results.append([hit.id for hit in hits])
+    return results, time.perf_counter() - started
+
+
+def recall(found: List[List[int]], truth: List[List[int]]) -> float:
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / max(sum(len(t) for t in truth), 1)
+
+
+async def main(args: argparse.Namespace) -> None:
+    notices = await LocalDummyDatasetSource(str(ROOT / "docs" / "dummy_notices")).fetch()
+    titles = [notice.title for notice in notices]
+    sentences = [s for notice in notices for s in split_sentences(notice.body) if len(s) > 10]
+    if not titles or not sentences:
+        print("No dummy notices found; run scripts/create_dummy_dataset.py first.")
+        return
+
+    engine = LocalEmbeddingEngine(dim=args.dim)
+    matrix = engine.embed_many(build_corpus(titles, sentences, args.docs, args.seed))
+    queries = engine.embed_many(build_corpus(titles, sentences, args.queries, args.seed + 1))
+
+    client = get_qdrant_client()
+    await client.recreate_collection(
+        collection_name=COLLECTION,
+        vectors_config=VectorParams(size=args.dim, distance=Distance.COSINE),
+        hnsw_config=_hnsw_config(),
+        # Index immediately so small corpora are not served by full scan.
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=0),
+    )
+    try:
+        for start in range(0, len(matrix), 512):
+            await client.upsert(
+                collection_name=COLLECTION,
+                points=[
+                    PointStruct(id=start + offset, vector=row.tolist())
+                    for offset, row in enumerate(matrix[start : start + 512])
+                ],
+                wait=True,
+            )
+        while (await client.get_collection(COLLECTION)).status != CollectionStatus.GREEN:
+            await asyncio.sleep(0.5)
+
+        hnsw = _hnsw_config()
+        print(f"corpus={args.docs} dim={args.dim} m={hnsw.m} ef_construct={hnsw.ef_construct}")
+        truth, exact_seconds = await search_ids(client, queries, SearchParams(exact=True))
+        print(f"{'ef':<12}{'recall@10':>11}{'ms/query':>10}")
+        print(f"{'exact':<12}{1.0:>11.3f}{exact_seconds * 1000 / args.queries:>10.3f}")
+        for ef in args.ef:
+            found, seconds = await search_ids(client, queries, SearchParams(hnsw_ef=ef))
+            print(f"{ef:<12}{recall(found, truth):>11.3f}{seconds * 1000 / args.queries:>10.3f}")
+    finally:
+        await client.delete_collection(COLLECTION)
+        await close_qdrant_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=get_settings().qdrant_vector_size)
+    parser.add_argument("--ef", type=lambda raw: [int(v) for v in raw.split(",")], default=[16, 32, 64, 128, 256])
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,136 @@
+"""
+Compare the old unanchored ``$regex`` keyword search with the n-gram token
+index on a synthetic corpus (default 100k posts built from the dummy notices).
+
+Writes into a throwaway collection in the configured Mongo database and drops
+it afterwards. Requires a running MongoDB.
+
+Usage:
+    python scripts/bench_keyword_search.py --docs 100000 --queries 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import get_settings
+from app.ingest.sources.local_dummy_dataset import LocalDummyDatasetSource
+from app.services.context_packer import split_sentences
+from app.services.keyword_index import TITLE_WEIGHT, index_fields, query_tokens
+
+COLLECTION = "bench_keyword_posts"
+PAGE_SIZE = 20
+
+
+def regex_filter(query: str) -> Dict[str, Any]:
+    regex = {"$regex": re.escape(query), "$options": "i"}
+    return {"$or": [{"title": regex}, {"summary": regex}, {"body": regex}]}
+
+
+def token_pipeline(query: str) -> List[Dict[str, Any]]:
+    tokens = query_tokens(query)
+    return [
+        {"$match": {"search_tokens": {"$in": tokens}}},
+        {
+            "$addFields": {
+                "_keyword_score": {
+                    "$add": [
+                        {"$size": {"$setIntersection": ["$search_tokens", tokens]}},
+                        {"$multiply": [TITLE_WEIGHT, {"$size": {"$setIntersection": ["$title_tokens", tokens]}}]},
+                    ]
+                }
+            }
+        },
+        {"$sort": {"_keyword_score": -1, "posted_at": -1}},
+        {"$limit": PAGE_SIZE},
+    ]
+
+
+async def timed_ms(coro) -> float:
+    started = time.perf_counter()
+    await coro
+    return (time.perf_counter() - started) * 1000
+
+
+async def main(args: argparse.Namespace) -> None:
+    notices = await LocalDummyDatasetSource(str(ROOT / "docs" / "dummy_notices")).fetch()
+    titles = [notice.title for notice in notices]
+    sentences = [s for notice in notices for s in split_sentences(notice.body) if len(s) > 10]
+    if not titles or not sentences:
+        print("No dummy notices found; run scripts/create_dummy_dataset.py first.")
+        return
+
+    settings = get_settings()
+    client = AsyncIOMotorClient(settings.mongo_url)
+    collection = client[settings.mongo_db][COLLECTION]
+    await collection.drop()
+    rng = random.Random(args.seed)
+    started = datetime(2024, 1, 1)
+    try:
+        batch = []
+        for index in range(args.docs):
+            title = rng.choice(titles)
+            body = " ".join(rng.sample(sentences, k=min(6, len(sentences))))
+            batch.append(
+                {
+                    "title": title,
+                    "summary": body[:120],
+                    "body": body,
+                    "posted_at": started + timedelta(minutes=index),
+                    **index_fields(title, body[:120], body),
+                }
+            )
+            if len(batch) >= 5000:
+                await collection.insert_many(batch)
+                batch = []
+        if batch:
+            await collection.insert_many(batch)
+        await collection.create_index("search_tokens")
+        print(f"corpus={args.docs} posts")
+
+        words = [word for title in titles for word in re.findall(r"[가-힣]{2,}", title)]
+        queries = [" ".join(rng.sample(words, k=min(2, len(words)))) for _ in range(args.queries)]
+
+        regex_ms: List[float] = []
+        token_ms: List[float] = []
+        for query in queries:
+            regex_ms.append(
+                await timed_ms(collection.find(regex_filter(query)).sort("posted_at", -1).limit(PAGE_SIZE).to_list(PAGE_SIZE))
+            )
+            token_ms.append(await timed_ms(collection.aggregate(token_pipeline(query)).to_list(PAGE_SIZE)))
+
+        regex_plan = await collection.find(regex_filter(queries[0])).explain()
+        token_plan = await collection.find({"search_tokens": {"$in": query_tokens(queries[0])}}).explain()
+
+        def examined(plan: Dict[str, Any]) -> Any:
+            return plan.get("executionStats", {}).get("totalDocsExamined", "n/a")
+
+        print(f"{'variant':<16}{'p50 ms':>10}{'max ms':>10}{'docs examined':>16}")
+        print(f"{'$regex':<16}{median(regex_ms):>10.1f}{max(regex_ms):>10.1f}{examined(regex_plan):>16}")
+        print(f"{'token index':<16}{median(token_ms):>10.1f}{max(token_ms):>10.1f}{examined(token_plan):>16}")
+    finally:
+        await collection.drop()
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main(parser.parse_args()))
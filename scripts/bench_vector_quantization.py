@@ -0,0 +1,141 @@
+"""
+Benchmark memory vs recall@10 for float32, float16 and int8 (scalar) vectors.
+
+The corpus is synthesised from the dummy notices in docs/dummy_notices and
+embedded with the local n-gram engine, so no LLM, Mongo or Qdrant is needed.
+int8 mirrors Qdrant's scalar quantization (quantile clipping, optional
+rescoring of an oversampled candidate list with the original float32 vectors).
+
+Usage:
+    python scripts/bench_vector_quantization.py --docs 20000 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import get_settings
+from app.ingest.sources.local_dummy_dataset import LocalDummyDatasetSource
+from app.services.context_packer import split_sentences
+from app.services.local_embedding import LocalEmbeddingEngine
+
+TOP_K = 10
+
+
+def build_corpus(titles: List[str], sentences: List[str], size: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        " ".join([rng.choice(titles), *rng.sample(sentences, k=min(3, len(sentences)))])
+        for _ in range(size)
+    ]
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    idx = np.argpartition(-scores, k, axis=1)[:, :k]
+    order = np.take_along_axis(scores, idx, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def quantize_int8(matrix: np.ndarray, quantile: float) -> Tuple[np.ndarray, float, float]:
+    low = float(np.quantile(matrix, 1 - quantile))
+    high = float(np.quantile(matrix, quantile))
+    scale = (high - low) / 255.0 or 1.0
+    codes = np.clip(np.round((matrix - low) / scale), 0, 255).astype(np.uint8)
+    return codes, low, scale
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+async def main(args: argparse.Namespace) -> None:
+    notices = await LocalDummyDatasetSource(str(ROOT / "docs" / "dummy_notices")).fetch()
+    titles = [notice.title for notice in notices]
+    sentences = [s for notice in notices for s in split_sentences(notice.body) if len(s) > 10]
+    if not titles or not sentences:
+        print("No dummy notices found; run scripts/create_dummy_dataset.py first.")
+        return
+
+    engine = LocalEmbeddingEngine(dim=args.dim)
+    corpus = build_corpus(titles, sentences, args.docs, args.seed)
+    matrix, embed_seconds = timed(lambda: engine.embed_many(corpus))
+    queries = engine.embed_many(build_corpus(titles, sentences, args.queries, args.seed + 1))
+    print(f"corpus={args.docs} dim={args.dim} embedded in {embed_seconds:.2f}s")
+
+    truth, base_seconds = timed(lambda: top_k(queries @ matrix.T, TOP_K))
+
+    half = matrix.astype(np.float16)
+    f16_found, f16_seconds = timed(lambda: top_k(queries @ half.T.astype(np.float32), TOP_K))
+
+    codes, low, scale = quantize_int8(matrix, args.quantile)
+
+    def int8_scores() -> np.ndarray:
+        # (low + scale * c) . q == low * sum(q) + scale * (c . q)
+        return low * queries.sum(axis=1, keepdims=True) + scale * (queries @ codes.T.astype(np.float32))
+
+    int8_found, int8_seconds = timed(lambda: top_k(int8_scores(), TOP_K))
+
+    def rescored() -> np.ndarray:
+        candidates = top_k(int8_scores(), int(TOP_K * args.oversampling))
+        exact = np.einsum("qd,qkd->qk", queries, matrix[candidates])
+        order = np.argsort(-exact, axis=1)[:, :TOP_K]
+        return np.take_along_axis(candidates, order, axis=1)
+
+    rescore_found, rescore_seconds = timed(rescored)
+
+    per_vector = {
+        "float32": args.dim * 4,
+        "float16": args.dim * 2,
+        "int8": args.dim,
+    }
+    rows = [
+        ("float32 (baseline)", per_vector["float32"], 0, 1.0, base_seconds),
+        ("float16", per_vector["float16"], 0, recall(f16_found, truth), f16_seconds),
+        ("int8", per_vector["int8"], 0, recall(int8_found, truth), int8_seconds),
+        (
+            f"int8 + rescore x{args.oversampling:g} (originals on disk)",
+            per_vector["int8"],
+            per_vector["float32"],
+            recall(rescore_found, truth),
+            rescore_seconds,
+        ),
+    ]
+    print(f"{'variant':<44}{'RAM MiB':>10}{'disk MiB':>10}{'recall@10':>11}{'ms/query':>10}")
+    for name, ram, disk, rec, seconds in rows:
+        print(
+            f"{name:<44}"
+            f"{ram * args.docs / 2**20:>10.1f}"
+            f"{disk * args.docs / 2**20:>10.1f}"
+            f"{rec:>11.3f}"
+            f"{seconds * 1000 / args.queries:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=get_settings().qdrant_vector_size)
+    parser.add_argument("--quantile", type=float, default=get_settings().qdrant_quantization_quantile)
+    parser.add_argument("--oversampling", type=float, default=get_settings().qdrant_search_oversampling)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,33 @@
+"""
+One-off compaction: collapse duplicate Qdrant points per post_id.
+
+Older ingests assigned a random id to every upsert, so re-runs left several
+points for the same post. This re-keys one point per post to its deterministic
+uuid5 id and deletes the rest.
+
+Usage:
+    docker compose exec api python scripts/compact_qdrant_vectors.py [--dry-run]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.qdrant import close_qdrant_client
+from app.services import vector_store
+
+
+async def main(dry_run: bool) -> None:
+    report = await vector_store.compact_duplicates(dry_run=dry_run)
+    print(f"Compaction {'(dry run) ' if dry_run else ''}completed: {report}")
+    await close_qdrant_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(dry_run="--dry-run" in sys.argv[1:]))
@@ -0,0 +1,45 @@
+"""
+Fit the IDF table used by the local n-gram embedding backend from stored posts.
+
+Usage:
+    docker compose exec api python scripts/fit_local_embedding_idf.py data/local_idf.npy
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import get_settings
+from app.db.mongo import close_db, init_db
+from app.models.post import Post
+from app.services.local_embedding import get_local_embedding_engine
+
+
+async def main(output_path: str) -> None:
+    await init_db()
+    posts = await Post.find_all().to_list()
+    documents = [f"{post.title}\n\n{post.body}" for post in posts]
+    engine = get_local_embedding_engine()
+    idf = engine.fit_idf(documents)
+
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, idf)
+    print(f"Fitted IDF over {len(documents)} posts -> {path}")
+    print(f"Set LOCAL_EMBEDDING_IDF_PATH={path} to use it.")
+    await close_db()
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else get_settings().local_embedding_idf_path
+    if not target:
+        target = "data/local_idf.npy"
+    asyncio.run(main(target))
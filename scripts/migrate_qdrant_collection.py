@@ -0,0 +1,35 @@
+"""
+Apply HNSW, optimizer, on-disk and quantization settings to the existing
+notices collection in place (no re-create, no re-embedding).
+
+Usage:
+    docker compose exec api python scripts/migrate_qdrant_collection.py [--dry-run]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.qdrant import close_qdrant_client
+from app.services import vector_store
+
+
+async def main(dry_run: bool) -> None:
+    report = await vector_store.migrate_collection(dry_run=dry_run)
+    if not report["changes"]:
+        print(f"Collection {report['collection']} already matches settings.")
+    for section, changes in report["changes"].items():
+        print(f"{section}: {changes}")
+    if report["applied"]:
+        print("Update sent; Qdrant re-optimizes affected segments in the background.")
+    await close_qdrant_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(dry_run="--dry-run" in sys.argv[1:]))
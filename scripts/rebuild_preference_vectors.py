@@ -0,0 +1,46 @@
+"""
+Rebuild every user's preference vector from their like interactions.
+
+Run once after enabling preference vectors, after the re-embed alias swap
+(preferences from the old embedding space are ignored until rebuilt), or
+whenever PREFERENCE_HALF_LIFE_DAYS changes.
+
+Usage:
+    docker compose exec api python scripts/rebuild_preference_vectors.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.mongo import close_db, init_db
+from app.db.qdrant import close_qdrant_client
+from app.models.user import User
+from app.services.preference_service import PreferenceService
+
+
+async def main() -> None:
+    await init_db()
+    service = PreferenceService()
+    rebuilt = 0
+    cleared = 0
+    async for user in User.find_all():
+        preference = await service.rebuild(user)
+        await user.save()
+        if preference is None:
+            cleared += 1
+        else:
+            rebuilt += 1
+    print(f"Rebuilt {rebuilt} preference vectors ({cleared} users without liked vectors)")
+    await close_db()
+    await close_qdrant_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
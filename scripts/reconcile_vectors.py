@@ -0,0 +1,33 @@
+"""
+Repair drift between Mongo posts and stored vectors: re-embed posts that have
+no vector and delete vectors whose post no longer exists.
+
+Usage:
+    docker compose exec api python scripts/reconcile_vectors.py [--dry-run]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.mongo import close_db, init_db
+from app.db.qdrant import close_qdrant_client
+from app.services.reconciler import VectorReconciler
+
+
+async def main(dry_run: bool) -> None:
+    await init_db()
+    report = await VectorReconciler().run(dry_run=dry_run)
+    print(f"Reconciliation {'(dry run) ' if dry_run else ''}completed: {report}")
+    await close_db()
+    await close_qdrant_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(dry_run="--dry-run" in sys.argv[1:]))
@@ -0,0 +1,46 @@
+"""
+Re-embed every post into a new versioned Qdrant collection and swap the
+notices alias over once it is complete. Safe to interrupt: re-running resumes
+from the last checkpointed post.
+
+Change LLM_EMBEDDING_MODEL / QDRANT_VECTOR_SIZE (or bump EMBEDDING_VERSION)
+before running; search keeps using the old collection until the swap.
+
+Usage:
+    docker compose exec api python scripts/reembed_posts.py [--no-swap] [--restart] [--target NAME]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db.mongo import close_db, init_db
+from app.db.qdrant import close_qdrant_client
+from app.services.reembed import ReembedJob
+
+
+async def main(args: argparse.Namespace) -> None:
+    await init_db()
+    job = ReembedJob(target=args.target, batch_size=args.batch_size, concurrency=args.concurrency)
+    print(f"Re-embedding posts into {job.target} (checkpoint: {job.checkpoint_path})")
+    report = await job.run(swap=not args.no_swap, restart=args.restart)
+    print(f"Re-embedding completed: {report}")
+    await close_db()
+    await close_qdrant_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default=None, help="Collection to build (default: derived from model/size/version)")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--no-swap", action="store_true", help="Build the collection but leave the alias alone")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    asyncio.run(main(parser.parse_args()))
@@ -18,6 +18,7 @@ if str(ROOT) not in sys.path:
 from beanie import PydanticObjectId
 
 from app.db.mongo import close_db, init_db
+from app.db.qdrant import close_qdrant_client
 from app.models.post import Post
 from app.services import vector_store
 from app.services.llm_service import LLMService
@@ -27,7 +28,7 @@ async def main(query: str) -> None:
     await init_db()
     llm = LLMService()
     vector = await llm.embed(query)
-    if not vector:
+    if vector is None:
         print("Failed to produce embedding; check LLM embedding configuration.")
         return
 
@@ -64,6 +65,7 @@ async def main(query: str) -> None:
             print("  (no Post document found)")
 
     await close_db()
+    await close_qdrant_client()
 
 
 if __name__ == "__main__":
@@ -20,6 +20,7 @@ if str(ROOT_DIR) not in sys.path:
 
 from app.db.mongo import close_db, init_db
 from app.models.post import Post
+from app.services.keyword_index import index_fields
 
 KST = timezone(timedelta(hours=9))
 
@@ -84,6 +85,7 @@ async def seed_posts() -> None:
             hash=hash_value,
             likes=0,
             source="seed_posts",
+            **index_fields(post["title"], post["summary"], post["body"]),
             **post,
         ).insert()
     await close_db()
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.core.cache import TTLCache, Uncached, VersionedCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_computation():
+    cache = VersionedCache(TTLCache(maxsize=8, ttl=60))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"items": [1]}
+
+    results = await asyncio.gather(*(cache.get_or_compute("q", 1, compute) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(result == {"items": [1]} for result in results)
+
+
+@pytest.mark.asyncio
+async def test_version_bump_bypasses_stale_entries():
+    cache = VersionedCache(TTLCache(maxsize=8, ttl=60))
+    values = iter(["old", "new"])
+
+    async def compute():
+        return next(values)
+
+    assert await cache.get_or_compute("q", 1, compute) == "old"
+    assert await cache.get_or_compute("q", 1, compute) == "old"
+    assert await cache.get_or_compute("q", 2, compute) == "new"
+
+
+@pytest.mark.asyncio
+async def test_uncached_results_are_returned_but_not_stored():
+    cache = VersionedCache(TTLCache(maxsize=8, ttl=60))
+    values = iter([Uncached("degraded"), "fresh"])
+
+    async def compute():
+        return next(values)
+
+    assert await cache.get_or_compute("q", 1, compute) == "degraded"
+    assert await cache.get_or_compute("q", 1, compute) == "fresh"
+    assert await cache.get_or_compute("q", 1, compute) == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_first_caller_does_not_cancel_waiters():
+    cache = VersionedCache(TTLCache(maxsize=8, ttl=60))
+    release = asyncio.Event()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await release.wait()
+        return "value"
+
+    leader = asyncio.create_task(cache.get_or_compute("q", 1, compute))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_compute("q", 1, compute))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await waiter == "value"
+    assert leader.cancelled()
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_read_failure_falls_back_to_compute():
+    class BrokenShared:
+        async def get(self, key):
+            raise ConnectionError("mongo down")
+
+        async def set(self, key, value):
+            raise ConnectionError("mongo down")
+
+    cache = VersionedCache(TTLCache(maxsize=8, ttl=60), shared=BrokenShared())
+
+    async def compute():
+        return "computed"
+
+    assert await cache.get_or_compute("q", 1, compute) == "computed"
+    assert cache.local.get((1, "q")) == "computed"
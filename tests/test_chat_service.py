@@ -123,3 +123,22 @@ async def test_chat_verification_failure(monkeypatch):
         response["answer"]
         == service._refusal_message_for_reason("verification_failed", "행사 알려줘")
     )
+
+
+@pytest.mark.asyncio
+async def test_semantic_candidates_skip_vectors_when_embedding_fails(monkeypatch):
+    from app.clients.llm import LLMRequestError
+    from app.services import chat_service
+
+    service = ChatService()
+
+    async def failing_embed(text):
+        raise LLMRequestError("embedding endpoint down")
+
+    async def unexpected_search(*args, **kwargs):
+        raise AssertionError("a fallback vector must not be searched")
+
+    monkeypatch.setattr(service.llm_service, "embed_strict", failing_embed)
+    monkeypatch.setattr(chat_service.vector_store, "search_similar", unexpected_search)
+
+    assert await service._semantic_candidates("장학금 언제 신청하나요?") == []
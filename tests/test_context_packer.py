@@ -0,0 +1,43 @@
+from app.services.context_packer import ContextPacker, estimate_tokens
+
+
+def _context(post_id, title, summary, body):
+    return {
+        "post_id": post_id,
+        "title": title,
+        "summary": summary,
+        "body": body,
+        "department": None,
+        "audience_grade": [],
+    }
+
+
+def test_packer_picks_query_relevant_sentences():
+    packer = ContextPacker(token_budget=400, max_sentences=1)
+    body = (
+        "본 공지는 학생지원팀에서 안내합니다. "
+        "장학금 신청 마감은 3월 10일입니다. "
+        "문의는 학과 사무실로 해주세요."
+    )
+    packed, used = packer.pack("장학금 마감 언제야?", [_context("a", "공지", "", body)])
+
+    assert packed[0]["body_snippet"] == "장학금 신청 마감은 3월 10일입니다."
+    assert "body" not in packed[0]
+    assert used <= 400
+
+
+def test_packer_dedupes_repeated_text_and_respects_budget():
+    shared = "2025학년도 1학기 국가장학금 신청 기간은 2월 20일부터 3월 10일까지입니다."
+    contexts = [
+        _context("a", "국가장학금 안내", shared, shared + " 서류는 온라인으로 제출합니다."),
+        _context("b", "국가장학금 재안내", shared, shared),
+        _context("c", "기숙사 안내", "기숙사 입사 신청 안내", "기숙사 입사 신청은 다음 주까지입니다. " * 40),
+    ]
+    packer = ContextPacker(token_budget=200)
+    packed, used = packer.pack("국가장학금 신청 기간", contexts)
+
+    assert shared not in packed[0]["body_snippet"]
+    assert packed[1]["summary"] == ""
+    assert packed[1]["body_snippet"] == ""
+    assert used <= 200
+    assert estimate_tokens("장학금") == 3
@@ -0,0 +1,88 @@
+import pytest
+
+from app.core.cache import TTLCache, VersionedCache
+from app.db.corpus_version import CorpusVersion
+from app.models.post import Post
+from app.services import keyword_index
+from app.services.facet_service import FacetService, facet_pipeline
+from app.services.keyword_index import keyword_match
+
+
+class _Cursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class _Collection:
+    def __init__(self):
+        self.pipelines = []
+
+    async def count_documents(self, query):
+        return 0
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return _Cursor(
+            [
+                {
+                    "category": [{"_id": "장학", "count": 3}],
+                    "department": [],
+                    "audience_grade": [{"_id": "3", "count": 2}],
+                    "source": [{"_id": "snu", "count": 3}],
+                    "total": [{"value": 3}],
+                }
+            ]
+        )
+
+
+def test_facet_pipeline_unwinds_array_fields_once_per_facet():
+    pipeline = facet_pipeline({"category": "장학"})
+
+    assert pipeline[0] == {"$match": {"category": "장학"}}
+    facets = pipeline[1]["$facet"]
+    assert facets["audience_grade"][0] == {"$unwind": "$audience_grade"}
+    assert facets["department"][0]["$group"] == {"_id": "$department", "count": {"$sum": 1}}
+    assert facets["total"] == [{"$count": "value"}]
+
+
+@pytest.mark.asyncio
+async def test_facets_are_cached_per_corpus_version(monkeypatch):
+    collection = _Collection()
+    monkeypatch.setattr(Post, "get_motor_collection", classmethod(lambda cls: collection))
+    monkeypatch.setattr(keyword_index, "_token_frequencies", keyword_index.TTLCache(maxsize=64, ttl=60))
+    version = CorpusVersion(refresh_seconds=0)
+    service = FacetService(cache=VersionedCache(TTLCache(maxsize=8, ttl=60)), corpus_version=version)
+
+    first = await service.facets(query="장학금 신청", grade="3")
+    await service.facets(query="장학금  신청", grade="3")
+    unfiltered = await service.facets(scope="feed")
+    await version.bump()
+    await service.facets(query="장학금 신청", grade="3")
+
+    assert first["facets"]["category"] == [{"value": "장학", "count": 3}]
+    assert first["meta"]["total"] == 3
+    assert first["meta"]["precomputed"] is False
+    assert unfiltered["meta"]["precomputed"] is True
+    assert len(collection.pipelines) == 3
+    match = collection.pipelines[0][0]["$match"]
+    assert match["audience_grade"] == "3"
+    # Facets count the same candidates keyword search ranks, cap included.
+    assert match == (await keyword_match("장학금 신청", {"audience_grade": "3"})).match
+    assert collection.pipelines[0][1:3] == [{"$sort": {"posted_at": -1, "_id": -1}}, {"$limit": 1000}]
+    assert collection.pipelines[1][0]["$match"] == {"feed_visible": True}
+
+
+@pytest.mark.asyncio
+async def test_single_character_facets_use_the_prefix_match(monkeypatch):
+    collection = _Collection()
+    monkeypatch.setattr(Post, "get_motor_collection", classmethod(lambda cls: collection))
+    version = CorpusVersion(refresh_seconds=0)
+    service = FacetService(cache=VersionedCache(TTLCache(maxsize=8, ttl=60)), corpus_version=version)
+
+    await service.facets(query="꿈")
+
+    match = collection.pipelines[0][0]["$match"]
+    assert match["search_tokens"] == {"$elemMatch": {"$gte": "꿈", "$lt": chr(ord("꿈") + 1)}}
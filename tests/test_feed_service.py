@@ -1,7 +1,14 @@
+import json
 from datetime import datetime, timedelta
 
-from app.models.post import Post
-from app.services.feed_service import FeedService
+import pytest
+from bson import ObjectId
+
+from app.db.corpus_version import CorpusVersion
+from app.db.pagination import Page
+from app.models.post import Post, PostListView
+from app.services import feed_service
+from app.services.feed_service import FeedPageCache, FeedService
 
 
 def _make_post(**overrides):
@@ -47,3 +54,77 @@ def test_deadline_boost_favors_urgent_notice():
     relaxed_boost = service._deadline_boost(relaxed)
 
     assert urgent_boost > relaxed_boost
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_use_keyset_match(monkeypatch):
+    posts = [
+        PostListView(_id=ObjectId(), title=f"공지 {index}", posted_at=datetime(2024, 3, 10 - index))
+        for index in range(3)
+    ]
+    calls = []
+
+    async def fake_paginate(document_model, match, sort, skip, limit, **kwargs):
+        calls.append((match, skip, limit, kwargs.get("with_total", True)))
+        if "$or" in match:
+            return Page(items=posts[1:3], total=None, total_is_estimate=True)
+        return Page(items=posts[:1], total=3)
+
+    monkeypatch.setattr(feed_service, "paginate", fake_paginate)
+    service = FeedService()
+
+    first = await service.get_feed(category="장학", page=1, page_size=1)
+    second = await service.get_feed(
+        category="장학", page=1, page_size=1, cursor=first["meta"]["next_cursor"]
+    )
+
+    match, skip, limit, with_total = calls[1]
+    assert (skip, limit, with_total) == (0, 2, False)
+    assert match["$or"][1] == {"posted_at": posts[0].posted_at, "_id": {"$lt": posts[0].id}}
+    assert [item["title"] for item in second["items"]] == ["공지 1"]
+    assert second["meta"]["next_cursor"] is not None
+    with pytest.raises(ValueError):
+        await service.get_feed(category=None, page=1, page_size=1, cursor=first["meta"]["next_cursor"])
+
+
+@pytest.mark.asyncio
+async def test_feed_pages_are_cached_as_bytes_with_version_etags(monkeypatch):
+    renders = []
+
+    async def fake_get_feed(category, page, page_size, cursor=None):
+        renders.append((category, page, page_size))
+        return {"items": [{"id": "1", "title": "장학금"}], "meta": {"page": page}}
+
+    version = CorpusVersion(refresh_seconds=0)
+    page_cache = FeedPageCache(maxsize=8, ttl=60)
+    service = FeedService(page_cache=page_cache, corpus_version=version)
+    monkeypatch.setattr(service, "get_feed", fake_get_feed)
+
+    etag, body = await service.get_feed_page("장학", 1, 20)
+    again_etag, again = await service.get_feed_page("장학", 1, 20)
+    not_modified = await service.get_feed_page("장학", 1, 20, if_none_match=etag.removeprefix("W/"))
+
+    assert json.loads(body)["items"][0]["title"] == "장학금"
+    assert (again_etag, again) == (etag, body)
+    assert not_modified == (etag, None)
+    assert len(renders) == 1
+
+    await version.bump()
+    bumped_etag, _ = await service.get_feed_page("장학", 1, 20, if_none_match=etag)
+
+    # Another worker at the same version derives the same ETag.
+    other = FeedService(page_cache=FeedPageCache(maxsize=8, ttl=60), corpus_version=version)
+    assert await other.get_feed_page("장학", 1, 20, if_none_match=bumped_etag) == (bumped_etag, None)
+    assert bumped_etag != etag
+    assert len(renders) == 2
+
+
+def test_feed_visible_is_derived_from_source_on_write():
+    visible = _make_post(source="snu-cse")
+    hidden = _make_post(source="seed_posts", feed_visible=True)
+
+    visible.sync_feed_visible()
+    hidden.sync_feed_visible()
+
+    assert visible.feed_visible is True
+    assert hidden.feed_visible is False
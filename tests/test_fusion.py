@@ -0,0 +1,23 @@
+import pytest
+
+from app.services.fusion import reciprocal_rank_fusion
+
+
+def test_rrf_dedupes_and_rewards_agreement():
+    fused = reciprocal_rank_fusion(
+        {
+            "semantic": [("a", 0.9, "A"), ("b", 0.8, "B")],
+            "keyword": [("b", 0.5, "B"), ("c", 0.4, "C")],
+        },
+        k=60,
+    )
+
+    assert [entry["key"] for entry in fused] == ["b", "a", "c"]
+    assert fused[0]["signals"] == {"semantic": {"rank": 2, "score": 0.8}, "keyword": {"rank": 1, "score": 0.5}}
+    assert fused[1]["score"] == pytest.approx((1 / 61) / (2 / 61))
+
+
+def test_rrf_weights_shift_the_ranking():
+    rankings = {"semantic": [("a", None, "A")], "keyword": [("c", None, "C")]}
+    fused = reciprocal_rank_fusion(rankings, weights={"semantic": 0.5, "keyword": 2.0})
+    assert [entry["key"] for entry in fused] == ["c", "a"]
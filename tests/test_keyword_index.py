@@ -0,0 +1,97 @@
+import pytest
+from bson import ObjectId
+
+from app.core.config import get_settings
+from app.models.post import Post
+from app.services import keyword_index
+from app.services.keyword_index import index_fields, keyword_search, query_tokens, tokenize
+
+
+def test_tokenize_adds_hangul_bigrams_and_drops_regex_syntax():
+    assert tokenize("장학금신청 (TOEIC) .*+") == ["장학금신청", "장학", "학금", "금신", "신청", "toeic"]
+
+
+def test_compound_word_matches_partial_query():
+    fields = index_fields("2025학년도 장학금신청 안내", None, "온라인으로 제출")
+    assert set(query_tokens("장학금 신청")) & set(fields["search_tokens"]) >= {"장학", "학금", "신청"}
+    assert "장학" in fields["title_tokens"]
+    assert "온라" not in fields["title_tokens"]
+
+
+class _Cursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class _Collection:
+    def __init__(self, documents, frequencies=None):
+        self.documents = documents
+        self.frequencies = frequencies or {}
+        self.pipelines = []
+
+    async def count_documents(self, query):
+        return self.frequencies.get(query["search_tokens"], 0)
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return _Cursor([{"items": self.documents, "total": [{"value": len(self.documents)}]}])
+
+
+@pytest.fixture
+def posts(monkeypatch):
+    document = {
+        "_id": ObjectId(),
+        "title": "꿈나무 장학금",
+        "url": "https://example.com/1",
+        "body": "본문",
+        "hash": "h1",
+        "_keyword_score": 3,
+    }
+    collection = _Collection([document])
+    monkeypatch.setattr(Post, "get_motor_collection", classmethod(lambda cls: collection))
+    monkeypatch.setattr(Post, "get_collection_name", classmethod(lambda cls: "posts"))
+    monkeypatch.setattr(keyword_index, "_token_frequencies", keyword_index.TTLCache(maxsize=64, ttl=60))
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_candidates_are_capped_and_scored_as_stubs(posts, monkeypatch):
+    monkeypatch.setattr(get_settings(), "keyword_candidate_limit", 50)
+
+    page = await keyword_search("장학금 신청", {"category": "장학"}, limit=10, list_view=True)
+
+    pipeline = posts.pipelines[0]
+    assert pipeline[0]["$match"]["search_tokens"] == {"$in": query_tokens("장학금 신청")}
+    assert pipeline[1:3] == [{"$sort": {"posted_at": -1, "_id": -1}}, {"$limit": 50}]
+    assert set(pipeline[3]["$project"]) == {"posted_at", "_keyword_score"}
+    items = pipeline[-1]["$facet"]["items"]
+    assert [next(iter(stage)) for stage in items] == ["$skip", "$limit", "$lookup", "$match", "$replaceRoot", "$project"]
+    assert page.total == 1
+    assert page.total_is_estimate is False
+    assert page.items[0][0].title == "꿈나무 장학금"
+
+
+@pytest.mark.asyncio
+async def test_single_character_query_matches_token_prefixes(posts):
+    page = await keyword_search("꿈", {})
+
+    match = posts.pipelines[0][0]["$match"]
+    assert match["search_tokens"] == {"$elemMatch": {"$gte": "꿈", "$lt": chr(ord("꿈") + 1)}}
+    assert page.items[0][1] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_candidates_come_from_the_rarest_tokens(posts, monkeypatch):
+    monkeypatch.setattr(get_settings(), "keyword_candidate_limit", 100)
+    posts.frequencies = {"장학": 40, "학금": 30, "신청": 5000, "toeic": 3}
+
+    page = await keyword_search("장학금 신청 TOEIC", {})
+
+    pipeline = posts.pipelines[0]
+    # "신청" is too common to widen the candidate set but still counts in the score.
+    assert pipeline[0]["$match"]["search_tokens"] == {"$in": ["장학금", "toeic", "학금", "장학"]}
+    assert "신청" in pipeline[3]["$project"]["_keyword_score"]["$add"][0]["$size"]["$setIntersection"][1]
+    assert page.total_is_estimate is True
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from app.clients.endpoints import Endpoint, EndpointPool
+from app.clients.llm import LLMClient, LLMRequestError
+
+
+def _client_with_pool(pool: EndpointPool) -> LLMClient:
+    client = LLMClient()
+    client.chat_pool = pool
+    client.chat_enabled = True
+    return client
+
+
+@pytest.mark.asyncio
+async def test_failover_to_next_endpoint(monkeypatch):
+    pool = EndpointPool("chat", [Endpoint("https://a", "k"), Endpoint("https://b", "k")])
+    client = _client_with_pool(pool)
+    calls = []
+
+    async def fake_send(self, pool, target, endpoint, timeout, payload):
+        calls.append(target.base)
+        if target.base == "https://a":
+            pool.record_failure(target)
+            raise LLMRequestError("boom")
+        pool.record_success(target, 0.01)
+        return {"choices": [{"message": {"content": "ok"}}]}
+
+    monkeypatch.setattr(LLMClient, "_send", fake_send)
+    monkeypatch.setattr(pool, "ordered", lambda: list(pool.endpoints))
+
+    assert await client.chat_completion([{"role": "user", "content": "hi"}]) == "ok"
+    assert calls == ["https://a", "https://b"]
+    assert pool.endpoints[0].failures == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_takes_faster_endpoint(monkeypatch):
+    slow, fast = Endpoint("https://slow", "k"), Endpoint("https://fast", "k")
+    for _ in range(20):
+        slow.latency.observe(0.01)
+    pool = EndpointPool("chat", [slow, fast], hedge_enabled=True, hedge_min_delay=0.01)
+    client = _client_with_pool(pool)
+
+    async def fake_send(self, pool, target, endpoint, timeout, payload):
+        await asyncio.sleep(1.0 if target is slow else 0.0)
+        return {"choices": [{"message": {"content": target.base}}]}
+
+    monkeypatch.setattr(LLMClient, "_send", fake_send)
+    monkeypatch.setattr(pool, "ordered", lambda: [slow, fast])
+
+    assert await client.chat_completion([{"role": "user", "content": "hi"}]) == "https://fast"
+    assert pool.hedged_requests == 1
+    assert pool.hedge_wins == 1
+    # The cut-short primary still counts, at least as long as it ran.
+    assert slow.latency.total == 21
+    assert slow.latency.quantile(1.0) >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_hedge_skips_endpoints_cooling_down(monkeypatch):
+    primary, cooling, healthy = Endpoint("https://a", "k"), Endpoint("https://b", "k"), Endpoint("https://c", "k")
+    for _ in range(20):
+        primary.latency.observe(0.01)
+    pool = EndpointPool("chat", [primary, cooling, healthy], hedge_enabled=True, hedge_min_delay=0.01)
+    cooling.cooldown_until = float("inf")
+    client = _client_with_pool(pool)
+    calls = []
+
+    async def fake_send(self, pool, target, endpoint, timeout, payload):
+        calls.append(target.base)
+        await asyncio.sleep(1.0 if target is primary else 0.0)
+        return {"choices": [{"message": {"content": target.base}}]}
+
+    monkeypatch.setattr(LLMClient, "_send", fake_send)
+    monkeypatch.setattr(pool, "ordered", lambda: [primary, cooling, healthy])
+
+    assert await client.chat_completion([{"role": "user", "content": "hi"}]) == "https://c"
+    assert calls == ["https://a", "https://c"]
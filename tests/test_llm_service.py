@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from app.core.config import get_settings
@@ -29,3 +30,17 @@ async def test_llm_classification_fallback():
     service.client.summary_enabled = False
     category = await service.classify_category("장학금 신청 안내")
     assert category in get_settings().llm_categories
+
+
+@pytest.mark.asyncio
+async def test_local_embedding_keeps_similar_notices_close():
+    service = LLMService()
+    service.client.embedding_enabled = False
+    query = await service.embed("장학금 신청 기간 안내")
+    similar = await service.embed("2025학년도 장학금 신청 안내")
+    unrelated = await service.embed("연구실 학부연구생 모집")
+
+    assert np.isclose(np.linalg.norm(query), 1.0, atol=1e-5)
+    assert float(query @ similar) > float(query @ unrelated)
+    assert query.dtype == np.float32
+    assert np.array_equal(await service.embed("장학금 신청 기간 안내"), query)
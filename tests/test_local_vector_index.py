@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.services.local_vector_index import LocalVectorIndex
+from app.services.vector_store import VectorFilter
+
+
+def _unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_search_ranks_by_cosine_and_applies_filters(tmp_path):
+    index = LocalVectorIndex(tmp_path, dim=3, initial_capacity=1)
+    index.upsert("a", _unit(1, 0, 0), {"department": "CSE", "audience_grade": ["3"], "posted_at": "2025-03-01T00:00:00+09:00"})
+    index.upsert("b", _unit(1, 1, 0), {"department": "EE", "audience_grade": ["1"], "posted_at": "2024-03-01T00:00:00"})
+    index.upsert("c", _unit(0, 0, 1), {"department": "CSE", "audience_grade": ["3"]})
+
+    assert [hit["post_id"] for hit in index.search(_unit(1, 0, 0), limit=2)] == ["a", "b"]
+    assert [hit["post_id"] for hit in index.search(_unit(1, 0, 0), limit=2, offset=1)] == ["b", "c"]
+    filtered = index.search(_unit(1, 1, 0), limit=5, search_filter=VectorFilter(department="CSE", audience_grade="3"))
+    assert [hit["post_id"] for hit in filtered] == ["a", "c"]
+    dated = VectorFilter(posted_to=datetime(2024, 12, 31, tzinfo=timezone.utc))
+    assert index.count(dated) == 1
+
+
+def test_upsert_replaces_and_readers_see_appends(tmp_path):
+    writer = LocalVectorIndex(tmp_path, dim=3, initial_capacity=1)
+    reader = LocalVectorIndex(tmp_path, dim=3, read_only=True)
+
+    writer.upsert("a", _unit(1, 0, 0), {"title": "old"})
+    writer.upsert("a", _unit(0, 1, 0), {"title": "new"})
+    writer.upsert("b", _unit(0, 0, 1), {"title": "other"})
+    writer.delete(["b"])
+
+    hits = reader.search(_unit(0, 1, 0), limit=5)
+    assert [(hit["post_id"], hit["payload"]["title"]) for hit in hits] == [("a", "new")]
+    assert len(reader) == 1
+    assert reader.existing(["a", "b", "z"]) == {"a"}
+    assert list(reader.get_vectors(["a", "b"])) == ["a"]
+    assert reader.get_vectors(["a"])["a"] == pytest.approx(_unit(0, 1, 0))
+
+
+def test_compact_drops_deleted_rows_and_readers_reload(tmp_path):
+    writer = LocalVectorIndex(tmp_path, dim=3, initial_capacity=2)
+    reader = LocalVectorIndex(tmp_path, dim=3, read_only=True)
+    writer.upsert_many(
+        [
+            ("a", _unit(1, 0, 0), {"audience_grade": ["1"]}),
+            ("b", _unit(0, 1, 0), {"audience_grade": ["2"]}),
+            ("c", _unit(0, 0, 1), {"audience_grade": ["2", "3"]}),
+        ]
+    )
+    writer.delete(["a", "b"])
+    assert [hit["post_id"] for hit in reader.search(_unit(0, 0, 1), limit=5)] == ["c"]
+
+    assert writer.compact() == 2
+    writer.upsert("d", _unit(0, 1, 1), {"audience_grade": ["3"]})
+
+    grade_three = reader.search(_unit(0, 0, 1), limit=5, search_filter=VectorFilter(audience_grade="3"))
+    assert [hit["post_id"] for hit in grade_three] == ["c", "d"]
+    assert reader.count(VectorFilter(audience_grade="1")) == 0
+    assert reader.count(VectorFilter(audience_grade="4")) == 0
+    assert reader.get_vector("d") == pytest.approx(_unit(0, 1, 1))
+    assert len(reader._post_ids) == 2
@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import migrations
+from app.db.corpus_version import CorpusVersion
+from app.models.post import Post
+
+
+class _Collection:
+    def __init__(self, modified):
+        self.modified = list(modified)
+        self.updates = []
+
+    async def update_many(self, selector, update):
+        self.updates.append((selector, update))
+        return SimpleNamespace(modified_count=self.modified.pop(0))
+
+
+@pytest.mark.asyncio
+async def test_backfill_feed_visible_only_touches_missing_flags_and_bumps_version(monkeypatch):
+    collection = _Collection([3, 1])
+    version = CorpusVersion(refresh_seconds=0)
+    monkeypatch.setattr(Post, "get_motor_collection", classmethod(lambda cls: collection))
+    monkeypatch.setattr(migrations, "get_corpus_version", lambda: version)
+
+    assert await migrations.backfill_feed_visible() == (3, 1)
+
+    (shown, set_shown), (hidden, set_hidden) = collection.updates
+    assert shown["feed_visible"] == {"$exists": False} and "$nin" in shown["source"]
+    assert set_shown == {"$set": {"feed_visible": True}}
+    assert "$in" in hidden["source"] and set_hidden == {"$set": {"feed_visible": False}}
+    assert await version.current() == 1
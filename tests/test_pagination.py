@@ -0,0 +1,75 @@
+import pytest
+
+from app.core.cache import TTLCache
+from app.db.pagination import paginate
+
+
+class _Cursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class _Collection:
+    def __init__(self, documents):
+        self.documents = documents
+        self.pipelines = []
+
+        self.counts = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        if "$facet" in pipeline[-1]:
+            return _Cursor([{"items": self.documents[:2], "total": [{"value": len(self.documents)}]}])
+        return _Cursor(self.documents[:2])
+
+    async def count_documents(self, match):
+        self.counts.append(match)
+        return len(self.documents)
+
+
+class _Model:
+    collection = _Collection([{"_id": index} for index in range(5)])
+
+    @classmethod
+    def get_motor_collection(cls):
+        return cls.collection
+
+    @classmethod
+    def get_collection_name(cls):
+        return "models"
+
+    @classmethod
+    def model_validate(cls, document):
+        return document["_id"]
+
+
+@pytest.mark.asyncio
+async def test_paginate_counts_on_the_side_then_uses_cached_count():
+    _Model.collection = _Collection([{"_id": index} for index in range(5)])
+    cache = TTLCache(maxsize=4, ttl=60)
+
+    first = await paginate(_Model, {"a": 1}, {"_id": 1}, 0, 2, count_cache=cache)
+    second = await paginate(_Model, {"a": 1}, {"_id": 1}, 2, 2, count_cache=cache)
+
+    assert (first.items, first.total, first.total_is_estimate) == ([0, 1], 5, False)
+    assert (second.total, second.total_is_estimate) == (5, True)
+    assert _Model.collection.counts == [{"a": 1}]
+    assert _Model.collection.pipelines == [
+        [{"$match": {"a": 1}}, {"$sort": {"_id": 1}}, {"$skip": 0}, {"$limit": 2}],
+        [{"$match": {"a": 1}}, {"$sort": {"_id": 1}}, {"$skip": 2}, {"$limit": 2}],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_small_sets_use_one_facet_over_projected_documents():
+    _Model.collection = _Collection([{"_id": index} for index in range(5)])
+
+    page = await paginate(_Model, {"a": 1}, {"_id": 1}, 0, 2, projection={"title": 1})
+
+    assert (page.items, page.total) == ([0, 1], 5)
+    (pipeline,) = _Model.collection.pipelines
+    assert pipeline[:3] == [{"$match": {"a": 1}}, {"$sort": {"_id": 1}}, {"$project": {"title": 1}}]
+    assert pipeline[3]["$facet"]["items"] == [{"$skip": 0}, {"$limit": 2}]
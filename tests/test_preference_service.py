@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from pymongo.errors import DuplicateKeyError
+from qdrant_client import AsyncQdrantClient
+
+import app.db.qdrant as qdrant_db
+from app.core.config import get_settings
+from app.services import preference_service, vector_store
+from app.services.preference_service import PreferenceService, PreferenceVector
+
+
+@pytest.fixture
+async def memory_qdrant(monkeypatch):
+    client = AsyncQdrantClient(location=":memory:")
+    monkeypatch.setattr(qdrant_db, "client", client)
+    monkeypatch.setattr(vector_store, "_collection_initialized", False)
+    monkeypatch.setattr(preference_service, "_collection_initialized", False)
+    yield client
+    await client.close()
+
+
+def test_running_mean_decays_and_unlike_reverts():
+    now = datetime(2025, 3, 1)
+    a = np.array([1.0, 0.0], dtype=np.float32)
+    b = np.array([0.0, 1.0], dtype=np.float32)
+    preference = PreferenceVector.empty(2, now - timedelta(days=30))
+    preference.add(a, now - timedelta(days=30), half_life_days=30)
+    preference.add(b, now, half_life_days=30)
+
+    # The month-old like counts half as much as today's.
+    assert preference.weight == pytest.approx(1.5)
+    assert preference.vector == pytest.approx([1 / 3, 2 / 3])
+
+    preference.remove(b, liked_at=now, now=now, half_life_days=30)
+    assert preference.vector == pytest.approx([1.0, 0.0])
+    preference.remove(a, liked_at=now - timedelta(days=30), now=now, half_life_days=30)
+    assert preference.is_empty
+
+
+class FakeStateCollection:
+    """Just enough of a Motor collection for the compare-and-set writes."""
+
+    def __init__(self):
+        self.documents = {}
+
+    async def find_one(self, query, projection=None):
+        await asyncio.sleep(0)  # let concurrent updates interleave
+        document = self.documents.get(query["_id"])
+        return dict(document) if document is not None else None
+
+    async def insert_one(self, document):
+        await asyncio.sleep(0)
+        if document["_id"] in self.documents:
+            raise DuplicateKeyError("duplicate _id")
+        self.documents[document["_id"]] = dict(document)
+
+    async def update_one(self, query, update):
+        await asyncio.sleep(0)
+        document = self.documents.get(query["_id"])
+        if document is None or document["version"] != query["version"]:
+            return SimpleNamespace(matched_count=0)
+        document.update(update["$set"])
+        return SimpleNamespace(matched_count=1)
+
+
+@pytest.fixture
+def state_collection(monkeypatch):
+    collection = FakeStateCollection()
+    monkeypatch.setattr(preference_service, "_state_collection", lambda: collection)
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_concurrent_likes_are_folded_in_incrementally(memory_qdrant, state_collection):
+    dim = get_settings().qdrant_vector_size
+    first, second = "507f1f77bcf86cd799439011", "507f1f77bcf86cd799439012"
+    await vector_store.upsert_notice_vector(first, np.eye(dim, dtype=np.float32)[0], {"title": "a"})
+    await vector_store.upsert_notice_vector(second, np.eye(dim, dtype=np.float32)[1], {"title": "b"})
+    user = SimpleNamespace(id="u1", preference_vector_id=None)
+    service = PreferenceService()
+    now = datetime.utcnow()
+
+    # Two likes landing at once both end up in the stored mean: the loser of
+    # the compare-and-set re-reads the state and applies its like on top.
+    await asyncio.gather(service.add_like(user, first, now), service.add_like(user, second, now))
+    assert state_collection.documents["u1"]["version"] == 2
+    assert user.preference_vector_id == preference_service.preference_point_id("u1")
+    stored = await service.get("u1")
+    assert stored.weight == pytest.approx(2.0, rel=1e-3)
+    assert stored.vector[:2] == pytest.approx([0.5, 0.5], rel=1e-3)
+
+    await service.remove_like(user, second, now)
+    assert (await service.get("u1")).vector[:2] == pytest.approx([1.0, 0.0], abs=1e-3)
+    await service.remove_like(user, first, now)
+    assert await service.get("u1") is None
+    assert user.preference_vector_id is None
+
+
+@pytest.mark.asyncio
+async def test_preferences_from_another_embedding_version_are_rebuilt(memory_qdrant, state_collection, monkeypatch):
+    dim = get_settings().qdrant_vector_size
+    first, second = "507f1f77bcf86cd799439011", "507f1f77bcf86cd799439012"
+    await vector_store.upsert_notice_vector(first, np.eye(dim, dtype=np.float32)[0], {"title": "a"})
+    user = SimpleNamespace(id="u2", preference_vector_id=None)
+    service = PreferenceService()
+    now = datetime.utcnow()
+    await service.add_like(user, first, now)
+    assert await service.get("u2") is not None
+
+    monkeypatch.setattr(get_settings(), "embedding_version", "2")
+    assert await service.get("u2") is None
+
+    # The next like recomputes from the stored likes instead of mixing spaces.
+    await vector_store.upsert_notice_vector(second, np.eye(dim, dtype=np.float32)[1], {"title": "b"})
+
+    async def load_likes(user_id):
+        return [SimpleNamespace(post_id=first, ts=now), SimpleNamespace(post_id=second, ts=now)]
+
+    monkeypatch.setattr(service, "_load_likes", load_likes)
+    await service.add_like(user, second, now)
+    rebuilt = await service.get("u2")
+    assert rebuilt.weight == pytest.approx(2.0, rel=1e-3)
+    assert state_collection.documents["u2"]["embedding_version"] == "2"
@@ -0,0 +1,161 @@
+"""
+Query-plan checks for the hot feed, search and chat queries. They need a real
+MongoDB (``MONGO_URL``, default from settings) and are skipped without one.
+"""
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+from app.core.config import get_settings
+from app.models.post import Post
+from app.services import vector_store
+from app.services.chat_service import ChatService
+from app.services.feed_service import FeedService
+from app.services.keyword_index import index_fields, keyword_search
+
+
+class _RecordingCollection:
+    def __init__(self, collection):
+        self.collection = collection
+        self.pipelines = []
+        self.counts = []
+        self.finds = []
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return self.collection.aggregate(pipeline)
+
+    def count_documents(self, match):
+        self.counts.append(match)
+        return self.collection.count_documents(match)
+
+    def find(self, *args, **kwargs):
+        self.finds.append(kwargs.get("filter", args[0] if args else {}))
+        return self.collection.find(*args, **kwargs)
+
+
+def _stages(plan):
+    if isinstance(plan, dict):
+        for key, value in plan.items():
+            if key == "stage":
+                yield value
+            else:
+                yield from _stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _stages(value)
+
+
+def _assert_index_scan(explain):
+    stages = set(_stages(explain))
+    assert "COLLSCAN" not in stages, stages
+    assert any("IXSCAN" in stage or stage == "IDHACK" for stage in stages), stages
+
+
+@pytest.fixture
+async def posts_db(monkeypatch):
+    url = os.environ.get("MONGO_URL", get_settings().mongo_url)
+    client = AsyncIOMotorClient(url, serverSelectionTimeoutMS=500)
+    try:
+        await client.admin.command("ping")
+    except PyMongoError:
+        client.close()
+        pytest.skip("MongoDB is not reachable")
+
+    database = client[f"{get_settings().mongo_db}_query_plans"]
+    await init_beanie(database=database, document_models=[Post])
+    now = datetime.utcnow()
+    for index in range(40):
+        source = "snu" if index % 4 else "seed_posts"
+        title = f"장학금 신청 안내 {index}" if index % 2 else f"인턴십 모집 {index}"
+        await Post(
+            title=title,
+            url=f"https://example.com/{index}",
+            body="본문",
+            posted_at=now - timedelta(hours=index),
+            department="전기정보공학부" if index % 3 else "경영학과",
+            category="장학" if index % 2 else "진로",
+            source=source,
+            hash=f"plan-{index}",
+            **index_fields(title, None, "본문"),
+        ).insert()
+
+    recorder = _RecordingCollection(Post.get_motor_collection())
+    monkeypatch.setattr(Post, "get_motor_collection", classmethod(lambda cls: recorder))
+    yield database, recorder
+    await client.drop_database(database.name)
+    client.close()
+
+
+async def _explain_pipelines(database, pipelines):
+    for pipeline in pipelines:
+        explain = await database.command(
+            "explain",
+            {"aggregate": "posts", "pipeline": pipeline, "cursor": {}},
+            verbosity="queryPlanner",
+        )
+        _assert_index_scan(explain)
+
+
+async def test_feed_queries_use_index_scans(posts_db):
+    database, recorder = posts_db
+    service = FeedService()
+
+    first = await service.get_feed(category=None, page=1, page_size=5)
+    await service.get_feed(category="장학", page=2, page_size=5)
+    await service.get_feed(category=None, page=1, page_size=5, cursor=first["meta"]["next_cursor"])
+
+    assert len(recorder.pipelines) == 3
+    await _explain_pipelines(database, recorder.pipelines)
+    # Page-number totals are counted on the index, without fetching documents.
+    assert len(recorder.counts) == 2
+    for match in recorder.counts:
+        explain = await database.command(
+            "explain", {"count": "posts", "query": match}, verbosity="queryPlanner"
+        )
+        stages = set(_stages(explain))
+        assert "FETCH" not in stages and "COLLSCAN" not in stages, stages
+
+
+async def test_search_and_chat_queries_use_index_scans(posts_db, monkeypatch):
+    database, recorder = posts_db
+
+    await keyword_search("장학금 신청", {"category": "장학"}, limit=10)
+    await keyword_search("인턴십", {"department": "전기정보공학부"}, limit=10, with_total=False)
+    await keyword_search("장", {}, limit=10)
+    await _explain_pipelines(database, recorder.pipelines)
+
+    # Chat retrieval: keyword candidates plus hydration of (stubbed) vector hits.
+    posts = await recorder.collection.find({}, {"_id": 1}).limit(5).to_list(length=5)
+    hits = [{"id": str(post["_id"]), "post_id": str(post["_id"]), "score": 0.5, "payload": {}} for post in posts]
+    service = ChatService()
+
+    async def fake_embed(text):
+        return np.ones(get_settings().qdrant_vector_size, dtype=np.float32)
+
+    async def fake_search(vector, limit, offset=0, search_filter=None, score_threshold=None):
+        return hits
+
+    monkeypatch.setattr(service.llm_service, "embed", fake_embed)
+    monkeypatch.setattr(vector_store, "search_similar", fake_search)
+    recorder.pipelines.clear()
+
+    contexts = await service._retrieve_contexts("장학금 신청 일정", department="전기정보공학부", grade=None)
+
+    assert contexts
+    assert len(recorder.pipelines) == 1 and len(recorder.finds) == 1
+    await _explain_pipelines(database, recorder.pipelines)
+    explain = await database.command(
+        "explain",
+        {"find": "posts", "filter": recorder.finds[0]},
+        verbosity="queryPlanner",
+    )
+    _assert_index_scan(explain)
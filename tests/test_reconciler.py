@@ -0,0 +1,94 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from bson import ObjectId
+from qdrant_client import AsyncQdrantClient
+
+import app.db.qdrant as qdrant_db
+from app.core.config import get_settings
+from app.services import vector_store
+from app.services.llm_service import LLMService
+from app.services.reconciler import ID_DTYPE, VectorReconciler
+
+
+@pytest.fixture
+async def memory_qdrant(monkeypatch):
+    client = AsyncQdrantClient(location=":memory:")
+    monkeypatch.setattr(qdrant_db, "client", client)
+    monkeypatch.setattr(vector_store, "_collection_initialized", False)
+    yield client
+    await client.close()
+
+
+def _post(post_id: ObjectId):
+    return SimpleNamespace(
+        id=post_id,
+        title="장학 공지",
+        body="장학금 신청 안내",
+        summary=None,
+        department=None,
+        audience_grade=[],
+        posted_at=datetime(2025, 3, 1),
+        deadline_at=None,
+        tags=[],
+        category="장학",
+        source="dummy",
+    )
+
+
+class _StubReconciler(VectorReconciler):
+    def __init__(self, mongo_ids, **kwargs):
+        super().__init__(**kwargs)
+        self.mongo_ids = sorted(mongo_ids)
+
+    async def _mongo_id_batches(self):
+        for start in range(0, len(self.mongo_ids), self.batch_size):
+            yield np.array([oid.binary for oid in self.mongo_ids[start : start + self.batch_size]], dtype=ID_DTYPE)
+
+    async def _load_posts(self, ids):
+        return [_post(oid) for oid in ids]
+
+
+@pytest.mark.asyncio
+async def test_reconciler_reembeds_missing_and_deletes_orphans(memory_qdrant):
+    ids = sorted(ObjectId() for _ in range(6))
+    # A trailing NUL byte must survive the fixed-width byte array round trip.
+    ids.append(ObjectId(b"\xff" * 11 + b"\0"))
+    stored = ids[:3] + [ObjectId()]
+    vector = np.ones(get_settings().qdrant_vector_size, dtype=np.float32)
+    for oid in stored:
+        await vector_store.upsert_notice_vector(str(oid), vector, {"title": "x"})
+    await vector_store.upsert_notice_vector("not-an-object-id", vector, {"title": "x"})
+
+    llm = LLMService()
+    llm.embedding_backend = "local"
+    reconciler = _StubReconciler(ids, llm_service=llm, batch_size=2)
+
+    dry = await reconciler.run(dry_run=True)
+    assert (dry["missing"], dry["orphans"], dry["deleted"]) == (4, 2, 0)
+
+    report = await reconciler.run()
+    assert report["reembedded"] == 4
+    assert report["deleted"] == 2
+    remaining = set()
+    async for batch in vector_store.iter_post_ids():
+        remaining.update(batch)
+    assert remaining == {str(oid) for oid in ids}
+    assert (await reconciler.run(dry_run=True))["missing"] == 0
+
+
+@pytest.mark.asyncio
+async def test_reconciler_leaves_posts_missing_when_embedding_api_fails(memory_qdrant):
+    ids = sorted(ObjectId() for _ in range(3))
+    await vector_store.ensure_collection()
+    llm = LLMService()
+    llm.embedding_backend = "remote"
+    llm.client.embedding_enabled = False
+    reconciler = _StubReconciler(ids, llm_service=llm, batch_size=2)
+
+    report = await reconciler.run()
+
+    assert (report["reembedded"], report["failed"]) == (0, 3)
+    assert (await reconciler.run(dry_run=True))["missing"] == 3
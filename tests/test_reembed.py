@@ -0,0 +1,118 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from qdrant_client import AsyncQdrantClient
+
+import app.db.qdrant as qdrant_db
+from app.core.config import get_settings
+from app.services import vector_store
+from app.clients.llm import LLMRequestError
+from app.services.llm_service import LLMService
+from app.services.reembed import ReembedJob
+
+
+@pytest.fixture
+async def memory_qdrant(monkeypatch):
+    client = AsyncQdrantClient(location=":memory:")
+    monkeypatch.setattr(qdrant_db, "client", client)
+    monkeypatch.setattr(vector_store, "_collection_initialized", False)
+    yield client
+    await client.close()
+
+
+def _posts(count: int):
+    return [
+        SimpleNamespace(
+            id=ObjectId(),
+            title=f"장학 공지 {index}",
+            body=f"장학금 신청 안내 {index}",
+            summary=None,
+            department=None,
+            audience_grade=[],
+            posted_at=datetime(2025, 3, 1),
+            deadline_at=None,
+            tags=[],
+            category="장학",
+            source="dummy",
+        )
+        for index in range(count)
+    ]
+
+
+class _ListJob(ReembedJob):
+    def __init__(self, posts, fail_after=None, **kwargs):
+        super().__init__(**kwargs)
+        self.posts = posts
+        self.fail_after = fail_after
+        self.batches = 0
+
+    async def _next_batch(self, after):
+        if self.fail_after is not None and self.batches >= self.fail_after:
+            raise RuntimeError("interrupted")
+        self.batches += 1
+        remaining = [post for post in self.posts if after is None or str(post.id) > after]
+        return remaining[: self.batch_size]
+
+    async def _load_posts(self, post_ids):
+        return [post for post in self.posts if str(post.id) in post_ids]
+
+
+class _FlakyClient:
+    """Embedding API that fails for titles in ``failing`` (a mutable set)."""
+
+    def __init__(self, failing):
+        self.failing = failing
+
+    async def embed_text(self, text):
+        if text.split("\n")[0] in self.failing:
+            raise LLMRequestError("503")
+        return [1.0] * get_settings().qdrant_vector_size
+
+
+@pytest.mark.asyncio
+async def test_reembed_resumes_from_checkpoint_and_swaps_alias(memory_qdrant, tmp_path):
+    await vector_store.ensure_collection()
+    previous = await vector_store.resolve_alias()
+    posts = _posts(5)
+    llm = LLMService()
+    llm.embedding_backend = "local"
+    options = dict(llm_service=llm, target="notice_vectors__next", batch_size=2, checkpoint_dir=str(tmp_path))
+
+    with pytest.raises(RuntimeError):
+        await _ListJob(posts, fail_after=2, **options).run()
+    assert await vector_store.resolve_alias() == previous
+
+    report = await _ListJob(posts, **options).run()
+
+    assert report["embedded"] == 5
+    assert report["alias"] == {"alias": "notice_vectors", "previous": previous, "current": "notice_vectors__next"}
+    assert await vector_store.resolve_alias() == "notice_vectors__next"
+    collection = get_settings().qdrant_collection_notices
+    assert (await memory_qdrant.count(collection)).count == 5
+    records, _ = await memory_qdrant.scroll(collection_name=collection, limit=1)
+    assert records[0].payload["embedding_model"] == vector_store.embedding_metadata()["embedding_model"]
+
+
+@pytest.mark.asyncio
+async def test_reembed_never_falls_back_and_blocks_swap_on_failures(memory_qdrant, tmp_path):
+    await vector_store.ensure_collection()
+    previous = await vector_store.resolve_alias()
+    posts = _posts(4)
+    failing = {"장학 공지 1", "장학 공지 2"}
+    llm = LLMService(client=_FlakyClient(failing))
+    llm.embedding_backend = "remote"
+    options = dict(llm_service=llm, target="notice_vectors__next", batch_size=2, checkpoint_dir=str(tmp_path))
+
+    report = await _ListJob(posts, **options).run()
+
+    assert (report["embedded"], report["failed"], report["completed"]) == (2, 2, False)
+    assert sorted(report["failed_ids"]) == sorted(str(post.id) for post in posts[1:3])
+    assert await vector_store.resolve_alias() == previous
+
+    failing.clear()
+    report = await _ListJob(posts, **options).run()
+
+    assert (report["embedded"], report["failed"], report["completed"]) == (4, 0, True)
+    assert await vector_store.resolve_alias() == "notice_vectors__next"
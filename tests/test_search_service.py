@@ -0,0 +1,189 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.clients.llm import LLMRequestError
+from app.db.pagination import Page
+from app.services import search_service, vector_store
+from app.services.hydration import parse_fields
+from app.services.search_service import SearchService
+
+
+@pytest.mark.asyncio
+async def test_semantic_pages_are_served_from_cached_result_set(monkeypatch):
+    service = SearchService(semantic_window=10)
+    searches = []
+    embeds = []
+
+    async def fake_embed(text):
+        embeds.append(text)
+        return np.ones(4, dtype=np.float32)
+
+    async def fake_search(vector, limit, offset=0, search_filter=None, score_threshold=None):
+        searches.append((limit, offset))
+        hits = [
+            {"id": str(i), "post_id": f"{i:024x}", "score": 1.0 - i / 100, "payload": {}}
+            for i in range(offset, offset + limit)
+        ]
+        return hits, False
+
+    async def fake_count(search_filter=None, exact=False):
+        return 42
+
+    async def fake_hydrate(hits, view="full"):
+        return [{"id": hit["post_id"], "semantic_score": hit["score"]} for hit in hits]
+
+    monkeypatch.setattr(service.llm_service, "embed_strict", fake_embed)
+    monkeypatch.setattr(vector_store, "search_similar_with_status", fake_search)
+    monkeypatch.setattr(vector_store, "count_points", fake_count)
+    monkeypatch.setattr(search_service, "hydrate_hits", fake_hydrate)
+
+    first = await service.search("장학금", "semantic", None, None, page=1, page_size=4)
+    second = await service.search(
+        "장학금", "semantic", None, None, page=1, page_size=4, cursor=first["meta"]["next_cursor"]
+    )
+    deep = await service.search("장학금", "semantic", None, None, page=4, page_size=4)
+
+    assert first["meta"]["total"] == 42
+    assert [item["id"] for item in second["items"]] == [f"{i:024x}" for i in range(4, 8)]
+    assert second["meta"]["page"] == 2
+    assert searches == [(10, 0), (4, 12)]
+    # The deep page reuses the cached set's query vector.
+    assert embeds == ["장학금"]
+    assert deep["meta"]["next_cursor"] is not None
+
+    # A cursor is only valid for the query and filters it was issued for.
+    with pytest.raises(ValueError):
+        await service.search("학사", "semantic", None, None, page=1, page_size=4, cursor=first["meta"]["next_cursor"])
+    with pytest.raises(ValueError):
+        await service.search(
+            "장학금", "semantic", "컴퓨터공학부", None, page=1, page_size=4, cursor=first["meta"]["next_cursor"]
+        )
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected():
+    service = SearchService()
+    with pytest.raises(ValueError):
+        await service.search("장학금", "semantic", None, None, page=1, page_size=4, cursor="!!")
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_fuses_both_signals(monkeypatch):
+    service = SearchService(semantic_window=10)
+    shared = f"{1:024x}"
+
+    async def fake_embed(text):
+        return np.ones(4, dtype=np.float32)
+
+    async def fake_search(vector, limit, offset=0, search_filter=None, score_threshold=None):
+        hits = [
+            {"id": "s", "post_id": f"{2:024x}", "score": 0.9, "payload": {}},
+            {"id": "x", "post_id": shared, "score": 0.8, "payload": {}},
+        ]
+        return hits, False
+
+    async def fake_keyword(query, filters, skip=0, limit=20, with_total=True, list_view=False):
+        post = SimpleNamespace(id=shared, model_dump=lambda: {"id": shared})
+        return Page(items=[(post, 1.0)], total=None)
+
+    async def fake_hydrate(hits, view="full"):
+        return [{"id": hit["post_id"]} for hit in hits]
+
+    monkeypatch.setattr(service.llm_service, "embed_strict", fake_embed)
+    monkeypatch.setattr(vector_store, "search_similar_with_status", fake_search)
+    monkeypatch.setattr(search_service, "keyword_search", fake_keyword)
+    monkeypatch.setattr(search_service, "hydrate_hits", fake_hydrate)
+
+    result = await service.search("장학금", "hybrid", None, None, page=1, page_size=5)
+
+    assert result["meta"]["mode"] == "hybrid"
+    assert [item["id"] for item in result["items"]] == [shared, f"{2:024x}"]
+    assert result["items"][0]["signals"]["keyword"] == {"rank": 1, "score": 1.0}
+    assert result["items"][0]["semantic_score"] == 0.8
+    assert result["meta"]["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_degraded_responses_are_not_cached(monkeypatch):
+    service = SearchService(semantic_window=10)
+    calls = {"embed": 0, "keyword": 0, "search": 0}
+    failing = {"embed": True}
+
+    async def fake_embed(text):
+        calls["embed"] += 1
+        if failing["embed"]:
+            raise LLMRequestError("embedding endpoint down")
+        return np.ones(4, dtype=np.float32)
+
+    async def fake_search(vector, limit, offset=0, search_filter=None, score_threshold=None):
+        calls["search"] += 1
+        return [{"id": "s", "post_id": f"{2:024x}", "score": 0.9, "payload": {}}], True
+
+    async def fake_keyword(query, filters, skip=0, limit=20, with_total=True, list_view=False):
+        calls["keyword"] += 1
+        return Page(items=[], total=0)
+
+    async def fake_hydrate(hits, view="full"):
+        return [{"id": hit["post_id"]} for hit in hits]
+
+    monkeypatch.setattr(service.llm_service, "embed_strict", fake_embed)
+    monkeypatch.setattr(vector_store, "search_similar_with_status", fake_search)
+    monkeypatch.setattr(search_service, "keyword_search", fake_keyword)
+    monkeypatch.setattr(search_service, "hydrate_hits", fake_hydrate)
+
+    for _ in range(2):
+        fallback = await service.search("장학금", "semantic", None, None, page=1, page_size=5)
+    assert fallback["meta"]["mode"] == "fallback"
+    assert fallback["meta"]["degraded"] is True
+    assert calls == {"embed": 2, "keyword": 2, "search": 0}
+
+    # Embedding recovers but Qdrant fails over to the local index.
+    failing["embed"] = False
+    for _ in range(2):
+        failover = await service.search("장학금", "semantic", None, None, page=1, page_size=5)
+    assert failover["meta"]["mode"] == "semantic"
+    assert failover["meta"]["degraded"] is True
+    assert calls["search"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fields_selects_projected_list_items(monkeypatch):
+    service = SearchService()
+    calls = []
+
+    async def fake_keyword(query, filters, skip=0, limit=20, with_total=True, list_view=False):
+        calls.append(list_view)
+        post = SimpleNamespace(
+            id=f"{1:024x}",
+            title="장학금 안내",
+            summary="요약",
+            category="장학",
+            department=None,
+            tags=["장학"],
+            source="snu",
+            posted_at=None,
+            deadline_at=None,
+        )
+        return Page(items=[(post, 0.5)], total=1)
+
+    monkeypatch.setattr(search_service, "keyword_search", fake_keyword)
+
+    result = await service.search(
+        "장학금", "keyword", None, None, page=1, page_size=10, fields=parse_fields("title,deadline_at")
+    )
+
+    assert calls == [True]
+    assert result["items"] == [
+        {"id": f"{1:024x}", "title": "장학금 안내", "deadline_at": None, "keyword_score": 0.5}
+    ]
+    assert result["meta"]["view"] == "light"
+    assert result["meta"]["fields"] == ["title", "deadline_at"]
+
+
+def test_parse_fields_rejects_unknown_names():
+    assert parse_fields(None) is None
+    assert parse_fields(" id, title ,title") == ("id", "title")
+    with pytest.raises(ValueError):
+        parse_fields("title,body")
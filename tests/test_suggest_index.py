@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from app.services.suggest_index import SuggestIndex
+
+
+def _post(post_id, title, tags=(), department=None):
+    return SimpleNamespace(id=post_id, title=title, tags=list(tags), department=department)
+
+
+def test_prefix_matches_word_starts_and_ranks_by_weight():
+    index = SuggestIndex(min_query_count=1)
+    index.add_post(_post(1, "국가장학금 신청 안내", tags=["장학"], department="전기정보공학부"))
+    index.add_post(_post(2, "교내 장학생 선발", tags=["장학"]))
+
+    assert [item["text"] for item in index.suggest("신청")] == ["국가장학금 신청 안내"]
+    top = index.suggest("장학")
+    assert top[0] == {"text": "장학", "kind": "tag"}
+    assert {"text": "교내 장학생 선발", "kind": "title"} in top
+    assert index.suggest("전기") == [{"text": "전기정보공학부", "kind": "department"}]
+
+
+def test_add_post_is_idempotent_per_post_id():
+    index = SuggestIndex()
+    post = _post("a", "기숙사 입사 안내", tags=["생활"])
+    index.add_post(post)
+    index.add_post(post)
+
+    assert index._terms[("tag", "생활")].weight == 1
+
+
+def test_queries_are_suggested_once_popular_and_evicted_when_full():
+    index = SuggestIndex(max_queries=10, min_query_count=2)
+    index.record_query("인턴십 모집")
+    assert index.suggest("인턴") == []
+
+    index.record_query("  인턴십   모집 ")
+    assert index.suggest("인턴") == [{"text": "인턴십 모집", "kind": "query"}]
+
+    for number in range(10):
+        index.record_query(f"질의 {number}")
+    assert ("query", "인턴십 모집") in index._terms
+    assert len([key for key in index._terms if key[0] == "query"]) <= 10
+    assert all(key[2] in {term for _, term in index._terms} for key in index._keys)
+
+
+def test_short_prefixes_keep_popular_terms_past_the_scan_window():
+    index = SuggestIndex()
+    for number in range(300):
+        index.add_post(_post(number, f"가나 공지 {number:03d}"))
+    for number in range(5):
+        index.add_post(_post(f"tag-{number}", "다른 안내", tags=["가다"]))
+
+    assert index.suggest("가", limit=1) == [{"text": "가다", "kind": "tag"}]
+    assert index.suggest("가다") == [{"text": "가다", "kind": "tag"}]
+
+
+def test_only_clean_short_queries_are_recorded():
+    index = SuggestIndex(min_query_count=1)
+    index.query_denylist = ["비속어"]
+    for query in (
+        "학생증 2019123456 분실",
+        "연락처 010-1234-5678",
+        "http://example.com",
+        "비속어 포함 검색",
+        "가" * 50,
+    ):
+        index.record_query(query)
+    index.record_query("교환학생 모집")
+
+    assert [key for key in index._terms if key[0] == "query"] == [("query", "교환학생 모집")]
@@ -0,0 +1,231 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import DeleteAliasOperation, PointStruct
+
+import app.db.qdrant as qdrant_db
+from app.core.config import get_settings
+from app.services import vector_store
+
+
+@pytest.fixture
+async def memory_qdrant(monkeypatch):
+    client = AsyncQdrantClient(location=":memory:")
+    monkeypatch.setattr(qdrant_db, "client", client)
+    monkeypatch.setattr(vector_store, "_collection_initialized", False)
+    yield client
+    await client.close()
+
+
+def _vector(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.random(get_settings().qdrant_vector_size, dtype=np.float32)
+
+
+@pytest.mark.asyncio
+async def test_upsert_is_idempotent_per_post(memory_qdrant):
+    post_id = "507f1f77bcf86cd799439011"
+    await vector_store.upsert_notice_vector(post_id, _vector(1), {"title": "a"})
+    await vector_store.upsert_notice_vector(post_id, _vector(2), {"title": "b"})
+
+    collection = get_settings().qdrant_collection_notices
+    assert (await memory_qdrant.count(collection)).count == 1
+    hits = await vector_store.search_similar(_vector(2), limit=5)
+    assert [hit["id"] for hit in hits] == [vector_store.point_id_for(post_id)]
+    assert hits[0]["payload"]["title"] == "b"
+
+
+@pytest.mark.asyncio
+async def test_compact_duplicates_collapses_legacy_points(memory_qdrant):
+    await vector_store.ensure_collection()
+    collection = get_settings().qdrant_collection_notices
+    legacy = [
+        PointStruct(
+            id=f"00000000-0000-0000-0000-00000000000{index}",
+            vector=_vector(index).tolist(),
+            payload={"post_id": "507f1f77bcf86cd799439011" if index < 3 else "507f1f77bcf86cd799439012"},
+        )
+        for index in range(4)
+    ]
+    await memory_qdrant.upsert(collection_name=collection, points=legacy)
+
+    report = await vector_store.compact_duplicates(batch_size=2)
+
+    assert report["posts"] == 2
+    assert report["deleted"] == 4
+    records, _ = await memory_qdrant.scroll(collection_name=collection, limit=10)
+    assert sorted(str(record.id) for record in records) == sorted(
+        [
+            vector_store.point_id_for("507f1f77bcf86cd799439011"),
+            vector_store.point_id_for("507f1f77bcf86cd799439012"),
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_compact_duplicates_keeps_the_freshest_point(memory_qdrant):
+    await vector_store.ensure_collection()
+    collection = get_settings().qdrant_collection_notices
+    post_id = "507f1f77bcf86cd799439011"
+    metadata = vector_store.embedding_metadata()
+    stale = {**metadata, "embedding_version": "0"}
+    points = [
+        # The deterministic point still holds a vector from an older embedding space.
+        PointStruct(
+            id=vector_store.point_id_for(post_id),
+            vector=_vector(1).tolist(),
+            payload={"post_id": post_id, **stale},
+        ),
+        PointStruct(
+            id="00000000-0000-0000-0000-000000000001",
+            vector=_vector(2).tolist(),
+            payload={"post_id": post_id, **metadata, "embedded_at": "2025-03-02T00:00:00", "title": "new"},
+        ),
+        PointStruct(
+            id="00000000-0000-0000-0000-000000000002",
+            vector=_vector(3).tolist(),
+            payload={"post_id": post_id, **metadata, "embedded_at": "2025-03-01T00:00:00", "title": "old"},
+        ),
+    ]
+    await memory_qdrant.upsert(collection_name=collection, points=points)
+
+    report = await vector_store.compact_duplicates()
+
+    assert report == {"scanned": 3, "posts": 1, "unkeyed": 0, "rekeyed": 1, "deleted": 2, "dry_run": False}
+    records, _ = await memory_qdrant.scroll(collection_name=collection, limit=10, with_payload=True)
+    assert [(str(record.id), record.payload["title"]) for record in records] == [
+        (vector_store.point_id_for(post_id), "new")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_existing_post_ids_skips_posts_without_points(memory_qdrant):
+    stored = "507f1f77bcf86cd799439011"
+    await vector_store.upsert_notice_vector(stored, _vector(1), {"title": "a"})
+
+    existing = await vector_store.existing_post_ids([stored, "507f1f77bcf86cd799439012"])
+
+    assert existing == {stored}
+
+
+@pytest.mark.asyncio
+async def test_search_filter_is_pushed_down(memory_qdrant):
+    await vector_store.upsert_notice_vector(
+        "507f1f77bcf86cd799439011",
+        _vector(1),
+        {"department": "컴퓨터공학부", "audience_grade": ["3", "4"], "posted_at": "2025-03-01T00:00:00+09:00"},
+    )
+    await vector_store.upsert_notice_vector(
+        "507f1f77bcf86cd799439012",
+        _vector(1),
+        {"department": "경영학과", "audience_grade": ["1"], "posted_at": "2024-03-01T00:00:00+09:00"},
+    )
+
+    by_grade = await vector_store.search_similar(
+        _vector(1), limit=5, search_filter=vector_store.VectorFilter(audience_grade="3")
+    )
+    by_date = await vector_store.search_similar(
+        _vector(1),
+        limit=5,
+        search_filter=vector_store.VectorFilter(posted_to=datetime(2024, 12, 31, tzinfo=timezone.utc)),
+    )
+
+    assert [hit["post_id"] for hit in by_grade] == ["507f1f77bcf86cd799439011"]
+    assert [hit["post_id"] for hit in by_date] == ["507f1f77bcf86cd799439012"]
+
+
+@pytest.mark.asyncio
+async def test_migrate_collection_reports_config_drift(memory_qdrant, monkeypatch):
+    await vector_store.ensure_collection()
+    assert (await vector_store.migrate_collection(dry_run=True))["changes"] == {}
+
+    monkeypatch.setattr(get_settings(), "qdrant_hnsw_m", 32)
+    monkeypatch.setattr(get_settings(), "qdrant_on_disk_payload", True)
+    report = await vector_store.migrate_collection(dry_run=True)
+
+    assert report["applied"] is False
+    assert report["changes"]["hnsw_config"] == {"m": {"from": 16, "to": 32}}
+    assert report["changes"]["on_disk_payload"] == {"from": False, "to": True}
+
+
+@pytest.mark.asyncio
+async def test_recommend_uses_stored_vectors_and_skips_examples(memory_qdrant):
+    base = _vector(1)
+    ids = [f"507f1f77bcf86cd79943901{index}" for index in range(4)]
+    await vector_store.upsert_notice_vector(ids[0], base, {"title": "liked"})
+    await vector_store.upsert_notice_vector(ids[1], base + 0.01, {"title": "close"})
+    await vector_store.upsert_notice_vector(ids[2], _vector(9), {"title": "far"})
+
+    # ids[3] has no vector; it must not break the request.
+    hits = await vector_store.recommend_similar([ids[0], ids[3]], limit=2)
+    assert [hit["post_id"] for hit in hits] == [ids[1], ids[2]]
+
+
+@pytest.mark.asyncio
+async def test_local_recommend_matches_centroid_search(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "vector_backend", "local")
+    monkeypatch.setattr(
+        vector_store,
+        "_local_index",
+        vector_store.LocalVectorIndex(tmp_path, dim=get_settings().qdrant_vector_size),
+    )
+    ids = [f"507f1f77bcf86cd79943901{index}" for index in range(3)]
+    await vector_store.upsert_notice_vector(ids[0], _vector(1), {"title": "liked"})
+    await vector_store.upsert_notice_vector(ids[1], _vector(1) + 0.01, {"title": "close"})
+    await vector_store.upsert_notice_vector(ids[2], _vector(9), {"title": "far"})
+
+    hits = await vector_store.recommend_similar([ids[0]], limit=1, negative_post_ids=[ids[2]])
+    assert [hit["post_id"] for hit in hits] == [ids[1]]
+
+
+class _StrictAliasClient:
+    """Mimics the Qdrant server: an alias may not share a collection's name."""
+
+    def __init__(self, collections):
+        self.collections = set(collections)
+        self.aliases = {}
+        self.calls = []
+
+    async def get_aliases(self):
+        return SimpleNamespace(
+            aliases=[SimpleNamespace(alias_name=alias, collection_name=name) for alias, name in self.aliases.items()]
+        )
+
+    async def get_collections(self):
+        return SimpleNamespace(collections=[SimpleNamespace(name=name) for name in self.collections])
+
+    async def delete_collection(self, name):
+        self.calls.append(("delete_collection", name))
+        self.collections.discard(name)
+
+    async def update_collection_aliases(self, change_aliases_operations):
+        for operation in change_aliases_operations:
+            if isinstance(operation, DeleteAliasOperation):
+                self.aliases.pop(operation.delete_alias.alias_name, None)
+                continue
+            create = operation.create_alias
+            if create.alias_name in self.collections:
+                raise ValueError(f"Collection {create.alias_name} already exists")
+            self.aliases[create.alias_name] = create.collection_name
+        self.calls.append(("update_collection_aliases", len(change_aliases_operations)))
+
+
+@pytest.mark.asyncio
+async def test_swap_alias_drops_legacy_collection_before_aliasing(monkeypatch):
+    alias = get_settings().qdrant_collection_notices
+    target = vector_store.versioned_collection_name()
+    client = _StrictAliasClient([alias, target])
+    monkeypatch.setattr(vector_store, "get_qdrant_client", lambda: client)
+
+    assert await vector_store.swap_alias(target) == {"alias": alias, "previous": alias, "current": target}
+    assert client.calls == [("delete_collection", alias), ("update_collection_aliases", 1)]
+    assert client.aliases == {alias: target}
+
+    newer = f"{target}_next"
+    client.collections.add(newer)
+    assert (await vector_store.swap_alias(newer))["previous"] == target
+    assert client.calls[-1] == ("update_collection_aliases", 2)
+    assert client.collections == {target, newer}